@@ -0,0 +1,115 @@
+"""
+Compact ABI artifact for the 100x Jackpot DeFAI Agent
+
+The Hardhat artifacts next to the agent carry bytecode, link references and
+the full ABI of every contract, about 330 KB of JSON, most of which the
+agent never touches. agent_abi.json keeps only what the agent uses: every
+event of the contracts whose history it records, the pool and factory
+events the pool mirror follows, and the view and transaction functions it
+calls. Each contract also lists its event topics and function selectors,
+with a hash of the source artifact, so a stale artifact is caught by
+--check instead of surfacing as a decoding error.
+
+Regenerate after recompiling the contracts:
+
+    python abi_artifact.py          # write agent_abi.json
+    python abi_artifact.py --check  # exit 1 if it no longer matches the artifacts
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from eth_utils import event_abi_to_log_topic, function_abi_to_4byte_selector
+
+AGENT_DIR = os.path.dirname(os.path.abspath(__file__))
+ARTIFACT_FILE = os.path.join(AGENT_DIR, "agent_abi.json")
+
+# Contract -> (events, functions) the agent uses; None keeps every event
+AGENT_ENTRIES: Dict[str, Tuple[Optional[Sequence[str]], Sequence[str]]] = {
+    "JackpotGame": (None, (
+        "getGameStats", "jackpotAmount", "hintCount", "guessCost", "hintCost", "hasAccessToHint", "emitGameUpdate",
+    )),
+    "Token100x": ((), ()),
+    "BondingCurve": (None, (
+        "getPoolInfo", "liquidityPoolFactory", "totalBought", "totalSoldBack", "initialPrice",
+        "finalPrice", "currentSUsdPrice", "sellFee", "poolS", "liquidityPoolCreated", "paused",
+    )),
+    "SimpleLiquidityPool": (("Swap", "AddLiquidity", "RemoveLiquidity"), ("token", "getReserves", "totalLpSupply")),
+    "LiquidityPoolFactory": (("PoolCreated",), ("getPoolCount", "allPools")),
+}
+
+
+def read_artifact(name: str) -> Tuple[List[Dict], str]:
+    """A contract's full ABI and the sha256 of its artifact file"""
+    with open(os.path.join(AGENT_DIR, f"{name}.json"), "rb") as f:
+        raw = f.read()
+    data = json.loads(raw)
+    return (data["abi"] if isinstance(data, dict) else data), hashlib.sha256(raw).hexdigest()
+
+
+def compact(abi: List[Dict], events: Optional[Sequence[str]], functions: Sequence[str]) -> Dict:
+    """The used subset of an ABI, with topics and selectors"""
+    entries, topics, selectors = [], {}, {}
+    for item in abi:
+        if item.get("type") == "event" and (events is None or item["name"] in events):
+            entries.append(item)
+            topics[item["name"]] = "0x" + event_abi_to_log_topic(item).hex()
+        elif item.get("type") == "function" and item["name"] in functions:
+            entries.append(item)
+            selectors[item["name"]] = "0x" + function_abi_to_4byte_selector(item).hex()
+
+    missing = [name for name in list(events or ()) + list(functions) if name not in topics and name not in selectors]
+    if missing:
+        raise ValueError(f"ABI has no {', '.join(missing)}")
+    return {"abi": entries, "topics": topics, "selectors": selectors}
+
+
+def build() -> Dict:
+    """Compact entries for every contract in AGENT_ENTRIES"""
+    contracts = {}
+    for name, (events, functions) in AGENT_ENTRIES.items():
+        abi, digest = read_artifact(name)
+        contracts[name] = dict(compact(abi, events, functions), source_sha256=digest)
+    return contracts
+
+
+def load_abis(path: str = ARTIFACT_FILE) -> Dict[str, List[Dict]]:
+    """Contract name -> ABI, from the compact artifact or, without it, the full artifacts"""
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            return {name: contract["abi"] for name, contract in json.load(f).items()}
+    return {name: read_artifact(name)[0] for name in AGENT_ENTRIES}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the agent's compact ABI artifact")
+    parser.add_argument("--output", default=ARTIFACT_FILE)
+    parser.add_argument("--check", action="store_true", help="verify the artifact instead of writing it")
+    args = parser.parse_args()
+
+    contracts = build()
+    if args.check:
+        try:
+            with open(args.output, "r") as f:
+                current = json.load(f)
+        except FileNotFoundError:
+            current = None
+        if current != contracts:
+            print(f"{args.output} is out of date; run python abi_artifact.py")
+            sys.exit(1)
+        print(f"{args.output} is up to date")
+        return
+
+    with open(args.output, "w") as f:
+        json.dump(contracts, f, separators=(",", ":"))
+        f.write("\n")
+    entries = sum(len(contract["abi"]) for contract in contracts.values())
+    print(f"Wrote {entries} ABI entries for {len(contracts)} contracts to {args.output} ({os.path.getsize(args.output):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Rolling-window analytics for the 100x Jackpot DeFAI Agent
+
+Counts game activity in fixed-width time buckets and keeps running totals
+for sliding 1h/4h/24h windows, plus the window before each one so summaries
+can report trends. Recording an event and reading a window total are O(1);
+moving the clock forward costs one step per elapsed bucket.
+
+Metrics are fed by the event dispatcher and by the periodic stats refresh,
+so producing a summary needs no history scan and no RPC calls. Events are
+recorded at their block's time, so a backlog handled after a restart lands
+in the buckets it belongs to, or nowhere once older than the history kept.
+"""
+
+import time
+from typing import Dict, List, Optional
+
+# Sliding windows reported in summaries: name -> seconds
+WINDOWS = {
+    "1h": 3600,
+    "4h": 14400,
+    "24h": 86400,
+}
+
+# Event name -> metric it increments
+EVENT_METRICS = {
+    "GuessCommitted": "commits",
+    "GuessRevealed": "guesses",
+    "NewPlayer": "new_players",
+    "HintRequested": "hint_purchases",
+    "HintAdded": "hints_added",
+    "JackpotWon": "wins",
+}
+
+
+class RollingWindows:
+    def __init__(self, windows: Dict[str, int] = WINDOWS, bucket_seconds: int = 60):
+        self.bucket_seconds = bucket_seconds
+        self.windows = {name: max(1, seconds // bucket_seconds) for name, seconds in windows.items()}
+
+        # Enough buckets to cover the previous period of the longest window
+        self.size = 2 * max(self.windows.values()) + 1
+        self.bucket: Optional[int] = None
+
+        # metric -> ring of per-bucket values
+        self.buckets: Dict[str, List[float]] = {}
+        # metric -> window -> total over the current / previous period
+        self.current: Dict[str, Dict[str, float]] = {}
+        self.previous: Dict[str, Dict[str, float]] = {}
+
+    def ensure(self, metric: str):
+        """Create storage for a metric on first use"""
+        if metric not in self.buckets:
+            self.buckets[metric] = [0.0] * self.size
+            self.current[metric] = dict.fromkeys(self.windows, 0.0)
+            self.previous[metric] = dict.fromkeys(self.windows, 0.0)
+
+    def advance(self, now: Optional[float] = None):
+        """Move the clock forward, sliding expired buckets out of each window"""
+        bucket = int((time.time() if now is None else now) // self.bucket_seconds)
+        if self.bucket is None:
+            self.bucket = bucket
+            return
+        if bucket <= self.bucket:
+            return
+
+        if bucket - self.bucket >= self.size:
+            # Idle for longer than we keep history; everything has expired
+            for metric in self.buckets:
+                self.buckets[metric] = [0.0] * self.size
+                self.current[metric] = dict.fromkeys(self.windows, 0.0)
+                self.previous[metric] = dict.fromkeys(self.windows, 0.0)
+            self.bucket = bucket
+            return
+
+        while self.bucket < bucket:
+            self.bucket += 1
+            for metric, ring in self.buckets.items():
+                current = self.current[metric]
+                previous = self.previous[metric]
+                for name, length in self.windows.items():
+                    # The bucket leaving the current period enters the previous one
+                    moved = ring[(self.bucket - length) % self.size]
+                    current[name] -= moved
+                    previous[name] += moved - ring[(self.bucket - 2 * length) % self.size]
+                # This slot held a bucket older than every window; reuse it
+                ring[self.bucket % self.size] = 0.0
+
+    def add(self, metric: str, value: float = 1.0, now: Optional[float] = None):
+        """Record value for metric at now (default: the current time)
+
+        A time behind the clock goes into its own bucket and counts in the
+        windows, current or previous, that still cover it.
+        """
+        bucket = int((time.time() if now is None else now) // self.bucket_seconds)
+        self.advance(now)
+        age = self.bucket - bucket
+        if age >= self.size:
+            return
+        self.ensure(metric)
+        self.buckets[metric][bucket % self.size] += value
+        for name, length in self.windows.items():
+            if age < length:
+                self.current[metric][name] += value
+            elif age < 2 * length:
+                self.previous[metric][name] += value
+
+    def record_event(self, event_name: str, now: Optional[float] = None):
+        """Count one dispatched event, at the time it happened, if it maps to a metric"""
+        metric = EVENT_METRICS.get(event_name)
+        if metric is not None:
+            self.add(metric, 1.0, now)
+
+    def total(self, metric: str, window: str, now: Optional[float] = None) -> float:
+        """Total for metric over the last window"""
+        self.advance(now)
+        return self.current.get(metric, {}).get(window, 0.0)
+
+    def previous_total(self, metric: str, window: str, now: Optional[float] = None) -> float:
+        """Total for metric over the window before the last one"""
+        self.advance(now)
+        return self.previous.get(metric, {}).get(window, 0.0)
+
+    def rate(self, metric: str, window: str, now: Optional[float] = None) -> float:
+        """Average per hour over the last window"""
+        hours = self.windows[window] * self.bucket_seconds / 3600
+        return self.total(metric, window, now) / hours
+
+    def trend(self, metric: str, window: str, now: Optional[float] = None) -> str:
+        """Compare the last window with the one before, e.g. 'up 2.0x' or 'down 40%'"""
+        current = self.total(metric, window, now)
+        previous = self.previous_total(metric, window, now)
+        if previous == 0:
+            return "new" if current > 0 else "flat"
+        ratio = current / previous
+        if ratio >= 1.5:
+            return f"up {ratio:.1f}x"
+        if ratio > 1.05:
+            return f"up {(ratio - 1) * 100:.0f}%"
+        if ratio < 0.95:
+            return f"down {(1 - ratio) * 100:.0f}%"
+        return "flat"
@@ -0,0 +1,284 @@
+"""
+Offline benchmarks for the agent's event-handling hot path
+
+Runs JackpotAgent against an in-process FakeChain and FakeTwitter, with
+synthetic JackpotGame logs, and measures:
+
+- ingest:      events/sec through catch_up() / check_contract_events()
+- handlers:    events/sec through each handle_* method on pre-decoded events
+- stats:       update_game_stats() latency (p50/p95/max)
+- allocation:  bytes allocated per ingested event (peak and retained)
+
+Results are written as JSON. Pass --baseline with an earlier results file
+to print the change for every metric.
+
+Usage: python benchmarks/bench_agent.py [--events 20000] [--output results.json] [--baseline old.json]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List
+
+AGENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AGENT_DIR)
+
+# The agent reads its configuration at import time; keep it offline and isolated
+STATE_DIR = tempfile.mkdtemp(prefix="jackpot-bench-")
+os.environ.update({
+    "CHECKPOINT_FILE": os.path.join(STATE_DIR, "checkpoint.json"),
+    "EVENT_STORE_FILE": os.path.join(STATE_DIR, "events.db"),
+    "PLAYER_INDEX_FILE": os.path.join(STATE_DIR, "players.npz"),
+    "CANDLES_FILE": os.path.join(STATE_DIR, "candles.npz"),
+    "START_BLOCK": "1",
+    "AGENT_PRIVATE_KEY": "",
+    "WS_URL": "",
+    "MULTICALL_ADDRESS": "",
+    "TWITTER_API_KEY": "",
+    "TWITTER_API_SECRET": "",
+    "TWITTER_ACCESS_TOKEN": "",
+    "TWITTER_ACCESS_SECRET": "",
+})
+
+import jackpot_agent  # noqa: E402
+from read_batcher import ReadBatcher  # noqa: E402
+from social_poster import TokenBucket  # noqa: E402
+
+from fakes import FakeChain, FakeTwitter  # noqa: E402
+from synthetic import JackpotLogGenerator, load_abi  # noqa: E402
+
+logger = logging.getLogger("100xJackpotAgent")
+
+# Canned view-call results (wei where applicable)
+VIEW_RESULTS = {
+    "jackpot": {
+        "getGameStats": (1200, 340, 3, 125 * 10 ** 18),
+        "jackpotAmount": 125 * 10 ** 18,
+        "hintCount": 20,
+    },
+    "bonding_curve": {
+        "getPoolInfo": (500 * 10 ** 18, 480 * 10 ** 18, 10 ** 27),
+        "totalBought": 42_000_000 * 10 ** 6,
+        "totalSoldBack": 1_500_000 * 10 ** 6,
+        "initialPrice": 160 * 10 ** 12,
+        "finalPrice": 240 * 10 ** 12,
+        "currentSUsdPrice": 50,
+        "sellFee": 500,
+        "poolS": 7000 * 10 ** 18,
+        "liquidityPoolCreated": False,
+        "paused": False,
+    },
+}
+
+
+def build(events: int, seed: int = 1):
+    """A fresh agent wired to a fake chain preloaded with synthetic logs"""
+    store = os.environ["EVENT_STORE_FILE"]
+    state = (os.environ["CHECKPOINT_FILE"], os.environ["PLAYER_INDEX_FILE"], os.environ["CANDLES_FILE"])
+    for path in (*state, store, f"{store}-wal", f"{store}-shm"):
+        if os.path.exists(path):
+            os.remove(path)
+
+    agent = jackpot_agent.JackpotAgent(["fake://chain"])
+    chain = FakeChain()
+    chain.register_contract(agent.jackpot_contract.address, load_abi("JackpotGame.json"), VIEW_RESULTS["jackpot"])
+    chain.register_contract(agent.bonding_curve.address, load_abi("BondingCurve.json"), VIEW_RESULTS["bonding_curve"])
+    chain.add_logs(JackpotLogGenerator(agent.jackpot_contract.address, seed=seed).generate(events))
+
+    agent.pool = chain
+    agent.provider.pool = chain
+    agent.reader = ReadBatcher(chain)
+
+    # Post as fast as the fake accepts; rate limiting is not what is measured here
+    twitter = FakeTwitter()
+    agent.twitter = twitter
+    agent.social.twitter = twitter
+    agent.social.bucket = TokenBucket(1e12, 1e12)
+    agent.social.max_queue = 10 ** 9
+    return agent, chain, twitter
+
+
+async def bench_ingest(events: int, repeat: int) -> Dict:
+    """events/sec from raw logs to handled events, via the normal catch-up path"""
+    rates = []
+    requests = {}
+    for _ in range(repeat):
+        agent, chain, twitter = build(events)
+        agent.social.start()
+        started = time.perf_counter()
+        await agent.catch_up()
+        elapsed = time.perf_counter() - started
+        await agent.social.stop()
+        rates.append(events / elapsed)
+        requests = dict(chain.requests)
+    return {
+        "events": events,
+        "events_per_sec": statistics.median(rates),
+        "events_per_sec_runs": rates,
+        "rpc_requests": requests,
+    }
+
+
+async def bench_handlers(events: int, repeat: int) -> Dict:
+    """events/sec through each handler, excluding fetch and decode"""
+    agent, chain, twitter = build(events)
+    decoded = [event for event in map(agent.ingestor.decode, chain.get_logs({"fromBlock": "0x0"})) if event]
+    agent.reader.set_head(chain.head)
+
+    by_type: Dict[str, List] = {}
+    for event in decoded:
+        by_type.setdefault(event.event, []).append(event)
+
+    results = {}
+    for name, batch in sorted(by_type.items()):
+        handler = agent.event_handlers.get(name)
+        if handler is None:
+            continue
+        rates = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for event in batch:
+                await handler(event)
+            rates.append(len(batch) / (time.perf_counter() - started))
+        results[name] = {"events": len(batch), "events_per_sec": statistics.median(rates)}
+    return results
+
+
+async def bench_stats(iterations: int) -> Dict:
+    """update_game_stats latency with a cold read cache each time"""
+    agent, chain, twitter = build(0)
+    latencies = []
+    for i in range(iterations):
+        # A new head block invalidates every cached read
+        chain.head += 1
+        agent.reader.set_head(chain.head)
+        started = time.perf_counter()
+        await agent.update_game_stats()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    latencies.sort()
+    return {
+        "iterations": iterations,
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "max_ms": latencies[-1],
+        "rpc_requests_per_refresh": sum(chain.requests.values()) / iterations,
+    }
+
+
+async def bench_allocation(events: int) -> Dict:
+    """Bytes allocated per ingested event"""
+    agent, chain, twitter = build(events)
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    await agent.catch_up()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "events": events,
+        "peak_bytes_per_event": (peak - baseline) / events,
+        "retained_bytes_per_event": (current - baseline) / events,
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=AGENT_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return "unknown"
+
+
+def flatten(results: Dict, prefix: str = "") -> Dict[str, float]:
+    """Numeric leaves as dotted keys, for comparisons"""
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{path}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def compare(baseline: Dict, current: Dict):
+    """Print every metric next to its baseline value"""
+    old, new = flatten(baseline["results"]), flatten(current["results"])
+    print(f"\nCompared with {baseline['meta'].get('revision')} ({baseline['meta'].get('timestamp')}):")
+    for key in sorted(new):
+        if key not in old or key.endswith(".events") or key.endswith(".iterations"):
+            continue
+        change = (new[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+        print(f"  {key:<55} {old[key]:>14.2f} -> {new[key]:>14.2f}  ({change:+.1f}%)")
+
+
+async def run(args) -> Dict:
+    results = {}
+    print(f"Ingesting {args.events} events...")
+    results["ingest"] = await bench_ingest(args.events, args.repeat)
+    print(f"  {results['ingest']['events_per_sec']:,.0f} events/s")
+
+    print("Running handlers...")
+    results["handlers"] = await bench_handlers(args.events, args.repeat)
+    for name, result in results["handlers"].items():
+        print(f"  {name:<20} {result['events_per_sec']:>12,.0f} events/s")
+
+    print(f"Refreshing stats {args.stats_iterations} times...")
+    results["stats"] = await bench_stats(args.stats_iterations)
+    print(f"  p50 {results['stats']['p50_ms']:.2f} ms, p95 {results['stats']['p95_ms']:.2f} ms")
+
+    print("Measuring allocations...")
+    results["allocation"] = await bench_allocation(args.allocation_events)
+    print(f"  {results['allocation']['peak_bytes_per_event']:,.0f} B/event peak, " +
+          f"{results['allocation']['retained_bytes_per_event']:,.0f} B/event retained")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--stats-iterations", type=int, default=200)
+    parser.add_argument("--allocation-events", type=int, default=5000)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--verbose", action="store_true", help="keep the agent's INFO logging (slower)")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logger.setLevel(logging.WARNING)
+
+    results = asyncio.run(run(args))
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Candle builder benchmark
+
+Feeds a CandleBuilder synthetic curve and pool trades spread over a span of
+days (bursty, with quiet stretches longer than the 1m ring) and measures:
+
+- apply:     trades/sec through CandleBuilder.apply_events
+- window:    latency of the 24h summary read from the hourly candles
+- snapshot:  save and load times and file size
+- export:    CSV and NumPy record export of the 1m candles
+
+Every Sell after graduation is proxied to the pool, which also emits a Swap
+made by the curve; the trade counts must not depend on how logs are batched.
+
+Usage: python benchmarks/bench_candles.py [--trades 200000] [--days 30]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import List
+
+import numpy as np
+
+AGENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AGENT_DIR)
+
+from candles import CandleBuilder  # noqa: E402
+
+POOL_ADDRESS = "0x00000000000000000000000000000000000b0001"
+CURVE_ADDRESS = "0x00000000000000000000000000000000000c0001"
+
+
+def synthetic_trades(count: int, days: int, seed: int) -> List[SimpleNamespace]:
+    """Decoded-looking Buy/Sell/Swap events in chain order, one block per second
+
+    The last quarter of the span is after graduation: each Sell there comes
+    with the pool Swap the curve made for it, emitted first, in the same
+    transaction.
+    """
+    rng = random.Random(seed)
+    start = int(time.time()) - days * 86400
+    span = days * 86400
+
+    # Bursts of trading around random moments, so some hours are busy and some empty
+    centres = sorted(rng.randrange(span) for _ in range(max(1, count // 500)))
+    seconds = sorted(min(span - 1, max(0, int(rng.gauss(rng.choice(centres), 600)))) for _ in range(count))
+
+    graduated = span - span // 4
+
+    events = []
+    price = 1.6e-4
+
+    def log(name: str, args: dict, address: str, index: int, second: int):
+        events.append(SimpleNamespace(
+            event=name, args=args, address=address, blockNumber=second, logIndex=len(events),
+            transactionHash=f"0x{index:064x}", blockTimestamp=start + second,
+        ))
+
+    for index, second in enumerate(seconds):
+        price *= 1 + rng.gauss(0, 0.002)
+        tokens = rng.randrange(1, 1_000_000)
+        s = int(tokens * price * 10 ** 18)
+        roll = rng.random()
+        if roll < 0.5:
+            log("Buy", {"buyer": "", "tokenAmount": tokens, "sPaid": s}, CURVE_ADDRESS, index, second)
+        elif roll < 0.7:
+            if second >= graduated:
+                swap = {"user": CURVE_ADDRESS, "isBuy": False, "tokenAmount": tokens * 10 ** 6, "sAmount": s}
+                log("Swap", swap, POOL_ADDRESS, index, second)
+            log("Sell", {"seller": "", "tokenAmount": tokens, "sReceived": s}, CURVE_ADDRESS, index, second)
+        else:
+            swap = {"user": "", "isBuy": roll < 0.85, "tokenAmount": tokens * 10 ** 6, "sAmount": s}
+            log("Swap", swap, POOL_ADDRESS, index, second)
+    return events
+
+
+def build(events: List[SimpleNamespace], batch: int) -> CandleBuilder:
+    builder = CandleBuilder()
+    for offset in range(0, len(events), batch):
+        builder.apply_events(events[offset:offset + batch], lambda event: event.blockTimestamp,
+                             {POOL_ADDRESS}, CURVE_ADDRESS)
+    return builder
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--trades", type=int, default=200_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--batch", type=int, default=200, help="events per apply_events call, like one poll")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    events = synthetic_trades(args.trades, args.days, args.seed)
+    print(f"{args.trades:,} trades over {args.days} days ({len(events):,} events)\n")
+
+    started = time.perf_counter()
+    builder = build(events, args.batch)
+    elapsed = time.perf_counter() - started
+    print(f"apply      {args.trades / elapsed:>12,.0f} trades/s")
+
+    # A proxied sell counts once whether its Swap and Sell share a poll or
+    # arrive one at a time from the log stream
+    assert builder.trades == args.trades
+    streamed = build(events, 1)
+    assert streamed.trades == args.trades
+    assert streamed.window("1h", 24) == builder.window("1h", 24)
+
+    timings = []
+    for _ in range(200):
+        started = time.perf_counter()
+        day = builder.window("1h", 24)
+        timings.append(time.perf_counter() - started)
+    print(f"window     {statistics.median(timings) * 1e6:>12.1f} us for 24h from 1h candles "
+          f"({day['buys'] + day['sells']:,} trades, {day['volume']:,.1f} S)")
+
+    # The daily candles must agree with the raw trades they cover
+    daily = builder.records("1d")
+    assert int(daily["buys"].sum() + daily["sells"].sum()) == builder.trades
+
+    with tempfile.TemporaryDirectory(prefix="jackpot-candles-") as state_dir:
+        path = os.path.join(state_dir, "candles.npz")
+        started = time.perf_counter()
+        builder.save(path)
+        saved = time.perf_counter() - started
+        started = time.perf_counter()
+        loaded = CandleBuilder.load(path)
+        load_seconds = time.perf_counter() - started
+        assert loaded.window("1h", 24) == builder.window("1h", 24)
+        print(f"snapshot   {saved * 1000:>12.1f} ms save, {load_seconds * 1000:.1f} ms load, "
+              f"{os.path.getsize(path) / 1024:,.0f} KiB")
+
+        csv_path = os.path.join(state_dir, "candles_1m.csv")
+        started = time.perf_counter()
+        builder.export_csv(csv_path, "1m")
+        csv_seconds = time.perf_counter() - started
+        npy_path = os.path.join(state_dir, "candles_1m.npy")
+        started = time.perf_counter()
+        np.save(npy_path, builder.records("1m"))
+        npy_seconds = time.perf_counter() - started
+        print(f"export 1m  {csv_seconds * 1000:>12.1f} ms CSV ({os.path.getsize(csv_path) / 1024:,.0f} KiB), "
+              f"{npy_seconds * 1000:.1f} ms npy ({os.path.getsize(npy_path) / 1024:,.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Log decoding micro-benchmark
+
+Builds synthetic raw eth_getLogs results for a mix of JackpotGame and
+Token100x events and decodes them two ways:
+
+- web3: format the raw log (as get_logs does) and call event.process_log
+- LogDecoder: one topic0 lookup and one precompiled eth_abi decode
+
+Both paths are checked to produce the same arguments before timing.
+
+Usage: python benchmarks/bench_decode.py [--logs 20000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eth_abi import encode
+from eth_utils import event_abi_to_log_topic
+from web3 import Web3
+from web3._utils.method_formatters import log_entry_formatter
+from web3.datastructures import AttributeDict
+
+from log_decoder import LogDecoder
+
+AGENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JACKPOT = "0x1bCb1B4474b636874E1C35B0CC32ADb408bb43e0"
+TOKEN = "0x0755fb9917419a08c90a0Fd245F119202844ec3D"
+
+
+def load_abi(filename: str):
+    with open(os.path.join(AGENT_DIR, filename), "r") as f:
+        abi = json.load(f)
+    return abi["abi"] if isinstance(abi, dict) else abi
+
+
+def event_abi(abi, name: str):
+    return next(item for item in abi if item.get("type") == "event" and item["name"] == name)
+
+
+def address_topic(index: int) -> str:
+    return "0x" + "00" * 12 + f"{index:040x}"
+
+
+def synthetic_logs(count: int, jackpot_abi, token_abi):
+    """Raw JSON-RPC logs cycling through a few event shapes"""
+    shapes = [
+        (JACKPOT, event_abi(jackpot_abi, "GuessRevealed"),
+         lambda i: ([address_topic(i % 500)], encode(["string", "bool"], [f"guess-{i}", i % 97 == 0]))),
+        (JACKPOT, event_abi(jackpot_abi, "HintRequested"),
+         lambda i: ([address_topic(i % 500)], encode(["uint256"], [i % 20]))),
+        (JACKPOT, event_abi(jackpot_abi, "NewPlayer"),
+         lambda i: ([address_topic(i % 500)], b"")),
+        (TOKEN, event_abi(token_abi, "Transfer"),
+         lambda i: ([address_topic(i % 500), address_topic((i + 1) % 500)], encode(["uint256"], [i * 10 ** 15]))),
+    ]
+
+    logs = []
+    for i in range(count):
+        address, abi, build = shapes[i % len(shapes)]
+        topics, data = build(i)
+        logs.append({
+            "address": address.lower(),
+            "topics": [Web3.to_hex(event_abi_to_log_topic(abi))] + topics,
+            "data": "0x" + data.hex(),
+            "blockNumber": hex(1000 + i // 10),
+            "logIndex": hex(i % 10),
+            "transactionHash": "0x" + f"{i:064x}",
+            "transactionIndex": "0x0",
+            "blockHash": "0x" + f"{1000 + i // 10:064x}",
+            "removed": False,
+        })
+    return logs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logs", type=int, default=20000)
+    args = parser.parse_args()
+
+    jackpot_abi = load_abi("JackpotGame.json")
+    token_abi = load_abi("Token100x.json")
+    logs = synthetic_logs(args.logs, jackpot_abi, token_abi)
+
+    # web3 path: one contract event object per topic, as the old ingestor kept
+    w3 = Web3()
+    contracts = [w3.eth.contract(address=Web3.to_checksum_address(JACKPOT), abi=jackpot_abi),
+                 w3.eth.contract(address=Web3.to_checksum_address(TOKEN), abi=token_abi)]
+    events = {}
+    for contract in contracts:
+        for item in contract.abi:
+            if item.get("type") == "event":
+                events[(contract.address.lower(), Web3.to_hex(event_abi_to_log_topic(item)))] = contract.events[item["name"]]()
+
+    def web3_decode(log):
+        formatted = AttributeDict(log_entry_formatter(log))
+        return events[(log["address"], log["topics"][0])].process_log(formatted)
+
+    decoder = LogDecoder()
+    decoder.register_contract(JACKPOT, jackpot_abi)
+    decoder.register_contract(TOKEN, token_abi)
+
+    # Same output before timing anything
+    for log in logs[:200]:
+        expected, actual = web3_decode(log), decoder.decode(log)
+        assert expected.event == actual.event and dict(expected.args) == dict(actual.args), (expected, actual)
+        assert (expected.blockNumber, expected.logIndex) == (actual.blockNumber, actual.logIndex)
+
+    results = {}
+    for name, decode in (("web3 process_log", web3_decode), ("LogDecoder", decoder.decode)):
+        started = time.perf_counter()
+        for log in logs:
+            decode(log)
+        elapsed = time.perf_counter() - started
+        results[name] = elapsed
+        print(f"{name:>18}: {len(logs) / elapsed:>10,.0f} logs/s  ({elapsed / len(logs) * 1e6:.1f} us/log)")
+
+    print(f"\nSpeedup: {results['web3 process_log'] / results['LogDecoder']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
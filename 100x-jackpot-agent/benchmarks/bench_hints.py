@@ -0,0 +1,155 @@
+"""
+Hint endpoint load test
+
+Serves GET /hint from a HintServer backed by a HintAccessIndex seeded with
+synthetic grants, reads through a ReadBatcher on an in-process FakeChain
+(with simulated RPC latency), and drives it with concurrent aiohttp clients.
+Each scenario reports requests/sec, p50/p99 latency and the RPC calls it
+caused:
+
+- rush:     every request is from a player who bought the hint (index hits)
+- retries:  a small set of players without access retrying the same hint
+- unknown:  a stream of never-seen addresses (every request is a miss)
+- mixed:    90% rush, 9% retries, 1% unknown
+
+Usage: python benchmarks/bench_hints.py [--requests 20000] [--concurrency 64] [--players 50000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+import aiohttp
+from web3 import AsyncWeb3
+
+AGENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AGENT_DIR)
+
+from hint_access import HintAccessIndex, HintServer  # noqa: E402
+from read_batcher import ReadBatcher  # noqa: E402
+
+from fakes import FakeChain  # noqa: E402
+from synthetic import load_abi  # noqa: E402
+
+JACKPOT_ADDRESS = "0x00000000000000000000000000000000000a11ce"
+HINTS = [f"hint {index}" for index in range(5)]
+
+
+def address(rng: random.Random) -> str:
+    return "0x" + rng.randbytes(20).hex()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def scenario_urls(name: str, count: int, players: List[str], rng: random.Random) -> List[str]:
+    """Query strings for one scenario"""
+    denied = [address(rng) for _ in range(20)]
+
+    def rush():
+        return rng.choice(players), 0
+
+    def retry():
+        return rng.choice(denied), 1
+
+    def unknown():
+        return address(rng), 2
+
+    if name == "rush":
+        picks = [rush() for _ in range(count)]
+    elif name == "retries":
+        picks = [retry() for _ in range(count)]
+    elif name == "unknown":
+        picks = [unknown() for _ in range(count)]
+    else:
+        picks = [rng.choices((rush, retry, unknown), (90, 9, 1))[0]() for _ in range(count)]
+    return [f"/hint?hintIndex={hint}&userAddress={player}" for player, hint in picks]
+
+
+async def drive(base: str, urls: List[str], concurrency: int) -> Dict:
+    """Issue every request with a fixed number of concurrent clients"""
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    queue = iter(urls)
+
+    async def client(session: aiohttp.ClientSession):
+        for url in queue:
+            started = time.perf_counter()
+            async with session.get(base + url) as response:
+                await response.read()
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status] = statuses.get(response.status, 0) + 1
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests_per_sec": len(urls) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "statuses": statuses,
+    }
+
+
+async def run(args) -> None:
+    rng = random.Random(args.seed)
+    chain = FakeChain(head=1_000_000, latency=args.rpc_latency)
+    chain.register_contract(JACKPOT_ADDRESS, load_abi("JackpotGame.json"), {"hasAccessToHint": False})
+
+    w3 = AsyncWeb3()
+    contract = w3.eth.contract(address=AsyncWeb3.to_checksum_address(JACKPOT_ADDRESS), abi=load_abi("JackpotGame.json"))
+    index = HintAccessIndex(contract)
+    index.reader = ReadBatcher(chain)
+
+    # Every synthetic player bought hint 0, as HintRequested would have recorded
+    players = [address(rng) for _ in range(args.players)]
+    index.load((player, 0) for player in players)
+
+    port = free_port()
+    server = HintServer(index, HINTS, port=port)
+    await server.start()
+    base = f"http://127.0.0.1:{port}"
+
+    try:
+        print(f"{args.players:,} players indexed, {args.concurrency} clients, " +
+              f"{args.rpc_latency * 1000:.0f}ms simulated RPC latency\n")
+        print(f"{'scenario':<10} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'eth_call':>9} {'blockNumber':>12}  statuses")
+        for name in ("rush", "retries", "unknown", "mixed"):
+            count = args.requests if name != "unknown" else min(args.requests, 2000)
+            urls = scenario_urls(name, count, players, rng)
+            before = chain.requests.copy()
+            result = await drive(base, urls, args.concurrency)
+            calls = chain.requests - before
+            print(f"{name:<10} {result['requests_per_sec']:>9,.0f} {result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} " +
+                  f"{calls['eth_call']:>9} {calls['eth_blockNumber']:>12}  {dict(sorted(result['statuses'].items()))}")
+        print(f"\nIndex: {index.stats()}")
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--players", type=int, default=50000)
+    parser.add_argument("--rpc-latency", type=float, default=0.05, help="simulated RPC round trip in seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
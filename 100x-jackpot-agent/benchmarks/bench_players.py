@@ -0,0 +1,166 @@
+"""
+Player index benchmark
+
+Feeds a PlayerIndex synthetic NewPlayer / GuessRevealed / HintRequested /
+JackpotWon events for a large player base (a few players guess a lot, most
+only a few times) and measures:
+
+- apply:     events/sec through PlayerIndex.apply
+- memory:    bytes per player, against the same figures in a dict of dicts
+             (which shares its address strings with the events, so they
+             are not counted against it)
+- top:       top-N latency from the tournament trees, against a full
+             np.argpartition over the column and sorting the dict of dicts,
+             both straight after an update (the summary tweet case)
+- snapshot:  save and load times and file size
+
+Usage: python benchmarks/bench_players.py [--players 300000] [--events 1000000] [--top 10]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import numpy as np
+
+AGENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AGENT_DIR)
+
+from player_index import GUESS_COST, HINT_COST, PlayerIndex  # noqa: E402
+
+
+def synthetic_events(players: int, events: int, seed: int) -> List[tuple]:
+    """(event, args, block, logIndex) in chain order; every player starts with NewPlayer"""
+    rng = random.Random(seed)
+    addresses = ["0x" + rng.randbytes(20).hex() for _ in range(players)]
+    log = [("NewPlayer", {"player": address}) for address in addresses]
+
+    # Activity per player is heavy-tailed, like the real game's
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(players)]
+    for address in rng.choices(addresses, weights, k=max(0, events - players)):
+        roll = rng.random()
+        if roll < 0.7:
+            log.append(("GuessRevealed", {"player": address, "guess": "", "won": False}))
+        elif roll < 0.9995:
+            log.append(("HintRequested", {"player": address, "hintIndex": rng.randrange(5)}))
+        else:
+            log.append(("JackpotWon", {"winner": address, "amount": rng.randrange(10 ** 18, 10 ** 21), "guess": ""}))
+    rng.shuffle(log)
+    return [(name, args, 1 + index // 8, index % 8) for index, (name, args) in enumerate(log)]
+
+
+def dict_of_dicts(events: List[tuple]) -> Dict[str, Dict]:
+    """The straightforward alternative: one dict of counters per address"""
+    players: Dict[str, Dict] = {}
+    for name, args, block, _ in events:
+        address = args["winner"] if name == "JackpotWon" else args["player"]
+        row = players.get(address)
+        if row is None:
+            row = players[address] = {"guesses": 0, "hints": 0, "wins": 0, "spent": 0, "won": 0.0,
+                                      "first_seen": block, "last_seen": block}
+        row["last_seen"] = block
+        if name == "GuessRevealed":
+            row["guesses"] += 1
+            row["spent"] += GUESS_COST
+        elif name == "HintRequested":
+            row["hints"] += 1
+            row["spent"] += HINT_COST
+        elif name == "JackpotWon":
+            row["wins"] += 1
+            row["won"] += args["amount"] / 10 ** 18
+    return players
+
+
+def retained(build: Callable):
+    """(result, bytes it still holds once build returns)"""
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def median_ms(query: Callable, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        query()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--players", type=int, default=300_000)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    events = synthetic_events(args.players, args.events, args.seed)
+    print(f"{args.players:,} players, {len(events):,} events\n")
+
+    def build_index() -> PlayerIndex:
+        index = PlayerIndex()
+        index.top("guesses", 1)  # keep the guesses tree current while applying, as the agent does
+        for name, event_args, block, log_index in events:
+            index.apply(name, event_args, block, log_index)
+        return index
+
+    started = time.perf_counter()
+    index = build_index()
+    apply_seconds = time.perf_counter() - started
+    players, dict_bytes = retained(lambda: dict_of_dicts(events))
+    print(f"apply      {len(events) / apply_seconds:>12,.0f} events/s")
+    print(f"memory     {index.nbytes() / len(index):>12,.0f} bytes/player, {index.capacity:,} allocated "
+          f"(dict of dicts: {dict_bytes / len(players):,.0f})")
+
+    # A summary after fresh activity: one player updated, then the top-N read
+    column = index.columns["guesses"]
+    address = events[-1][1].get("player") or events[-1][1]["winner"]
+    position = [index.position[0]]
+
+    def after_update(query: Callable) -> Callable:
+        def run():
+            position[0] += 1
+            index.apply("GuessRevealed", {"player": address}, position[0], 0)
+            query()
+        return run
+
+    tree_ms = median_ms(after_update(lambda: index.top("guesses", args.top)), args.repeat)
+    ids_ms = median_ms(after_update(lambda: index.trees["guesses"].top(args.top)), args.repeat)
+
+    def argpartition():
+        live = column[:len(index)]
+        best = np.argpartition(live, -args.top)[-args.top:]
+        return best[np.argsort(-live[best])]
+
+    partition_ms = median_ms(after_update(argpartition), args.repeat)
+    sorted_ms = median_ms(lambda: sorted(players.items(), key=lambda item: -item[1]["guesses"])[:args.top],
+                          max(3, args.repeat // 10))
+    print(f"top {args.top:<6} {tree_ms:>12.3f} ms tree (ids only {ids_ms:.3f})  "
+          f"argpartition {partition_ms:.3f}  sorted dicts {sorted_ms:.1f}")
+    assert column[argpartition()[0]] == column[index.trees["guesses"].top(1)[0]]
+
+    with tempfile.TemporaryDirectory(prefix="jackpot-players-") as state_dir:
+        path = os.path.join(state_dir, "players.npz")
+        started = time.perf_counter()
+        index.save(path)
+        saved = time.perf_counter() - started
+        started = time.perf_counter()
+        loaded = PlayerIndex.load(path)
+        load_seconds = time.perf_counter() - started
+        assert loaded.top("guesses", args.top) == index.top("guesses", args.top)
+        print(f"snapshot   {saved * 1000:>12.0f} ms save, {load_seconds * 1000:.0f} ms load, "
+              f"{os.path.getsize(path) / len(index):.0f} bytes/player on disk")
+
+
+if __name__ == "__main__":
+    main()
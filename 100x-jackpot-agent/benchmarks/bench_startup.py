@@ -0,0 +1,217 @@
+"""
+Cold-start benchmark
+
+Starts the agent in a fresh interpreter against a FakeChain served over HTTP
+with a simulated round-trip latency, and measures how long each phase of a
+restart takes: interpreter and imports, JackpotAgent construction, start()
+(connection, pool mirror, transaction pipeline), the first stats refresh
+and replay of the synthetic backlog, and the time to the first handled
+event. RPC requests are counted per method.
+
+Pass --agent-dir more than once to compare trees, e.g. a checkout of an
+earlier revision against this one:
+
+    git worktree add /tmp/agent-before HEAD~1
+    python benchmarks/bench_startup.py --agent-dir /tmp/agent-before/100x-jackpot-agent --agent-dir .
+
+Usage: python benchmarks/bench_startup.py [--events 2000] [--latency 0.05] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from aiohttp import web
+from eth_utils import to_checksum_address
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+AGENT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, AGENT_DIR)
+
+from fakes import FakeChain  # noqa: E402
+from synthetic import JackpotLogGenerator, load_abi  # noqa: E402
+
+JACKPOT_ADDRESS = "0x00000000000000000000000000000000000a11ce"
+TOKEN_ADDRESS = "0x0000000000000000000000000000000000070c3e"
+BONDING_CURVE_ADDRESS = "0x00000000000000000000000000000000000c0ffe"
+
+# A throwaway key so the transaction pipeline's startup reads are included
+AGENT_KEY = "0x" + "42" * 32
+
+# Canned view-call results (wei where applicable); no liquidity pool factory yet
+VIEW_RESULTS = {
+    "jackpot": {
+        "getGameStats": (1200, 340, 3, 125 * 10 ** 18),
+        "jackpotAmount": 125 * 10 ** 18,
+        "hintCount": 20,
+    },
+    "bonding_curve": {
+        "getCurrentPrice": 180 * 10 ** 12,
+        "getPoolInfo": (500 * 10 ** 18, 480 * 10 ** 18, 10 ** 27),
+        "liquidityPoolFactory": "0x" + "00" * 20,
+        "totalBought": 42_000_000 * 10 ** 6,
+        "totalSoldBack": 1_500_000 * 10 ** 6,
+        "initialPrice": 160 * 10 ** 12,
+        "finalPrice": 240 * 10 ** 12,
+        "currentSUsdPrice": 50,
+        "sellFee": 500,
+        "poolS": 7000 * 10 ** 18,
+        "liquidityPoolCreated": False,
+        "paused": False,
+    },
+}
+
+# Runs in the child interpreter: time each phase, exit after the backlog is replayed
+CHILD = r"""
+import time
+launched = time.time()
+import asyncio, json, logging, sys
+sys.path.insert(0, ".")
+started = time.time()
+import jackpot_agent
+logging.getLogger("100xJackpotAgent").setLevel(logging.WARNING)
+imported = time.time()
+
+agent = jackpot_agent.JackpotAgent([sys.argv[1]])
+constructed = time.time()
+
+first_event = []
+def timed(handler):
+    async def wrapper(event):
+        if not first_event:
+            first_event.append(time.time())
+        return await handler(event)
+    return wrapper
+agent.event_handlers = {name: timed(handler) for name, handler in agent.event_handlers.items()}
+
+async def main():
+    marks = {}
+    await agent.start()
+    marks["started"] = time.time()
+    # startup() overlaps the stats refresh with the replay; earlier revisions ran them in turn
+    if hasattr(agent, "startup"):
+        await asyncio.gather(agent.update_game_stats(), agent.catch_up())
+    else:
+        await agent.update_game_stats()
+        await agent.catch_up()
+    marks["ready"] = time.time()
+    await agent.close()
+    return marks
+
+marks = asyncio.run(main())
+print(json.dumps({
+    "launched": launched, "imports_started": started, "imported": imported, "constructed": constructed,
+    "started": marks["started"], "ready": marks["ready"], "first_event": first_event[0] if first_event else None,
+}))
+"""
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def serve(chain: FakeChain, port: int) -> web.AppRunner:
+    """Expose the fake chain as an HTTP JSON-RPC endpoint"""
+    async def handle(request: web.Request) -> web.Response:
+        return web.Response(body=await chain.request(await request.read()), content_type="application/json")
+
+    app = web.Application()
+    app.router.add_post("/", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+
+async def cold_start(agent_dir: str, url: str, env: Dict[str, str]) -> Dict[str, float]:
+    """One fresh-process restart; phase durations in seconds"""
+    for path in (env["CHECKPOINT_FILE"], env["EVENT_STORE_FILE"], env["PLAYER_INDEX_FILE"], env["CANDLES_FILE"]):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    spawned = time.time()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-c", CHILD, url,
+        cwd=agent_dir, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(f"Agent in {agent_dir} failed:\n{stderr.decode()[-2000:]}")
+    marks = json.loads(stdout.decode().strip().splitlines()[-1])
+
+    return {
+        "interpreter_s": marks["imports_started"] - spawned,
+        "import_s": marks["imported"] - marks["imports_started"],
+        "init_s": marks["constructed"] - marks["imported"],
+        "start_s": marks["started"] - marks["constructed"],
+        "stats_and_catch_up_s": marks["ready"] - marks["started"],
+        "ready_s": marks["ready"] - spawned,
+        "first_event_s": marks["first_event"] - spawned if marks["first_event"] else float("nan"),
+        "first_event_after_import_s": marks["first_event"] - marks["imported"] if marks["first_event"] else float("nan"),
+    }
+
+
+async def run(args) -> None:
+    chain = FakeChain(latency=args.latency)
+    chain.register_contract(JACKPOT_ADDRESS, load_abi("JackpotGame.json"), VIEW_RESULTS["jackpot"])
+    chain.register_contract(BONDING_CURVE_ADDRESS, load_abi("BondingCurve.json"), VIEW_RESULTS["bonding_curve"])
+    chain.add_logs(JackpotLogGenerator(to_checksum_address(JACKPOT_ADDRESS)).generate(args.events))
+
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    runner = await serve(chain, port)
+
+    state_dir = tempfile.mkdtemp(prefix="jackpot-startup-")
+    env = dict(
+        os.environ,
+        RPC_URLS=url, RPC_URL=url, JACKPOT_ADDRESS=JACKPOT_ADDRESS, TOKEN_ADDRESS=TOKEN_ADDRESS,
+        BONDING_CURVE_ADDRESS=BONDING_CURVE_ADDRESS, LIQUIDITY_POOL_FACTORY_ADDRESS="", START_BLOCK="1",
+        AGENT_PRIVATE_KEY=AGENT_KEY, WS_URL="", METRICS_PORT="0", HINT_SERVER_PORT="0", MULTICALL_ADDRESS="",
+        TWITTER_API_KEY="", TWITTER_API_SECRET="", TWITTER_ACCESS_TOKEN="", TWITTER_ACCESS_SECRET="",
+        CHECKPOINT_FILE=os.path.join(state_dir, "checkpoint.json"),
+        EVENT_STORE_FILE=os.path.join(state_dir, "events.db"),
+        PLAYER_INDEX_FILE=os.path.join(state_dir, "players.npz"),
+        CANDLES_FILE=os.path.join(state_dir, "candles.npz"),
+    )
+
+    print(f"{args.events:,} backlog events, {args.latency * 1000:.0f}ms simulated RPC latency, median of {args.repeat} runs\n")
+    try:
+        for agent_dir in args.agent_dir or [AGENT_DIR]:
+            runs: List[Dict[str, float]] = []
+            requests = None
+            for _ in range(args.repeat):
+                before = chain.requests.copy()
+                runs.append(await cold_start(os.path.abspath(agent_dir), url, env))
+                requests = chain.requests - before
+
+            print(agent_dir)
+            for phase in runs[0]:
+                print(f"  {phase:<22} {statistics.median(run[phase] for run in runs):>8.3f}")
+            print(f"  RPC requests: {dict(sorted(requests.items()))}\n")
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=2000, help="backlog replayed on startup")
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated RPC round trip in seconds")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--agent-dir", action="append", help="agent directory to start (repeatable)")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+GameStats memory and insert-cost benchmark
+
+Feeds synthetic hint purchases, guesses and new players into GameStats at
+increasing volumes and reports retained memory and the per-event cost. Both
+should stay flat as volume grows. The previous list-based implementation is
+run alongside for comparison.
+
+Usage: python benchmarks/bench_stats.py [--max-events 1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_stats import GameStats
+
+
+class ListGameStats:
+    """The original list-backed stats, kept here as a baseline"""
+
+    def __init__(self):
+        self.hints_purchased = []
+        self.recent_activities = []
+
+    def add_activity(self, activity_type: str, message: str, timestamp: float = None):
+        self.recent_activities.append({"type": activity_type, "message": message, "timestamp": timestamp})
+        if len(self.recent_activities) > 100:
+            self.recent_activities = self.recent_activities[-100:]
+
+    def record_hint_purchase(self, hint_index: int):
+        self.hints_purchased.append(hint_index)
+
+    def record_player(self, player: str):
+        pass
+
+
+def feed(stats, count: int, players: int = 5000, hints: int = 20):
+    """Apply count synthetic events, cycling over a fixed player and hint population"""
+    for i in range(count):
+        player = f"0x{i % players:040x}"
+        if i % 3 == 0:
+            stats.record_hint_purchase(i % hints)
+            stats.add_activity("hint_purchased", f"Player {player[:6]} purchased hint #{i % hints}", float(i))
+        else:
+            stats.add_activity("guess", f"Player {player[:6]} made a guess", float(i))
+        stats.record_player(player)
+
+
+def measure(factory, count: int):
+    """Return (retained bytes, ns per event) for count events"""
+    # Timed without tracemalloc, which would dominate the per-event cost
+    stats = factory()
+    started = time.perf_counter()
+    feed(stats, count)
+    elapsed = time.perf_counter() - started
+    del stats
+
+    tracemalloc.start()
+    stats = factory()
+    feed(stats, count)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del stats
+    return retained, elapsed / count * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--max-events", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    volumes = []
+    count = 1000
+    while count <= args.max_events:
+        volumes.append(count)
+        count *= 10
+
+    print(f"{'events':>10}  {'GameStats KiB':>14}  {'ns/event':>9}  {'list KiB':>10}  {'ns/event':>9}")
+    for count in volumes:
+        ring_bytes, ring_ns = measure(GameStats, count)
+        list_bytes, list_ns = measure(ListGameStats, count)
+        print(f"{count:>10}  {ring_bytes / 1024:>14.1f}  {ring_ns:>9.0f}  {list_bytes / 1024:>10.1f}  {list_ns:>9.0f}")
+
+    stats = GameStats()
+    feed(stats, volumes[-1])
+    print(f"\nUnique players: ~{stats.players_seen.estimate()} estimated (5000 actual)")
+
+
+if __name__ == "__main__":
+    main()
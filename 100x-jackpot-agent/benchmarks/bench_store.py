@@ -0,0 +1,110 @@
+"""
+Event store benchmark
+
+Fills an EventStore with synthetic JackpotGame events (decoded with the
+agent's LogDecoder, written in poll-sized batches) and measures write
+throughput, indexed lookup latency and the cost of the aggregate queries
+used by summaries.
+
+Usage: python benchmarks/bench_store.py [--rows 1000000] [--batch 500] [--path store.db]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+AGENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AGENT_DIR)
+
+from event_store import EventStore  # noqa: E402
+from log_decoder import LogDecoder  # noqa: E402
+
+from synthetic import JackpotLogGenerator, load_abi  # noqa: E402
+
+ADDRESS = "0x00000000000000000000000000000000000a11ce"
+
+
+def timed(function, iterations: int) -> dict:
+    """Latency of repeated calls in microseconds"""
+    latencies = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        function(i)
+        latencies.append((time.perf_counter() - started) * 1e6)
+    latencies.sort()
+    return {
+        "p50_us": statistics.median(latencies),
+        "p95_us": latencies[int(len(latencies) * 0.95) - 1],
+        "max_us": latencies[-1],
+    }
+
+
+def fill(store: EventStore, rows: int, batch: int, players: int) -> float:
+    """Write rows decoded events; returns rows/sec"""
+    abi = load_abi("JackpotGame.json")
+    decoder = LogDecoder()
+    decoder.register_contract(ADDRESS, abi)
+    generator = JackpotLogGenerator(ADDRESS, abi, players=players, logs_per_block=batch // 10 or 1)
+
+    written, elapsed = 0, 0.0
+    while written < rows:
+        events = [decoder.decode(log) for log in generator.generate(min(batch, rows - written))]
+        started = time.perf_counter()
+        store.write(events)
+        elapsed += time.perf_counter() - started
+        written += len(events)
+        if written % (batch * 200) == 0:
+            print(f"  {written:,} rows")
+    return rows / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--batch", type=int, default=500, help="events per write (one poll)")
+    parser.add_argument("--players", type=int, default=50000)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--path", help="database file (default: a temporary file)")
+    args = parser.parse_args()
+
+    path = args.path or os.path.join(tempfile.mkdtemp(prefix="jackpot-store-"), "events.db")
+    store = EventStore(path)
+
+    if store.count() < args.rows:
+        print(f"Writing {args.rows:,} events to {path}...")
+        print(f"  {fill(store, args.rows, args.batch, args.players):,.0f} rows/s")
+
+    head = store.last_block()
+    players = [f"0x{index + 1:040x}" for index in range(args.players)]
+
+    lookups = {
+        "count(player)": lambda i: store.count(player=players[i % len(players)]),
+        "count(HintRequested, player)": lambda i: store.count("HintRequested", players[i % len(players)]),
+        "events(player, limit=20)": lambda i: store.events(player=players[i % len(players)], limit=20),
+        "latest(JackpotWon)": lambda i: store.latest("JackpotWon"),
+        "events(GuessRevealed, block range)": lambda i: store.events("GuessRevealed", from_block=head - i - 50, to_block=head - i),
+    }
+    print(f"Indexed lookups ({store.count():,} rows):")
+    for name, function in lookups.items():
+        result = timed(function, args.iterations)
+        print(f"  {name:<38} p50 {result['p50_us']:>8.1f} us  p95 {result['p95_us']:>8.1f} us")
+
+    aggregates = {
+        "counts()": lambda i: store.counts(),
+        "count(HintRequested, through)": lambda i: store.count("HintRequested", through=(head - i, 0)),
+        "hint_purchases()": lambda i: store.hint_purchases(),
+        "leaderboard(GuessRevealed)": lambda i: store.leaderboard("GuessRevealed", 5),
+    }
+    print("Aggregates (full index scans):")
+    for name, function in aggregates.items():
+        result = timed(function, 5)
+        print(f"  {name:<38} p50 {result['p50_us'] / 1000:>8.1f} ms")
+
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
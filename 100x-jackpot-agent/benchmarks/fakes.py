@@ -0,0 +1,162 @@
+"""
+In-process fakes for benchmarking the agent without a chain or Twitter
+
+FakeChain answers JSON-RPC requests from memory. It exposes the same
+request()/post() interface as RpcPool, so it can be plugged into
+PooledProvider and ReadBatcher directly. Logs come from a synthetic
+generator. View calls return canned values per function name, and
+transaction-related methods return fixed answers.
+
+FakeTwitter stands in for tweepy.Client and records what would be posted.
+"""
+
+import asyncio
+import itertools
+import json
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from eth_abi import encode
+from eth_utils import function_abi_to_4byte_selector, keccak
+from web3._utils.encoding import Web3JsonEncoder
+
+from log_decoder import to_bytes
+
+
+class FakeChain:
+    def __init__(self, head: int = 0, latency: float = 0.0, chain_id: int = 146):
+        self.head = head
+        self.latency = latency
+        self.chain_id = chain_id
+
+        # block -> raw logs in that block
+        self.logs: Dict[int, List[Dict]] = {}
+        # (address, selector) -> encoded return data
+        self.call_results: Dict[tuple, bytes] = {}
+
+        self.requests: Counter = Counter()
+        self.nonce = 0
+
+    def add_logs(self, logs: Iterable[Dict]):
+        """Store raw logs and move the head to the newest block"""
+        for log in logs:
+            block = int(log["blockNumber"], 16)
+            self.logs.setdefault(block, []).append(log)
+            self.head = max(self.head, block)
+
+    def register_contract(self, address: str, abi: List[Dict], results: Dict[str, Any]):
+        """Set canned return values for a contract's view functions"""
+        for item in abi:
+            if item.get("type") != "function" or item["name"] not in results:
+                continue
+            types = [output["type"] for output in item.get("outputs", [])]
+            value = results[item["name"]]
+            values = list(value) if isinstance(value, (list, tuple)) else [value]
+            self.call_results[(address.lower(), function_abi_to_4byte_selector(item))] = encode(types, values)
+
+    def get_logs(self, criteria: Dict) -> List[Dict]:
+        """eth_getLogs over the stored logs"""
+        from_block = int(criteria.get("fromBlock", "0x0"), 16)
+        to_block = criteria.get("toBlock", "latest")
+        to_block = self.head if to_block == "latest" else int(to_block, 16)
+
+        addresses = criteria.get("address") or []
+        if isinstance(addresses, str):
+            addresses = [addresses]
+        addresses = {address.lower() for address in addresses}
+
+        topics = criteria.get("topics") or []
+        topic0 = topics[0] if topics else None
+        if isinstance(topic0, str):
+            topic0 = [topic0]
+        topic0 = {topic.lower() for topic in topic0} if topic0 else None
+
+        matched = []
+        for block in range(from_block, to_block + 1):
+            for log in self.logs.get(block, ()):
+                if addresses and log["address"] not in addresses:
+                    continue
+                if topic0 is not None and log["topics"][0] not in topic0:
+                    continue
+                matched.append(log)
+        return matched
+
+    def handle(self, request: Dict) -> Dict:
+        """Answer one JSON-RPC request"""
+        method = request["method"]
+        params = request.get("params", [])
+        self.requests[method] += 1
+
+        if method == "eth_blockNumber":
+            result = hex(self.head)
+        elif method == "eth_chainId":
+            result = hex(self.chain_id)
+        elif method == "eth_getLogs":
+            result = self.get_logs(params[0])
+        elif method == "eth_call":
+            call = params[0]
+            data = to_bytes(call.get("data") or call.get("input"))
+            returned = self.call_results.get((call["to"].lower(), data[:4]))
+            if returned is None:
+                return {"jsonrpc": "2.0", "id": request.get("id"),
+                        "error": {"code": -32000, "message": "execution reverted"}}
+            result = "0x" + returned.hex()
+        elif method == "eth_gasPrice":
+            result = hex(10 ** 9)
+        elif method == "eth_getTransactionCount":
+            result = hex(self.nonce)
+        elif method == "eth_sendRawTransaction":
+            self.nonce += 1
+            result = "0x" + keccak(to_bytes(params[0])).hex()
+        elif method == "net_version":
+            result = str(self.chain_id)
+        elif method == "web3_clientVersion":
+            result = "FakeChain/1.0"
+        else:
+            return {"jsonrpc": "2.0", "id": request.get("id"),
+                    "error": {"code": -32601, "message": f"method {method} not supported"}}
+
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+    async def post(self, payload: Any, hedge: bool = False) -> Any:
+        """RpcPool.post equivalent: decoded request in, decoded response out"""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if isinstance(payload, list):
+            return [self.handle(request) for request in payload]
+        return self.handle(payload)
+
+    async def request(self, body: bytes, hedge: bool = False, method: str = "unknown") -> bytes:
+        """RpcPool.request equivalent, used by PooledProvider"""
+        response = await self.post(json.loads(body), hedge)
+        return json.dumps(response, cls=Web3JsonEncoder).encode()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """RpcPool.stats equivalent; a fake has no endpoints to report"""
+        return []
+
+
+class FakeResponse:
+    __slots__ = ("data",)
+
+    def __init__(self, data: Dict):
+        self.data = data
+
+
+class FakeTwitter:
+    """tweepy.Client stand-in; create_tweet returns immediately (or after latency seconds)"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.ids = itertools.count(1)
+        self.posted = 0
+        self.last_text: Optional[str] = None
+
+    def create_tweet(self, text: str, **kwargs) -> FakeResponse:
+        if self.latency:
+            # Runs in a worker thread, like the real client
+            time.sleep(self.latency)
+        self.posted += 1
+        self.last_text = text
+        return FakeResponse({"id": str(next(self.ids)), "text": text})
@@ -0,0 +1,144 @@
+"""
+Synthetic JackpotGame logs for benchmarks
+
+Generates raw eth_getLogs entries (hex-encoded, as a node returns them) for
+every event the agent handles. Players come from a fixed population, the
+first action of each player is preceded by a NewPlayer log, and the mix of
+event types is configurable. Output is deterministic for a given seed.
+"""
+
+import json
+import os
+import random
+from typing import Dict, List, Optional
+
+from eth_abi import encode
+from eth_utils import event_abi_to_log_topic, keccak, to_checksum_address
+
+AGENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Relative frequency of each handled event; NewPlayer is emitted on demand
+DEFAULT_MIX = {
+    "GuessCommitted": 30,
+    "GuessRevealed": 30,
+    "HintRequested": 15,
+    "GameUpdate": 8,
+    "SocialAnnouncement": 5,
+    "HintAdded": 2,
+    "JackpotWon": 1,
+}
+
+
+def load_abi(filename: str) -> List[Dict]:
+    """Load an ABI from a Hardhat artifact or a bare ABI file in the agent directory"""
+    with open(os.path.join(AGENT_DIR, filename), "r") as f:
+        abi = json.load(f)
+    return abi["abi"] if isinstance(abi, dict) else abi
+
+
+def encode_topic(abi_type: str, value) -> bytes:
+    """Encode one indexed argument as a 32-byte topic"""
+    if abi_type in ("string", "bytes"):
+        return keccak(value.encode() if isinstance(value, str) else value)
+    return encode([abi_type], [value])
+
+
+def encode_log(
+    address: str,
+    event_abi: Dict,
+    values: Dict,
+    block: int,
+    log_index: int,
+    transaction_index: int = 0
+) -> Dict:
+    """Build a raw log entry for an event with the given argument values"""
+    inputs = event_abi["inputs"]
+    topics = [event_abi_to_log_topic(event_abi)]
+    topics += [encode_topic(item["type"], values[item["name"]]) for item in inputs if item["indexed"]]
+    data_inputs = [item for item in inputs if not item["indexed"]]
+    data = encode([item["type"] for item in data_inputs], [values[item["name"]] for item in data_inputs])
+
+    return {
+        "address": address.lower(),
+        "topics": ["0x" + topic.hex() for topic in topics],
+        "data": "0x" + data.hex(),
+        "blockNumber": hex(block),
+        "logIndex": hex(log_index),
+        "transactionHash": "0x" + keccak(f"{block}:{log_index}".encode()).hex(),
+        "transactionIndex": hex(transaction_index),
+        "blockHash": "0x" + keccak(str(block).encode()).hex(),
+        "removed": False,
+    }
+
+
+class JackpotLogGenerator:
+    def __init__(
+        self,
+        address: str,
+        abi: Optional[List[Dict]] = None,
+        players: int = 1000,
+        hints: int = 20,
+        logs_per_block: int = 10,
+        start_block: int = 1,
+        mix: Optional[Dict[str, int]] = None,
+        seed: int = 1
+    ):
+        self.address = address
+        abi = abi if abi is not None else load_abi("JackpotGame.json")
+        self.events = {item["name"]: item for item in abi if item.get("type") == "event"}
+        self.players = [to_checksum_address(f"0x{index + 1:040x}") for index in range(players)]
+        self.hints = hints
+        self.logs_per_block = logs_per_block
+        self.block = start_block
+        self.log_index = 0
+        self.mix = mix or DEFAULT_MIX
+        self.random = random.Random(seed)
+        self.joined = set()
+        self.count = 0
+
+    def values(self, name: str, player: str) -> Dict:
+        """Argument values for one event"""
+        n = self.count
+        if name == "GuessCommitted":
+            return {"player": player, "commitment": keccak(f"commit-{n}".encode())}
+        if name == "GuessRevealed":
+            return {"player": player, "guess": f"guess-{n}", "won": False}
+        if name == "HintRequested":
+            return {"player": player, "hintIndex": self.random.randrange(self.hints)}
+        if name == "HintAdded":
+            return {"index": n % self.hints}
+        if name == "NewPlayer":
+            return {"player": player}
+        if name == "JackpotWon":
+            return {"winner": player, "amount": self.random.randrange(1, 100) * 10 ** 18, "guess": f"secret-{n}"}
+        if name == "SocialAnnouncement":
+            return {"announcementType": "JACKPOT_FUNDED", "message": "Jackpot funded!"}
+        if name == "GameUpdate":
+            return {"message": f"Game update #{n}"}
+        raise ValueError(f"No generator for event {name}")
+
+    def emit(self, name: str, player: str) -> Dict:
+        """Encode one log at the next (block, logIndex) position"""
+        log = encode_log(self.address, self.events[name], self.values(name, player), self.block, self.log_index)
+        self.count += 1
+        self.log_index += 1
+        if self.log_index >= self.logs_per_block:
+            self.block += 1
+            self.log_index = 0
+        return log
+
+    def generate(self, count: int) -> List[Dict]:
+        """The next count logs in chain order"""
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        logs = []
+        while len(logs) < count:
+            name = self.random.choices(names, weights)[0]
+            player = self.random.choice(self.players)
+            if player not in self.joined and name in ("GuessCommitted", "HintRequested"):
+                self.joined.add(player)
+                logs.append(self.emit("NewPlayer", player))
+                if len(logs) >= count:
+                    break
+            logs.append(self.emit(name, player))
+        return logs
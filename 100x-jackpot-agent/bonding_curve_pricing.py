@@ -0,0 +1,320 @@
+"""
+Local bonding curve pricing for the 100x Jackpot DeFAI Agent
+
+Reproduces the BondingCurve.sol quote math (getCurrentPrice,
+calculateBuyPrice, calculateSellPrice, the sell fee split and the USD
+conversions) from one snapshot of the curve's state, evaluated over whole
+arrays of trade sizes with NumPy. Every result is floored exactly like the
+uint256 arithmetic on chain, so quotes match the contract to the wei.
+
+Prices fit in int64 and are computed there; (f - i) * supply / T is split
+with divmod so no intermediate overflows. Costs can exceed 2**64 wei, so the
+final (start + end) * amount / 2 product is taken on Python integers
+(object arrays). Trade sizes are uint256 arguments; sizes too large for
+supply + amount to stay in int64 are kept as Python integers too.
+
+Amounts are whole 100X tokens, as the contract's tokenAmount arguments;
+results are in wei (S) or USD cents.
+
+Usage: python bonding_curve_pricing.py [--amounts 1000,100000,1000000] [--verify 200]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger("100xJackpotAgent")
+
+# BondingCurve.sol constants
+TOKEN_DECIMALS = 10 ** 6
+THRESHOLD = 100_000_000 * TOKEN_DECIMALS
+TOTAL_SUPPLY = THRESHOLD // TOKEN_DECIMALS  # 100M whole tokens
+MAX_TOKEN_AMOUNT_PER_TX = 10_000_000
+FEE_DENOMINATOR = 10000
+
+# View functions that make up a pricing snapshot, in CurveState field order
+STATE_FUNCTIONS = (
+    "totalBought", "totalSoldBack", "initialPrice", "finalPrice",
+    "currentSUsdPrice", "sellFee", "poolS", "liquidityPoolCreated", "paused",
+)
+
+# Trade sizes at or above this are kept as Python integers, so supply + amount cannot wrap in int64
+INT64_AMOUNT_BOUND = 2 ** 62
+
+# Trade sizes (whole tokens) for the default slippage table
+DEFAULT_AMOUNTS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+class CurveState:
+    __slots__ = (
+        "total_bought", "total_sold_back", "initial_price", "final_price",
+        "s_usd_price", "sell_fee", "pool_s", "liquidity_pool_created", "paused", "block",
+    )
+
+    def __init__(
+        self,
+        total_bought: int,
+        total_sold_back: int,
+        initial_price: int,
+        final_price: int,
+        s_usd_price: int,
+        sell_fee: int,
+        pool_s: int = 0,
+        liquidity_pool_created: bool = False,
+        paused: bool = False,
+        block: Optional[int] = None
+    ):
+        self.total_bought = total_bought
+        self.total_sold_back = total_sold_back
+        self.initial_price = initial_price
+        self.final_price = final_price
+        self.s_usd_price = s_usd_price
+        self.sell_fee = sell_fee
+        self.pool_s = pool_s
+        self.liquidity_pool_created = liquidity_pool_created
+        self.paused = paused
+        self.block = block
+
+    @classmethod
+    async def read(cls, reader, contract, block: Optional[int] = None) -> "CurveState":
+        """Read every pricing input as one batched snapshot through a ReadBatcher"""
+        values = await reader.read(*(contract.functions[name]() for name in STATE_FUNCTIONS), block=block)
+        return cls(*values, block=block if block is not None else reader.head)
+
+
+class CurvePricer:
+    def __init__(self, state: CurveState):
+        self.state = state
+        if state.final_price < state.initial_price:
+            # finalPrice - initialPrice underflows: every quote reverts on chain
+            raise ValueError("finalPrice below initialPrice; the contract's quotes revert")
+
+        self.net_supply = (state.total_bought - state.total_sold_back) // TOKEN_DECIMALS
+        self.spread_quotient, self.spread_remainder = divmod(state.final_price - state.initial_price, TOTAL_SUPPLY)
+
+        # int64 is exact while every price and quotient * supply stays below 2**63;
+        # amounts() keeps larger trade sizes out of it
+        supply_bound = max(self.net_supply, TOTAL_SUPPLY)
+        self.dtype = np.int64 if (
+            state.final_price < 2 ** 62 and self.spread_quotient * supply_bound < 2 ** 62 and supply_bound < 2 ** 40
+        ) else object
+
+    def amounts(self, amounts: Sequence[int]) -> np.ndarray:
+        """Validate trade sizes (uint256 arguments) as an array
+
+        int64 when every size is below INT64_AMOUNT_BOUND, else Python integers.
+        """
+        values = None
+        if self.dtype is not object and (not isinstance(amounts, np.ndarray) or np.can_cast(amounts.dtype, np.int64)):
+            try:
+                values = np.asarray(amounts, dtype=np.int64)
+            except OverflowError:
+                pass
+        if values is None or (values.size and values.max() >= INT64_AMOUNT_BOUND):
+            values = np.asarray(amounts).astype(object)
+        if values.size and values.min() < 0:
+            raise ValueError("Token amounts must be non-negative")
+        return values
+
+    def price_at(self, supply) -> np.ndarray:
+        """initialPrice + (finalPrice - initialPrice) * supply / totalSupply, floored"""
+        supply = np.asarray(supply, dtype=self.dtype)
+        return (
+            self.state.initial_price
+            + self.spread_quotient * supply
+            + (self.spread_remainder * supply) // TOTAL_SUPPLY
+        )
+
+    def current_price(self) -> int:
+        """getCurrentPrice(): wei per whole token"""
+        if self.net_supply >= TOTAL_SUPPLY:
+            return self.state.final_price
+        return int(self.price_at(self.net_supply))
+
+    @staticmethod
+    def trapezoid(start: np.ndarray, end: np.ndarray, amounts: np.ndarray) -> np.ndarray:
+        """((start + end) * amount) / 2 on exact integers"""
+        return ((start + end).astype(object) * amounts.astype(object)) // 2
+
+    def buy_cost(self, amounts: Sequence[int]) -> np.ndarray:
+        """calculateBuyPrice(amount) in wei, for each amount"""
+        amounts = self.amounts(amounts)
+        start = self.price_at(self.net_supply)
+        end = self.price_at(np.minimum(self.net_supply + amounts, TOTAL_SUPPLY))
+        return self.trapezoid(start, end, amounts)
+
+    def sell_value(self, amounts: Sequence[int]) -> np.ndarray:
+        """calculateSellPrice(amount) in wei, before fees"""
+        amounts = self.amounts(amounts)
+        end = self.price_at(self.net_supply)
+        start = self.price_at(np.where(self.net_supply > amounts, self.net_supply - amounts, 0))
+        return self.trapezoid(start, end, amounts)
+
+    def sell_proceeds(self, amounts: Sequence[int]) -> Dict[str, np.ndarray]:
+        """What sell(amount) pays out on the curve: seller, jackpot and pool shares of the value"""
+        value = self.sell_value(amounts)
+        fee = value * self.state.sell_fee // FEE_DENOMINATOR
+        jackpot_share = fee // 2
+        return {
+            "value": value,
+            "fee": fee,
+            "jackpot_share": jackpot_share,
+            "pool_share": fee - jackpot_share,
+            "received": value - fee,
+        }
+
+    def to_usd_cents(self, wei: np.ndarray) -> np.ndarray:
+        """getUsdBuyPrice / getUsdSellPrice conversion: wei * 100 / currentSUsdPrice"""
+        return wei * 100 // self.state.s_usd_price
+
+    def buy_allowed(self, amounts: Sequence[int]) -> np.ndarray:
+        """Whether buy(amount) passes the amount, per-tx cap and threshold checks"""
+        amounts = self.amounts(amounts)
+        room = (THRESHOLD - (self.state.total_bought - self.state.total_sold_back)) // TOKEN_DECIMALS
+        return (amounts > 0) & (amounts <= MAX_TOKEN_AMOUNT_PER_TX) & (amounts <= room) & (not self.state.paused)
+
+    def sell_allowed(self, amounts: Sequence[int]) -> np.ndarray:
+        """Whether sell(amount) passes the curve's own checks (pool balance included)"""
+        amounts = self.amounts(amounts)
+        proceeds = self.sell_proceeds(amounts)
+        solvent = np.array(
+            [self.state.pool_s >= received + pool for received, pool in zip(proceeds["received"], proceeds["pool_share"])],
+            dtype=bool
+        )
+        return (amounts > 0) & (amounts <= MAX_TOKEN_AMOUNT_PER_TX) & solvent & (not self.state.paused)
+
+    def slippage_table(self, amounts: Sequence[int] = DEFAULT_AMOUNTS) -> List[Dict]:
+        """Cost, average price and impact against the spot price for buys and sells of each size"""
+        amounts = self.amounts(amounts)
+        spot = self.current_price()
+        costs = self.buy_cost(amounts)
+        received = self.sell_proceeds(amounts)["received"]
+        rows = []
+        for amount, cost, proceeds in zip(amounts, costs, received):
+            amount = int(amount)
+            rows.append({
+                "amount": amount,
+                "buy_cost_wei": int(cost),
+                "buy_avg_price_wei": cost / amount if amount else None,
+                "buy_impact": cost / amount / spot - 1 if amount and spot else None,
+                "sell_received_wei": int(proceeds),
+                "sell_avg_price_wei": proceeds / amount if amount else None,
+                "sell_impact": proceeds / amount / spot - 1 if amount and spot else None,
+            })
+        return rows
+
+    def summary(self, amounts: Sequence[int] = (10_000, 1_000_000)) -> str:
+        """One-line buy impact summary for logs"""
+        return ", ".join(
+            f"buy {row['amount']:,}: {row['buy_cost_wei'] / 10 ** 18:.4f} S ({row['buy_impact']:+.2%})"
+            for row in self.slippage_table(amounts) if row["buy_impact"] is not None
+        )
+
+
+def format_table(pricer: CurvePricer, rows: List[Dict]) -> str:
+    lines = [
+        f"Block {pricer.state.block}: {pricer.net_supply:,} of {TOTAL_SUPPLY:,} sold, "
+        f"spot {pricer.current_price() / 10 ** 18:.8f} S, sell fee {pricer.state.sell_fee / 100:.2f}%"
+        + (" (sells route to the liquidity pool)" if pricer.state.liquidity_pool_created else ""),
+        f"{'amount':>12} {'buy cost (S)':>18} {'buy impact':>11} {'sell gets (S)':>18} {'sell impact':>12}",
+    ]
+    for row in rows:
+        lines.append(
+            f"{row['amount']:>12,} {row['buy_cost_wei'] / 10 ** 18:>18.6f} {row['buy_impact'] or 0:>+11.3%} "
+            f"{row['sell_received_wei'] / 10 ** 18:>18.6f} {row['sell_impact'] or 0:>+12.3%}"
+        )
+    return "\n".join(lines)
+
+
+async def verify(reader, contract, pricer: CurvePricer, count: int, seed: int = 1) -> int:
+    """Compare local quotes with calculateBuyPrice/calculateSellPrice/getUsd* eth_calls at the same block"""
+    rng = random.Random(seed)
+    edges = [0, 1, 2, 999_999, 1_000_000, MAX_TOKEN_AMOUNT_PER_TX, pricer.net_supply, pricer.net_supply + 1,
+             max(0, TOTAL_SUPPLY - pricer.net_supply), TOTAL_SUPPLY, 2 * TOTAL_SUPPLY]
+    amounts = edges + [rng.randrange(1, 10 ** rng.randint(1, 9)) for _ in range(max(0, count - len(edges)))]
+
+    local = {
+        "calculateBuyPrice": pricer.buy_cost(amounts),
+        "calculateSellPrice": pricer.sell_value(amounts),
+    }
+    local["getUsdBuyPrice"] = pricer.to_usd_cents(local["calculateBuyPrice"])
+    local["getUsdSellPrice"] = pricer.to_usd_cents(local["calculateSellPrice"])
+
+    started = time.perf_counter()
+    remote = {}
+    for name in local:
+        remote[name] = await reader.read(*(contract.functions[name](amount) for amount in amounts), block=pricer.state.block)
+    rpc_seconds = time.perf_counter() - started
+
+    mismatches = 0
+    for name, values in local.items():
+        for amount, mine, theirs in zip(amounts, values, remote[name]):
+            if int(mine) != theirs:
+                mismatches += 1
+                logger.error(f"{name}({amount}): local {int(mine)} != chain {theirs}")
+    spot = await reader.call(contract.functions.getCurrentPrice(), block=pricer.state.block)
+    if spot != pricer.current_price():
+        mismatches += 1
+        logger.error(f"getCurrentPrice(): local {pricer.current_price()} != chain {spot}")
+
+    started = time.perf_counter()
+    pricer.buy_cost(amounts)
+    pricer.sell_proceeds(amounts)
+    local_seconds = time.perf_counter() - started
+
+    logger.info(
+        f"Verified {len(amounts) * len(local) + 1} quotes at block {pricer.state.block}: {mismatches} mismatches " +
+        f"(local {local_seconds * 1000:.2f} ms vs {rpc_seconds * 1000:.0f} ms over RPC)"
+    )
+    return mismatches
+
+
+async def main(args):
+    import aiohttp
+    from web3 import AsyncWeb3
+
+    from abi_artifact import read_artifact
+    from read_batcher import ReadBatcher
+    from rpc_pool import RpcPool
+
+    # The full ABI: --verify calls quote functions the compact artifact leaves out
+    abi, _ = read_artifact("BondingCurve")
+    contract = AsyncWeb3().eth.contract(address=AsyncWeb3.to_checksum_address(args.address), abi=abi)
+
+    async with aiohttp.ClientSession() as session:
+        pool = RpcPool([url.strip() for url in args.rpc_urls.split(",") if url.strip()], session, hedge=False)
+        reader = ReadBatcher(pool)
+        reader.set_head(await reader.block_number())
+
+        pricer = CurvePricer(await CurveState.read(reader, contract))
+        print(format_table(pricer, pricer.slippage_table([int(amount) for amount in args.amounts.split(",")])))
+
+        if args.verify:
+            mismatches = await verify(reader, contract, pricer, args.verify)
+            raise SystemExit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Bonding curve slippage table, computed locally from one state read")
+    parser.add_argument("--rpc-urls", default=os.getenv("RPC_URLS") or os.getenv("RPC_URL", "http://127.0.0.1:8545"))
+    parser.add_argument("--address", default=os.getenv("BONDING_CURVE_ADDRESS", "0x2ECA93adD34C533008b947B2Ed02e4974122D525"))
+    parser.add_argument("--amounts", default=",".join(str(amount) for amount in DEFAULT_AMOUNTS),
+                        help="comma-separated trade sizes in whole 100X tokens")
+    parser.add_argument("--verify", type=int, default=0, metavar="N",
+                        help="also check N quotes against the contract's view functions at the same block")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    asyncio.run(main(args))
@@ -0,0 +1,320 @@
+"""
+OHLCV candles for the 100x Jackpot DeFAI Agent
+
+CandleBuilder turns trades into 1m, 1h and 1d candles as they arrive: the
+bonding curve's Buy and Sell events, and Swap events on the token's
+liquidity pool after graduation. A Sell proxied to the pool also emits a
+Swap made by the curve itself; only the Sell counts, so the trade is
+counted once however the two logs are batched. Every candle holds the
+open, high, low and close price in S per whole 100X, the S and 100X
+volume, buy and sell counts and the net S flow into the token.
+
+Each resolution is a fixed-size ring of NumPy columns: adding a trade
+writes one slot, and moving into a new interval costs one step per elapsed
+candle (bounded by the ring size). Intervals without trades carry the
+previous close with zero volume, so price and volume for a summary come
+from memory without a single RPC read.
+
+Trades are timestamped with the log's blockTimestamp when the node provides
+it, else with an estimate from the head and the observed block time. Like
+the player index, the builder remembers the position of the last trade
+applied, so trades must arrive in chain order (from polls, not the log
+stream), and snapshots to a single .npz file. The CLI exports one
+resolution as CSV or as a compact NumPy record file.
+
+Usage: python candles.py agent_candles.npz [--resolution 1h] [--last 24] [--csv out.csv | --npy out.npy]
+"""
+
+import argparse
+import csv
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Callable, Collection, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("100xJackpotAgent")
+
+TOKEN_DECIMALS = 10 ** 6
+
+# Resolution -> (seconds per candle, candles kept)
+RESOLUTIONS = {
+    "1m": (60, 1440),
+    "1h": (3600, 720),
+    "1d": (86400, 365),
+}
+
+# Column -> dtype; prices are S per whole 100X, volume is in S, tokens in whole 100X
+COLUMNS = {
+    "start": np.int64,
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.float64,
+    "tokens": np.float64,
+    "buys": np.uint32,
+    "sells": np.uint32,
+    "net_flow": np.float64,  # S paid in by buyers minus S paid out to sellers
+}
+
+# Events that are trades, on the bonding curve and on liquidity pools
+TRADE_EVENTS = ("Buy", "Sell", "Swap")
+
+SNAPSHOT_VERSION = 1
+
+
+def trade(event_name: str, args: Mapping) -> Optional[Tuple[bool, float, float]]:
+    """(is buy, whole tokens, S) of a trade event
+
+    The curve reports whole tokens and the pool base units; both report wei.
+    """
+    if event_name == "Buy":
+        return True, float(args["tokenAmount"]), args["sPaid"] / 10 ** 18
+    if event_name == "Sell":
+        return False, float(args["tokenAmount"]), args["sReceived"] / 10 ** 18
+    if event_name == "Swap":
+        return bool(args["isBuy"]), args["tokenAmount"] / TOKEN_DECIMALS, args["sAmount"] / 10 ** 18
+    return None
+
+
+class CandleSeries:
+    """Ring of candles at one resolution; slot = interval % size"""
+
+    def __init__(self, seconds: int, size: int):
+        self.seconds = seconds
+        self.size = size
+        self.columns: Dict[str, np.ndarray] = {name: np.zeros(size, dtype=dtype) for name, dtype in COLUMNS.items()}
+        for name in ("open", "high", "low", "close"):
+            self.columns[name][:] = np.nan
+
+        # Interval number (start // seconds) of the newest candle, and how many slots hold candles
+        self.current: Optional[int] = None
+        self.filled = 0
+
+    def roll(self, interval: int):
+        """Open empty candles up to interval, each at the previous close"""
+        if self.current is not None and interval <= self.current:
+            return
+        close = self.columns["close"][self.current % self.size] if self.current is not None else np.nan
+        first = interval if self.current is None else max(self.current + 1, interval - self.size + 1)
+
+        intervals = np.arange(first, interval + 1, dtype=np.int64)
+        slots = intervals % self.size
+        for name, column in self.columns.items():
+            column[slots] = 0
+        for name in ("open", "high", "low", "close"):
+            self.columns[name][slots] = close
+        self.columns["start"][slots] = intervals * self.seconds
+
+        self.current = interval
+        self.filled = min(self.size, self.filled + len(intervals))
+
+    def add(self, timestamp: float, price: float, tokens: float, s: float, is_buy: bool):
+        self.roll(int(timestamp // self.seconds))
+        slot = self.current % self.size
+        columns = self.columns
+        if columns["buys"][slot] + columns["sells"][slot] == 0:
+            columns["open"][slot] = columns["high"][slot] = columns["low"][slot] = price
+        else:
+            columns["high"][slot] = max(columns["high"][slot], price)
+            columns["low"][slot] = min(columns["low"][slot], price)
+        columns["close"][slot] = price
+        columns["volume"][slot] += s
+        columns["tokens"][slot] += tokens
+        if is_buy:
+            columns["buys"][slot] += 1
+            columns["net_flow"][slot] += s
+        else:
+            columns["sells"][slot] += 1
+            columns["net_flow"][slot] -= s
+
+    def last(self, count: Optional[int] = None, now: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """The newest count candles (all kept by default), oldest first; now rolls the ring forward first"""
+        if now is not None and self.current is not None:
+            self.roll(int(now // self.seconds))
+        count = self.filled if count is None else min(count, self.filled)
+        if self.current is None or count <= 0:
+            return {name: column[:0].copy() for name, column in self.columns.items()}
+        slots = np.arange(self.current - count + 1, self.current + 1) % self.size
+        return {name: column[slots] for name, column in self.columns.items()}
+
+
+class CandleBuilder:
+    def __init__(self, resolutions: Mapping[str, Tuple[int, int]] = RESOLUTIONS):
+        self.series = {name: CandleSeries(seconds, size) for name, (seconds, size) in resolutions.items()}
+
+        # (block, logIndex) of the last trade applied, and its timestamp
+        self.position: Optional[Tuple[int, int]] = None
+        self.last_timestamp = 0.0
+        self.last_price: Optional[float] = None
+        self.trades = 0
+
+    def add_trade(self, timestamp: float, is_buy: bool, tokens: float, s: float):
+        """Add one trade to every resolution"""
+        if tokens <= 0:
+            return
+        # Block times never go backwards, but estimated ones can; keep closed candles closed
+        timestamp = max(timestamp, self.last_timestamp)
+        price = s / tokens
+        for series in self.series.values():
+            series.add(timestamp, price, tokens, s, is_buy)
+        self.last_timestamp = timestamp
+        self.last_price = price
+        self.trades += 1
+
+    def apply(self, event, timestamp: float) -> bool:
+        """Add a decoded trade event; False if it was already applied or is not a trade"""
+        parsed = trade(event.event, event.args)
+        if parsed is None:
+            return False
+        position = (event.blockNumber, event.logIndex)
+        if self.position is not None and position <= self.position:
+            return False
+        self.position = position
+        self.add_trade(timestamp, *parsed)
+        return True
+
+    def apply_events(
+        self,
+        events: List,
+        timestamp: Callable[[object], float],
+        pools: Collection[str] = (),
+        curve: Optional[str] = None
+    ) -> int:
+        """Add the trades in a batch of decoded events, in chain order
+
+        Only Swaps on the given pool addresses count, and not those made by
+        the curve: its Sell event reports the same trade.
+        """
+        curve = curve.lower() if curve else None
+        applied = 0
+        for event in events:
+            if event.event not in TRADE_EVENTS:
+                continue
+            if event.event == "Swap" and (event.address not in pools or str(event.args["user"]).lower() == curve):
+                continue
+            applied += self.apply(event, timestamp(event))
+        return applied
+
+    def window(self, resolution: str, count: int, now: Optional[float] = None) -> Optional[Dict]:
+        """One candle summarising the newest count candles at a resolution, or None before any trade"""
+        candles = self.series[resolution].last(count, now)
+        priced = ~np.isnan(candles["close"])
+        if not priced.any():
+            return None
+        opened = candles["open"][priced][0]
+        close = candles["close"][priced][-1]
+        return {
+            "start": int(candles["start"][0]),
+            "open": float(opened),
+            "high": float(np.nanmax(candles["high"])),
+            "low": float(np.nanmin(candles["low"])),
+            "close": float(close),
+            "change": float(close / opened - 1) if opened else 0.0,
+            "volume": float(candles["volume"].sum()),
+            "tokens": float(candles["tokens"].sum()),
+            "buys": int(candles["buys"].sum()),
+            "sells": int(candles["sells"].sum()),
+            "net_flow": float(candles["net_flow"].sum()),
+        }
+
+    def records(self, resolution: str, count: Optional[int] = None) -> np.ndarray:
+        """The kept candles of one resolution as a NumPy record array, oldest first"""
+        candles = self.series[resolution].last(count)
+        records = np.zeros(len(candles["start"]), dtype=list(COLUMNS.items()))
+        for name in COLUMNS:
+            records[name] = candles[name]
+        return records
+
+    def export_csv(self, path: str, resolution: str, count: Optional[int] = None):
+        """Write one resolution as CSV with ISO 8601 UTC start times"""
+        records = self.records(resolution, count)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            for record in records.tolist():
+                start = datetime.fromtimestamp(record[0], timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+                writer.writerow([start, *("" if value != value else repr(value) for value in record[1:])])
+
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        """Copies of every ring, safe to write from another thread"""
+        arrays = {}
+        meta = [SNAPSHOT_VERSION, *(self.position or (-1, -1)), self.trades]
+        for name, series in self.series.items():
+            for column, values in series.columns.items():
+                arrays[f"{name}.{column}"] = values.copy()
+            meta.extend((series.seconds, series.size, -1 if series.current is None else series.current, series.filled))
+        arrays["meta"] = np.array(meta, dtype=np.int64)
+        arrays["last"] = np.array([self.last_timestamp, np.nan if self.last_price is None else self.last_price])
+        return arrays
+
+    @staticmethod
+    def write(path: str, arrays: Dict[str, np.ndarray]):
+        """Atomically write a snapshot()"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def save(self, path: str):
+        self.write(path, self.snapshot())
+
+    @classmethod
+    def load(cls, path: str, resolutions: Mapping[str, Tuple[int, int]] = RESOLUTIONS) -> "CandleBuilder":
+        """Restore a snapshot taken with the same resolutions"""
+        builder = cls(resolutions)
+        with np.load(path) as data:
+            meta = data["meta"].tolist()
+            if meta[0] != SNAPSHOT_VERSION:
+                raise ValueError(f"{path} is candle snapshot version {meta[0]}, expected {SNAPSHOT_VERSION}")
+            block, log_index, builder.trades = meta[1:4]
+            for index, (name, series) in enumerate(builder.series.items()):
+                seconds, size, current, filled = meta[4 + 4 * index:8 + 4 * index]
+                if (seconds, size) != (series.seconds, series.size):
+                    raise ValueError(f"{path} keeps {name} candles as {size} x {seconds}s, expected {series.size} x {series.seconds}s")
+                for column in COLUMNS:
+                    series.columns[column][:] = data[f"{name}.{column}"]
+                series.current = current if current >= 0 else None
+                series.filled = filled
+            last_timestamp, last_price = data["last"].tolist()
+        builder.position = (block, log_index) if block >= 0 else None
+        builder.last_timestamp = last_timestamp
+        builder.last_price = None if last_price != last_price else last_price
+        return builder
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show or export candles from a candle snapshot")
+    parser.add_argument("snapshot")
+    parser.add_argument("--resolution", default="1h", choices=RESOLUTIONS)
+    parser.add_argument("--last", type=int, help="newest candles only (default: all kept)")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--csv", help="write the candles to this CSV file")
+    output.add_argument("--npy", help="write the candles to this NumPy record file")
+    args = parser.parse_args()
+
+    builder = CandleBuilder.load(args.snapshot)
+    if args.csv:
+        builder.export_csv(args.csv, args.resolution, args.last)
+        print(f"Wrote {len(builder.records(args.resolution, args.last)):,} {args.resolution} candles to {args.csv}")
+        return
+    if args.npy:
+        records = builder.records(args.resolution, args.last)
+        np.save(args.npy, records)
+        print(f"Wrote {len(records):,} {args.resolution} candles to {args.npy} ({records.itemsize} bytes each)")
+        return
+
+    print(f"{builder.trades:,} trades through block {builder.position[0] if builder.position else '-'}")
+    for record in builder.records(args.resolution, args.last if args.last else 24).tolist():
+        start, opened, high, low, close, volume, tokens, buys, sells, net_flow = record
+        when = datetime.fromtimestamp(start, timezone.utc).strftime("%Y-%m-%d %H:%M")
+        print(f"{when}  O {opened:.10f} H {high:.10f} L {low:.10f} C {close:.10f}  " +
+              f"vol {volume:,.4f} S / {tokens:,.0f} 100X  {buys} buys {sells} sells  net {net_flow:+,.4f} S")
+
+
+if __name__ == "__main__":
+    main()
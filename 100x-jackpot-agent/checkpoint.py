@@ -0,0 +1,42 @@
+"""
+Durable block cursor for the 100x Jackpot DeFAI Agent
+
+Persists the position of the last processed log so the agent can resume
+ingestion after a restart instead of starting again from the chain head.
+"""
+
+import json
+import logging
+import os
+from typing import Optional, Tuple
+
+logger = logging.getLogger("100xJackpotAgent")
+
+
+class Checkpoint:
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Optional[Tuple[int, Optional[int]]]:
+        """Return the saved (block, logIndex), or None if there is no checkpoint
+
+        A logIndex of None means the whole block has been processed.
+        """
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            return int(data["block"]), data.get("log_index")
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+
+    def save(self, block: int, log_index: Optional[int]):
+        """Atomically write the cursor to disk"""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"block": block, "log_index": log_index}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
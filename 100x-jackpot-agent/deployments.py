@@ -0,0 +1,148 @@
+"""
+Deployment configuration for the 100x Jackpot DeFAI Agent
+
+A Deployment is one JackpotGame / Token100x / BondingCurve triple plus
+everything that must stay separate per game: the agent key used for
+emitGameUpdate, Twitter credentials and tier, the durable log cursor and the
+event store. The single-game agent builds one from its environment variables;
+multi_agent.py loads a list of them from a JSON file and spreads them over
+worker processes with a consistent-hash ring, so adding or removing a worker
+only moves the deployments that hashed to it.
+
+Deployments file format (secrets stay in the environment, under env_prefix):
+
+    [
+        {"name": "main", "jackpot_address": "0x...", "token_address": "0x...",
+         "bonding_curve_address": "0x...", "liquidity_pool_factory_address": "0x...",
+         "env_prefix": "MAIN_"}
+    ]
+
+With env_prefix "MAIN_", the deployment reads MAIN_AGENT_PRIVATE_KEY,
+MAIN_TWITTER_API_KEY, MAIN_TWITTER_API_SECRET, MAIN_TWITTER_ACCESS_TOKEN,
+MAIN_TWITTER_ACCESS_SECRET and MAIN_TWITTER_TIER.
+"""
+
+import bisect
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+REQUIRED_FIELDS = ("name", "jackpot_address", "token_address", "bonding_curve_address")
+
+
+class Deployment:
+    __slots__ = (
+        "name", "jackpot_address", "token_address", "bonding_curve_address", "liquidity_pool_factory_address",
+        "private_key", "twitter_credentials", "twitter_tier", "checkpoint_file", "event_store_file",
+        "player_index_file", "candles_file",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        jackpot_address: str,
+        token_address: str,
+        bonding_curve_address: str,
+        liquidity_pool_factory_address: Optional[str] = None,
+        private_key: Optional[str] = None,
+        twitter_credentials: Optional[Tuple[str, str, str, str]] = None,
+        twitter_tier: str = "free",
+        checkpoint_file: Optional[str] = None,
+        event_store_file: Optional[str] = None,
+        player_index_file: Optional[str] = None,
+        candles_file: Optional[str] = None
+    ):
+        self.name = name
+        self.jackpot_address = jackpot_address
+        self.token_address = token_address
+        self.bonding_curve_address = bonding_curve_address
+        self.liquidity_pool_factory_address = liquidity_pool_factory_address
+        self.private_key = private_key
+
+        # (api key, api secret, access token, access secret); None disables posting
+        self.twitter_credentials = twitter_credentials
+        self.twitter_tier = twitter_tier
+
+        # Per-deployment state files; an empty event store, player index or candles file disables it
+        self.checkpoint_file = checkpoint_file if checkpoint_file is not None else f"agent_checkpoint.{name}.json"
+        self.event_store_file = event_store_file if event_store_file is not None else f"agent_events.{name}.db"
+        self.player_index_file = player_index_file if player_index_file is not None else f"agent_players.{name}.npz"
+        self.candles_file = candles_file if candles_file is not None else f"agent_candles.{name}.npz"
+
+    @classmethod
+    def from_config(cls, config: Dict, state_dir: str = ".") -> "Deployment":
+        """Build a deployment from a deployments-file entry and its prefixed environment variables"""
+        missing = [field for field in REQUIRED_FIELDS if not config.get(field)]
+        if missing:
+            raise ValueError(f"Deployment {config.get('name', '?')} is missing {', '.join(missing)}")
+
+        name = config["name"]
+        prefix = config.get("env_prefix", "")
+        credentials = tuple(os.getenv(f"{prefix}{key}") for key in (
+            "TWITTER_API_KEY", "TWITTER_API_SECRET", "TWITTER_ACCESS_TOKEN", "TWITTER_ACCESS_SECRET"
+        ))
+        return cls(
+            name,
+            config["jackpot_address"],
+            config["token_address"],
+            config["bonding_curve_address"],
+            liquidity_pool_factory_address=config.get("liquidity_pool_factory_address"),
+            private_key=os.getenv(f"{prefix}AGENT_PRIVATE_KEY") if prefix else None,
+            twitter_credentials=credentials if prefix and all(credentials) else None,
+            twitter_tier=os.getenv(f"{prefix}TWITTER_TIER", "free") if prefix else "free",
+            checkpoint_file=config.get("checkpoint_file", os.path.join(state_dir, f"agent_checkpoint.{name}.json")),
+            event_store_file=config.get("event_store_file", os.path.join(state_dir, f"agent_events.{name}.db")),
+            player_index_file=config.get("player_index_file", os.path.join(state_dir, f"agent_players.{name}.npz")),
+            candles_file=config.get("candles_file", os.path.join(state_dir, f"agent_candles.{name}.npz")),
+        )
+
+    def __repr__(self) -> str:
+        return f"Deployment({self.name}: jackpot {self.jackpot_address})"
+
+
+def load_deployments(path: str, state_dir: str = ".") -> List[Deployment]:
+    """Read a deployments file"""
+    with open(path, "r") as f:
+        configs = json.load(f)
+
+    deployments = [Deployment.from_config(config, state_dir) for config in configs]
+    names = [deployment.name for deployment in deployments]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate deployment names: {', '.join(duplicates)}")
+
+    # A shared agent key would have two pipelines racing for the same nonces
+    keys = [deployment.private_key for deployment in deployments if deployment.private_key]
+    if len(keys) != len(set(keys)):
+        raise ValueError("Deployments must not share an agent private key")
+    return deployments
+
+
+class HashRing:
+    """Consistent hashing of deployment names onto worker shards"""
+
+    def __init__(self, shards: Sequence[int], replicas: int = 160):
+        self.points: List[int] = []
+        self.owners: List[int] = []
+        for point, shard in sorted(
+            (self.hash(f"{shard}:{replica}"), shard) for shard in shards for replica in range(replicas)
+        ):
+            self.points.append(point)
+            self.owners.append(shard)
+
+    @staticmethod
+    def hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+    def shard_for(self, key: str) -> int:
+        """The shard owning the first ring point at or after the key's hash"""
+        index = bisect.bisect(self.points, self.hash(key)) % len(self.points)
+        return self.owners[index]
+
+    def assign(self, deployments: List[Deployment]) -> Dict[int, List[Deployment]]:
+        """Deployments grouped by shard"""
+        shards: Dict[int, List[Deployment]] = {shard: [] for shard in dict.fromkeys(self.owners)}
+        for deployment in deployments:
+            shards[self.shard_for(deployment.name)].append(deployment)
+        return shards
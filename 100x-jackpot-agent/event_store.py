@@ -0,0 +1,196 @@
+"""
+Persistent event store for the 100x Jackpot DeFAI Agent
+
+Every decoded JackpotGame and BondingCurve event is written to a local
+SQLite database in WAL mode, one transaction per poll; the historical
+indexer (indexer.py) backfills it, including liquidity pool events. Rows are keyed by
+(block, logIndex), so re-ingesting a range is harmless, and indexed by event
+type and by player address (player / winner / buyer / seller / user). The query
+methods cover what summaries and announcements need: counts, latest events,
+per-player history, hint purchase histograms and leaderboards. None of them
+touch the RPC.
+"""
+
+import json
+import logging
+import sqlite3
+from collections import namedtuple
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger("100xJackpotAgent")
+
+# Argument names that identify the player behind an event
+PLAYER_FIELDS = ("player", "winner", "buyer", "seller", "user")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL,
+    address TEXT NOT NULL,
+    event TEXT NOT NULL,
+    player TEXT,
+    args TEXT NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_events_event ON events (event, block_number, log_index);
+CREATE INDEX IF NOT EXISTS idx_events_player ON events (player, event, block_number) WHERE player IS NOT NULL;
+"""
+
+StoredEvent = namedtuple("StoredEvent", ["block_number", "log_index", "tx_hash", "address", "event", "player", "args"])
+
+
+def encode_value(value):
+    """JSON encoder fallback for bytes arguments"""
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    raise TypeError(f"Cannot store {type(value).__name__} in the event store")
+
+
+class EventStore:
+    def __init__(self, path: str):
+        self.path = path
+        self.db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("PRAGMA temp_store=MEMORY")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    @staticmethod
+    def row(event) -> Tuple:
+        """Flatten a decoded event into a table row"""
+        args = dict(event.args)
+        player = next((args[field] for field in PLAYER_FIELDS if field in args), None)
+        return (
+            event.blockNumber,
+            event.logIndex,
+            event.transactionHash,
+            event.address.lower(),
+            event.event,
+            player.lower() if player else None,
+            json.dumps(args, default=encode_value, separators=(",", ":")),
+        )
+
+    def write(self, events: Iterable) -> int:
+        """Insert a batch of decoded events in one transaction; duplicates are ignored"""
+        return self.write_rows([self.row(event) for event in events])
+
+    def write_rows(self, rows: List[Tuple]) -> int:
+        """Insert rows already flattened by row(), e.g. in a worker process"""
+        if not rows:
+            return 0
+        with self.db:
+            self.db.execute("BEGIN")
+            cursor = self.db.executemany(
+                "INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return cursor.rowcount
+
+    @staticmethod
+    def to_event(row) -> StoredEvent:
+        return StoredEvent(*row[:6], json.loads(row[6]))
+
+    @staticmethod
+    def where(
+        event: Union[str, Sequence[str], None] = None,
+        player: Optional[str] = None,
+        from_block: int = 0,
+        to_block: Optional[int] = None,
+        through: Optional[Tuple[int, int]] = None,
+        after: Optional[Tuple[int, int]] = None
+    ) -> Tuple[str, List]:
+        """WHERE clause and parameters for the common filters
+
+        through bounds the result at a (block, logIndex) position, inclusive;
+        after starts it past one, exclusive. event may be a list of types.
+        """
+        clauses, params = ["block_number >= ?"], [from_block]
+        if to_block is not None:
+            clauses.append("block_number <= ?")
+            params.append(to_block)
+        if through is not None:
+            clauses.append("(block_number, log_index) <= (?, ?)")
+            params.extend(through)
+        if after is not None:
+            clauses.append("(block_number, log_index) > (?, ?)")
+            params.extend(after)
+        if isinstance(event, str):
+            clauses.append("event = ?")
+            params.append(event)
+        elif event is not None:
+            clauses.append(f"event IN ({', '.join('?' * len(event))})")
+            params.extend(event)
+        if player is not None:
+            clauses.append("player = ?")
+            params.append(player.lower())
+        return " AND ".join(clauses), params
+
+    def count(self, event: Optional[str] = None, player: Optional[str] = None, **filters) -> int:
+        """Number of stored events, optionally for one type and/or player"""
+        clause, params = self.where(event, player, **filters)
+        return self.db.execute(f"SELECT COUNT(*) FROM events WHERE {clause}", params).fetchone()[0]
+
+    def counts(self) -> Dict[str, int]:
+        """Stored events per type"""
+        return dict(self.db.execute("SELECT event, COUNT(*) FROM events GROUP BY event"))
+
+    def events(
+        self,
+        event: Optional[str] = None,
+        player: Optional[str] = None,
+        limit: int = 100,
+        newest_first: bool = True,
+        **filters
+    ) -> List[StoredEvent]:
+        """Stored events matching the filters, in chain order or newest first"""
+        clause, params = self.where(event, player, **filters)
+        order = "DESC" if newest_first else "ASC"
+        rows = self.db.execute(
+            f"SELECT * FROM events WHERE {clause} ORDER BY block_number {order}, log_index {order} LIMIT ?",
+            params + [limit]
+        )
+        return [self.to_event(row) for row in rows]
+
+    def scan(self, event: Union[str, Sequence[str], None] = None, **filters) -> Iterator[StoredEvent]:
+        """Every stored event matching the filters in chain order, read lazily"""
+        clause, params = self.where(event, **filters)
+        rows = self.db.execute(f"SELECT * FROM events WHERE {clause} ORDER BY block_number, log_index", params)
+        return (self.to_event(row) for row in rows)
+
+    def latest(self, event: str, **filters) -> Optional[StoredEvent]:
+        """Most recent event of a type"""
+        found = self.events(event=event, limit=1, **filters)
+        return found[0] if found else None
+
+    def last_block(self) -> Optional[int]:
+        """Highest block with a stored event"""
+        return self.db.execute("SELECT MAX(block_number) FROM events").fetchone()[0]
+
+    def hint_purchases(self, player: Optional[str] = None, **filters) -> Dict[int, int]:
+        """Purchases per hint index, for everyone or one player"""
+        clause, params = self.where("HintRequested", player, **filters)
+        return dict(self.db.execute(
+            f"SELECT json_extract(args, '$.hintIndex') AS hint, COUNT(*) FROM events WHERE {clause} GROUP BY hint",
+            params
+        ))
+
+    def hint_grants(self, **filters) -> List[Tuple[str, int]]:
+        """Every (player, hintIndex) purchase"""
+        clause, params = self.where("HintRequested", **filters)
+        return self.db.execute(
+            f"SELECT DISTINCT player, json_extract(args, '$.hintIndex') FROM events WHERE {clause}",
+            params
+        ).fetchall()
+
+    def leaderboard(self, event: str = "GuessRevealed", limit: int = 10, **filters) -> List[Tuple[str, int]]:
+        """Players with the most events of a type"""
+        clause, params = self.where(event, **filters)
+        return self.db.execute(
+            f"SELECT player, COUNT(*) AS n FROM events WHERE {clause} AND player IS NOT NULL "
+            f"GROUP BY player ORDER BY n DESC LIMIT ?",
+            params + [limit]
+        ).fetchall()
@@ -0,0 +1,122 @@
+"""
+Game statistics for the 100x Jackpot DeFAI Agent
+
+Everything here is sized up front so memory stays flat however long the agent
+runs: recent activity lives in a fixed-capacity ring buffer of slotted
+records, hint purchases are a per-index histogram rather than a list of every
+purchase, and unique players are estimated with a HyperLogLog sketch.
+"""
+
+import hashlib
+import math
+import time
+from collections import Counter
+from typing import Iterator, List, Optional
+
+
+class Activity:
+    __slots__ = ("type", "message", "timestamp")
+
+    def __init__(self, activity_type: str, message: str, timestamp: float):
+        self.type = activity_type
+        self.message = message
+        self.timestamp = timestamp
+
+
+class ActivityLog:
+    """Fixed-capacity ring buffer; the oldest activity is overwritten when full"""
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        self.slots: List[Optional[Activity]] = [None] * capacity
+        self.next = 0
+        self.size = 0
+
+    def append(self, activity: Activity):
+        """Store an activity in O(1)"""
+        self.slots[self.next] = activity
+        self.next = (self.next + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[Activity]:
+        """Iterate oldest to newest"""
+        start = (self.next - self.size) % self.capacity
+        for offset in range(self.size):
+            yield self.slots[(start + offset) % self.capacity]
+
+    def recent(self, count: int) -> List[Activity]:
+        """The newest activities, newest first"""
+        count = min(count, self.size)
+        return [self.slots[(self.next - 1 - offset) % self.capacity] for offset in range(count)]
+
+
+class UniqueCounter:
+    """HyperLogLog cardinality estimate in 2**precision bytes (about 1.6% error at the default)"""
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+        count = len(self.registers)
+        self.alpha = 0.7213 / (1 + 1.079 / count)
+
+    def add(self, item: str):
+        """Record one (possibly repeated) item, e.g. a player address"""
+        value = int.from_bytes(hashlib.blake2b(item.lower().encode(), digest_size=8).digest(), "big")
+        index = value >> (64 - self.precision)
+        remainder = value & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def __len__(self) -> int:
+        return self.estimate()
+
+    def estimate(self) -> int:
+        """Approximate number of distinct items added"""
+        count = len(self.registers)
+        estimate = self.alpha * count * count / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * count and zeros:
+            # Small-range correction (linear counting)
+            estimate = count * math.log(count / zeros)
+        return int(round(estimate))
+
+
+class GameStats:
+    def __init__(self, activity_capacity: int = 100):
+        self.total_guesses = 0
+        self.unique_players = 0
+        self.total_winners = 0
+        self.jackpot_amount = 0
+        self.last_update = time.time()
+        self.last_win_time = 0
+        self.last_winner = None
+        self.token_price = 0
+        self.liquidity = 0
+        self.hints_purchased: Counter = Counter()  # hint index -> purchases
+        self.total_hints_purchased = 0
+        self.last_hint_time = 0
+        self.hint_count = 0
+        self.players_seen = UniqueCounter()  # Addresses seen in any event since startup
+        self.recent_activities = ActivityLog(activity_capacity)  # Recent activities for periodic summaries
+
+    def add_activity(self, activity_type: str, message: str, timestamp: float = None):
+        """Add an activity to the recent activities log"""
+        if timestamp is None:
+            timestamp = time.time()
+
+        self.recent_activities.append(Activity(activity_type, message, timestamp))
+
+    def record_hint_purchase(self, hint_index: int):
+        """Count a purchase of one hint"""
+        self.hints_purchased[hint_index] += 1
+        self.total_hints_purchased += 1
+        self.last_hint_time = time.time()
+
+    def record_player(self, player: str):
+        """Note a player address for the unique-player estimate"""
+        self.players_seen.add(player)
@@ -0,0 +1,236 @@
+"""
+Hint access service for the 100x Jackpot DeFAI Agent
+
+Serves hint content only to players who bought the hint on-chain. Access is
+answered from memory: HintAccessIndex holds every (player, hintIndex) grant,
+seeded from the event store at startup and extended by the HintRequested
+events the agent already ingests. Grants are never revoked by the contract,
+so an indexed grant is final.
+
+A player who is not in the index yet (the purchase is newer than the last
+poll) falls back to one hasAccessToHint() read at a recent head. Lookups for
+the same key share one RPC, run under a concurrency limit, and negative
+answers are kept in a short-lived LRU so a burst of retries from a player
+without access costs one read, not one per request.
+
+HintServer exposes the index over HTTP with the same contract as
+api/getHint.js: GET /hint?hintIndex=<n>&userAddress=<0x...>. Like the
+original endpoint, userAddress is taken at face value; the check stops
+anyone from reading hints that address has not paid for, not from claiming
+someone else's address.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from aiohttp import web
+from web3 import Web3
+
+logger = logging.getLogger("100xJackpotAgent")
+
+# CORS headers sent by api/getHint.js
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+    "Access-Control-Allow-Methods": "GET, OPTIONS",
+}
+
+
+def load_hints(path: str) -> List[str]:
+    """Read the hint texts, a JSON list indexed like the contract's hints"""
+    with open(path, "r") as f:
+        hints = json.load(f)
+    if not isinstance(hints, list) or not all(isinstance(hint, str) for hint in hints):
+        raise ValueError(f"{path} must contain a JSON list of strings")
+    return hints
+
+
+class HintAccessIndex:
+    def __init__(
+        self,
+        contract,
+        cache_size: int = 100_000,
+        negative_ttl: float = 2.0,
+        head_ttl: float = 1.0,
+        max_lookups: int = 16
+    ):
+        self.contract = contract
+
+        # Set once the agent's ReadBatcher exists
+        self.reader = None
+
+        # Lowercase player address -> hint indexes bought
+        self.granted: Dict[str, Set[int]] = {}
+
+        # LRU of on-chain lookups that came back negative, with their expiry
+        self.denied: "OrderedDict[Tuple[str, int], float]" = OrderedDict()
+        self.cache_size = cache_size
+        self.negative_ttl = negative_ttl
+
+        # Misses read at a shared head, refreshed at most every head_ttl seconds
+        self.head_ttl = head_ttl
+        self.head_task: Optional[asyncio.Future] = None
+        self.head_fetched = 0.0
+
+        # One RPC per key in flight, and a cap on concurrent lookups
+        self.inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+        self.lookup_slots = asyncio.Semaphore(max_lookups)
+
+        # Called when a lookup finds a purchase not yet seen in the logs
+        self.on_purchase: Optional[Callable[[], None]] = None
+
+        self.index_hits = 0
+        self.cache_hits = 0
+        self.lookups = 0
+
+    def __len__(self) -> int:
+        return sum(len(indexes) for indexes in self.granted.values())
+
+    def grant(self, player: str, hint_index: int):
+        """Record a purchase; it overrides any cached negative lookup"""
+        key = (player.lower(), int(hint_index))
+        self.granted.setdefault(key[0], set()).add(key[1])
+        self.denied.pop(key, None)
+
+    def load(self, grants: Iterable[Tuple[str, int]]) -> int:
+        """Bulk-load (player, hintIndex) pairs, e.g. from the event store"""
+        before = len(self)
+        for player, hint_index in grants:
+            self.grant(player, hint_index)
+        return len(self) - before
+
+    def cached(self, player: str, hint_index: int) -> Optional[bool]:
+        """Answer from memory, or None when only the chain can tell"""
+        player = player.lower()
+        if hint_index in self.granted.get(player, ()):
+            self.index_hits += 1
+            return True
+
+        key = (player, hint_index)
+        expires = self.denied.get(key)
+        if expires is not None:
+            if expires > time.monotonic():
+                self.denied.move_to_end(key)
+                self.cache_hits += 1
+                return False
+            del self.denied[key]
+        return None
+
+    async def has_access(self, player: str, hint_index: int) -> bool:
+        """Whether a player bought a hint; RPC only for players not yet indexed"""
+        known = self.cached(player, hint_index)
+        if known is not None:
+            return known
+
+        key = (player.lower(), hint_index)
+        future = self.inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self.lookup(key))
+            self.inflight[key] = future
+            future.add_done_callback(lambda _: self.inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def lookup(self, key: Tuple[str, int]) -> bool:
+        """Read hasAccessToHint() at a recent head and cache the answer"""
+        player, hint_index = key
+        async with self.lookup_slots:
+            block = await self.latest_block()
+            self.lookups += 1
+            granted = await self.reader.call(
+                self.contract.functions.hasAccessToHint(Web3.to_checksum_address(player), hint_index),
+                block=block
+            )
+
+        if granted:
+            self.grant(player, hint_index)
+            if self.on_purchase is not None:
+                self.on_purchase()
+        else:
+            self.denied[key] = time.monotonic() + self.negative_ttl
+            self.denied.move_to_end(key)
+            while len(self.denied) > self.cache_size:
+                self.denied.popitem(last=False)
+        return granted
+
+    async def latest_block(self) -> int:
+        """The chain head, fetched at most once per head_ttl across all lookups"""
+        now = time.monotonic()
+        if self.head_task is None or now - self.head_fetched > self.head_ttl:
+            self.head_fetched = now
+            self.head_task = asyncio.ensure_future(self.reader.block_number())
+        try:
+            return max(await asyncio.shield(self.head_task), self.reader.head or 0)
+        except Exception:
+            self.head_task = None
+            raise
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "grants": len(self),
+            "players": len(self.granted),
+            "index_hits": self.index_hits,
+            "cache_hits": self.cache_hits,
+            "lookups": self.lookups,
+            "denied_cached": len(self.denied),
+        }
+
+
+class HintServer:
+    def __init__(self, index: HintAccessIndex, hints: List[str], host: str = "127.0.0.1", port: int = 9109, metrics=None):
+        self.index = index
+        self.hints = hints
+        self.host = host
+        self.port = port
+        self.metrics = metrics
+        self.runner: Optional[web.AppRunner] = None
+
+    def respond(self, status: int, body: Dict, result: str) -> web.Response:
+        if self.metrics is not None:
+            self.metrics.hint_requests.inc(result=result)
+        return web.json_response(body, status=status, headers=CORS_HEADERS)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """GET /hint?hintIndex=<n>&userAddress=<0x...>"""
+        user_address = request.query.get("userAddress", "")
+        try:
+            hint_index = int(request.query.get("hintIndex", ""))
+        except ValueError:
+            return self.respond(400, {"error": "hintIndex must be an integer"}, "bad_request")
+        if not Web3.is_address(user_address):
+            return self.respond(400, {"error": "userAddress must be an address"}, "bad_request")
+
+        # Unknown hints are answered before any access check
+        if not 0 <= hint_index < len(self.hints):
+            return self.respond(404, {"error": "Hint not found"}, "not_found")
+
+        try:
+            granted = await self.index.has_access(user_address, hint_index)
+        except Exception as e:
+            logger.warning(f"Hint access lookup failed for {user_address} #{hint_index}: {e}")
+            return self.respond(503, {"error": "Could not verify hint access, try again"}, "error")
+
+        if not granted:
+            return self.respond(403, {"error": "Hint not purchased"}, "denied")
+        return self.respond(200, {"hintContent": self.hints[hint_index]}, "granted")
+
+    async def handle_options(self, request: web.Request) -> web.Response:
+        return web.Response(status=200, headers=CORS_HEADERS)
+
+    async def start(self):
+        """Serve /hint in the background"""
+        app = web.Application()
+        app.router.add_get("/hint", self.handle)
+        app.router.add_route("OPTIONS", "/hint", self.handle_options)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        logger.info(f"Serving {len(self.hints)} hint(s) on http://{self.host}:{self.port}/hint")
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
@@ -0,0 +1,459 @@
+"""
+Historical event indexer for the 100x Jackpot DeFAI Agent
+
+Backfills the event store with every JackpotGame, BondingCurve, liquidity
+pool factory and liquidity pool event from the deployment block to the
+head. The block span is split into fixed-size ranges that a set of workers
+per RPC endpoint fetch with eth_getLogs, each endpoint limited to its own
+request rate. Raw logs are decoded in a process pool, and results are
+written to the store strictly in block order. The last written block is
+checkpointed, so an interrupted run resumes where it stopped, and rows are
+keyed by (block, logIndex), so overlapping runs never duplicate anything.
+
+Usage: python indexer.py [--from-block N] [--to-block N] [--chunk 2000]
+                         [--workers 4] [--rate 10] [--processes 2]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+from dotenv import load_dotenv
+from eth_abi import decode, encode
+from eth_utils import function_signature_to_4byte_selector, to_checksum_address
+
+from abi_artifact import read_artifact
+from checkpoint import Checkpoint
+from event_store import EventStore
+from log_decoder import LogDecoder
+from log_ingest import is_range_error
+from social_poster import TokenBucket
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger("100xJackpotAgent")
+
+# Contract addresses (same variables as the agent)
+JACKPOT_ADDRESS = os.getenv("JACKPOT_ADDRESS", "0x1bCb1B4474b636874E1C35B0CC32ADb408bb43e0")
+TOKEN_ADDRESS = os.getenv("TOKEN_ADDRESS", "0x0755fb9917419a08c90a0Fd245F119202844ec3D")
+BONDING_CURVE_ADDRESS = os.getenv("BONDING_CURVE_ADDRESS", "0x2ECA93adD34C533008b947B2Ed02e4974122D525")
+LIQUIDITY_POOL_FACTORY_ADDRESS = os.getenv("LIQUIDITY_POOL_FACTORY_ADDRESS")
+
+# Output store and the indexer's own resume cursor
+EVENT_STORE_FILE = os.getenv("EVENT_STORE_FILE", "agent_events.db")
+INDEXER_CHECKPOINT_FILE = os.getenv("INDEXER_CHECKPOINT_FILE", "indexer_checkpoint.json")
+
+# A range is given up on (and the run stopped, resumable) after this many failed fetches
+MAX_ATTEMPTS = 8
+
+
+class RateLimited(Exception):
+    pass
+
+
+class IndexerEndpoint:
+    """One RPC URL with its own request budget"""
+
+    def __init__(self, url: str, session: aiohttp.ClientSession, rate: float, burst: float):
+        self.url = url
+        self.session = session
+        self.bucket = TokenBucket(burst, rate)
+        self.ids = itertools.count(1)
+        self.requests = 0
+        self.errors = 0
+        self.failures = 0  # Consecutive failures, for backoff
+        self.backoff_until = 0.0
+
+    def failed(self) -> float:
+        """Back off exponentially after consecutive failures; returns the delay"""
+        self.errors += 1
+        self.failures += 1
+        delay = min(30.0, 0.5 * 2 ** self.failures)
+        self.backoff_until = max(self.backoff_until, time.monotonic() + delay)
+        return delay
+
+    def succeeded(self):
+        self.failures = 0
+
+    async def post(self, method: str, params: List) -> bytes:
+        """One JSON-RPC request, after waiting for the endpoint's rate limit and backoff
+
+        Returns the raw response body, so large eth_getLogs responses can be
+        parsed in the decode pool instead of on the event loop.
+        """
+        while time.monotonic() < self.backoff_until:
+            await asyncio.sleep(self.backoff_until - time.monotonic())
+        await self.bucket.acquire()
+        self.requests += 1
+        payload = {"jsonrpc": "2.0", "id": next(self.ids), "method": method, "params": params}
+        async with self.session.post(self.url, json=payload) as response:
+            if response.status == 429:
+                self.bucket.drain()
+                raise RateLimited(f"{self.url} returned 429")
+            response.raise_for_status()
+            return await response.read()
+
+    async def call(self, method: str, params: List):
+        """One JSON-RPC request; returns the parsed result"""
+        return parse_result(await self.post(method, params))
+
+
+def parse_result(body: bytes):
+    """The result of a JSON-RPC response body, or a ValueError carrying its error"""
+    reply = json.loads(body)
+    if "error" in reply:
+        raise ValueError(reply["error"])
+    return reply["result"]
+
+
+# Per-process decoder, built once by the decode pool initializer
+decoder: Optional[LogDecoder] = None
+
+
+def init_decoder(contracts: List[Tuple[Optional[str], List[Dict]]]):
+    global decoder
+    decoder = LogDecoder()
+    for address, abi in contracts:
+        decoder.register_contract(address, abi)
+
+
+def decode_rows(logs: List[Dict]) -> List[Tuple]:
+    """Decode raw logs into event store rows"""
+    rows = []
+    for log in logs:
+        event = decoder.decode(log)
+        if event is not None:
+            rows.append(EventStore.row(event))
+    return rows
+
+
+def decode_response(body: bytes) -> Tuple[int, List[Tuple]]:
+    """Parse and decode an eth_getLogs response; returns (log count, rows)"""
+    logs = parse_result(body)
+    return len(logs), decode_rows(logs)
+
+
+class HistoricalIndexer:
+    def __init__(
+        self,
+        endpoints: List[IndexerEndpoint],
+        store: EventStore,
+        checkpoint: Checkpoint,
+        contracts: List[Tuple[str, List[Dict]]],
+        from_block: int,
+        to_block: int,
+        chunk: int = 2000,
+        workers: int = 4,
+        processes: int = 2,
+        progress_interval: float = 2.0
+    ):
+        self.endpoints = endpoints
+        self.store = store
+        self.checkpoint = checkpoint
+        self.contracts = contracts
+        self.to_block = to_block
+        self.workers = workers
+        self.processes = processes
+        self.progress_interval = progress_interval
+
+        # One eth_getLogs filter covering every contract and event
+        init_decoder(contracts)
+        self.addresses = list({address.lower(): address for address, _ in contracts}.values())
+        self.topics = ["0x" + topic.hex() for topic in decoder.table]
+
+        # Resume after the last block written by an earlier run
+        saved = checkpoint.load()
+        if saved is not None and saved[0] >= from_block:
+            logger.info(f"Resuming from block {saved[0] + 1} (checkpoint {checkpoint.path})")
+            from_block = saved[0] + 1
+        self.from_block = from_block
+
+        # Work queue; ranges that fail are put back at the front, split if too large
+        self.pending = deque(
+            (start, min(start + chunk - 1, to_block)) for start in range(from_block, to_block + 1, chunk)
+        )
+        self.attempts: Dict[Tuple[int, int], int] = {}
+
+        # Fetched ranges waiting for everything before them, keyed by first block
+        self.done: Dict[int, Tuple[int, List[Tuple]]] = {}
+        self.max_buffered = max(16, 4 * workers * len(endpoints))
+        self.cursor = from_block - 1  # Last block handed to the writer
+        self.written = from_block - 1  # Last block committed to the store
+        self.last_save = 0.0
+
+        # Decoding runs in worker processes; store writes run in order on one thread
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.writer: Optional[ThreadPoolExecutor] = None
+        self.last_write: Optional[asyncio.Future] = None
+        self.queued_writes = 0
+        self.error: Optional[Exception] = None
+        self.logs = 0
+        self.rows = 0
+        self.started = time.monotonic()
+
+    async def fetch(self, endpoint: IndexerEndpoint, start: int, end: int) -> bytes:
+        return await endpoint.post("eth_getLogs", [{
+            "fromBlock": hex(start),
+            "toBlock": hex(end),
+            "address": self.addresses,
+            "topics": [self.topics],
+        }])
+
+    async def decode(self, body: bytes) -> Tuple[int, List[Tuple]]:
+        if self.executor is None:
+            return decode_response(body)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, decode_response, body)
+
+    async def worker(self, endpoint: IndexerEndpoint):
+        """Fetch and decode ranges until the queue is empty"""
+        while self.pending and self.error is None:
+            # Don't run too far ahead of a slow range that blocks the cursor, or of the writer
+            if len(self.done) + self.queued_writes >= self.max_buffered:
+                await asyncio.sleep(0.05)
+                continue
+
+            start, end = self.pending.popleft()
+            try:
+                # Provider errors in the response body surface while decoding
+                count, rows = await self.decode(await self.fetch(endpoint, start, end))
+            except Exception as e:
+                if is_range_error(e) and end > start:
+                    # Too many results for the provider: retry as two halves
+                    middle = (start + end) // 2
+                    self.pending.extendleft([(middle + 1, end), (start, middle)])
+                    continue
+
+                attempts = self.attempts[(start, end)] = self.attempts.get((start, end), 0) + 1
+                if attempts >= MAX_ATTEMPTS:
+                    self.error = e
+                    logger.error(f"Giving up on blocks {start}-{end} after {attempts} attempts: {e}")
+                    return
+                # Another endpoint (or this one, after backing off) picks it up again
+                self.pending.appendleft((start, end))
+                delay = endpoint.failed()
+                logger.warning(f"eth_getLogs {start}-{end} failed on {endpoint.url} ({e}); backing off {delay:.1f}s")
+                continue
+
+            endpoint.succeeded()
+            self.logs += count
+            self.done[start] = (end, rows)
+            self.flush()
+
+    def flush(self):
+        """Queue every range that is now contiguous with the cursor for writing, in block order"""
+        rows, cursor = [], self.cursor
+        while self.cursor + 1 in self.done:
+            end, range_rows = self.done.pop(self.cursor + 1)
+            rows.extend(range_rows)
+            self.cursor = end
+        if self.cursor == cursor:
+            return
+
+        rows.sort(key=lambda row: (row[0], row[1]))
+        self.queued_writes += 1
+        self.last_write = asyncio.get_running_loop().run_in_executor(self.writer, self.commit, rows, self.cursor)
+        self.last_write.add_done_callback(self.write_done)
+
+    def write_done(self, future: asyncio.Future):
+        self.queued_writes -= 1
+
+    def commit(self, rows: List[Tuple], cursor: int):
+        """Write one contiguous batch and move the checkpoint (writer thread)"""
+        if self.error is not None:
+            return  # Nothing after a failed write may be committed
+        try:
+            self.store.write_rows(rows)
+        except Exception as e:
+            self.error = e
+            logger.error(f"Event store write failed at block {cursor}: {e}")
+            return
+        self.rows += len(rows)
+        self.written = cursor
+
+        now = time.monotonic()
+        if now - self.last_save >= 1.0:
+            self.checkpoint.save(cursor, None)
+            self.last_save = now
+
+    async def report(self):
+        """Print progress and throughput until cancelled"""
+        total = max(1, self.to_block - self.from_block + 1)
+        last_time, last_cursor, last_logs = time.monotonic(), self.written, self.logs
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            now = time.monotonic()
+            elapsed = now - last_time
+            written = self.written
+            blocks_per_second = (written - last_cursor) / elapsed
+            logs_per_second = (self.logs - last_logs) / elapsed
+            last_time, last_cursor, last_logs = now, written, self.logs
+
+            done = written - self.from_block + 1
+            remaining = self.to_block - written
+            eta = time.strftime("%H:%M:%S", time.gmtime(remaining / blocks_per_second)) if blocks_per_second else "--:--:--"
+            line = (
+                f"Block {written:,}/{self.to_block:,} ({done / total:.1%}) | "
+                f"{blocks_per_second:,.0f} blocks/s | {logs_per_second:,.0f} logs/s | "
+                f"{self.rows:,} events | {len(self.done)} ranges buffered | ETA {eta}"
+            )
+            if sys.stderr.isatty():
+                sys.stderr.write(f"\r{line}\x1b[K")
+                sys.stderr.flush()
+            else:
+                logger.info(line)
+
+    async def run(self):
+        """Index [from_block, to_block]; resumable if interrupted"""
+        if self.from_block > self.to_block:
+            logger.info(f"Already indexed up to block {self.to_block}")
+            return
+
+        logger.info(
+            f"Indexing blocks {self.from_block}-{self.to_block} from {len(self.addresses)} contracts " +
+            f"with {self.workers} worker(s) on each of {len(self.endpoints)} endpoint(s)"
+        )
+        if self.processes > 0:
+            self.executor = ProcessPoolExecutor(self.processes, initializer=init_decoder, initargs=(self.contracts,))
+        self.writer = ThreadPoolExecutor(1)
+
+        reporter = asyncio.ensure_future(self.report())
+        try:
+            await asyncio.gather(*(
+                self.worker(endpoint) for endpoint in self.endpoints for _ in range(self.workers)
+            ))
+        finally:
+            reporter.cancel()
+            await asyncio.gather(reporter, return_exceptions=True)
+            if sys.stderr.isatty():
+                sys.stderr.write("\n")
+            if self.executor is not None:
+                self.executor.shutdown(cancel_futures=True)
+
+            # Let queued writes finish so the checkpoint covers everything written
+            self.flush()
+            if self.last_write is not None:
+                await asyncio.wait([self.last_write])
+            self.writer.shutdown()
+            if self.written >= self.from_block:
+                self.checkpoint.save(self.written, None)
+
+        if self.error is not None:
+            raise RuntimeError(f"Stopped at block {self.written}; run again to resume") from self.error
+
+        elapsed = time.monotonic() - self.started
+        blocks = self.to_block - self.from_block + 1
+        logger.info(
+            f"Indexed {blocks:,} blocks, {self.logs:,} logs ({self.rows:,} events) in {elapsed:.1f}s: " +
+            f"{blocks / elapsed:,.0f} blocks/s, {self.logs / elapsed:,.0f} logs/s"
+        )
+        for endpoint in self.endpoints:
+            logger.info(f"RPC {endpoint.url}: {endpoint.requests} requests, {endpoint.errors} errors")
+
+
+async def find_deploy_block(endpoint: IndexerEndpoint, address: str, head: int) -> int:
+    """First block with code at address (binary search; needs historical state)"""
+    low, high = 0, head
+    while low < high:
+        middle = (low + high) // 2
+        code = await endpoint.call("eth_getCode", [address, hex(middle)])
+        if code not in ("0x", "0x0", None):
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+async def find_pool(endpoint: IndexerEndpoint, factory: str, token: str) -> Optional[str]:
+    """The token's liquidity pool, from LiquidityPoolFactory.tokenToPool"""
+    data = function_signature_to_4byte_selector("tokenToPool(address)") + encode(["address"], [token])
+    result = await endpoint.call("eth_call", [{"to": factory, "data": "0x" + data.hex()}, "latest"])
+    pool = decode(["address"], bytes.fromhex(result[2:]))[0]
+    return None if int(pool, 16) == 0 else to_checksum_address(pool)
+
+
+async def main(args):
+    urls = [url.strip() for url in args.rpc_urls.split(",") if url.strip()]
+    connector = aiohttp.TCPConnector(limit=args.workers * len(urls) + 2, keepalive_timeout=60)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=60)) as session:
+        endpoints = [IndexerEndpoint(url, session, args.rate, max(1.0, args.rate)) for url in urls]
+        first = endpoints[0]
+
+        # Full ABIs, so the backfill keeps events the agent's compact artifact leaves out
+        abis = {name: read_artifact(name)[0] for name in (
+            "JackpotGame", "BondingCurve", "LiquidityPoolFactory", "SimpleLiquidityPool"
+        )}
+        contracts = [
+            (JACKPOT_ADDRESS, abis["JackpotGame"]),
+            (BONDING_CURVE_ADDRESS, abis["BondingCurve"]),
+        ]
+        if LIQUIDITY_POOL_FACTORY_ADDRESS:
+            contracts.append((LIQUIDITY_POOL_FACTORY_ADDRESS, abis["LiquidityPoolFactory"]))
+            pool = await find_pool(first, LIQUIDITY_POOL_FACTORY_ADDRESS, TOKEN_ADDRESS)
+            if pool:
+                logger.info(f"Liquidity pool for {TOKEN_ADDRESS}: {pool}")
+                contracts.append((pool, abis["SimpleLiquidityPool"]))
+            else:
+                logger.info("No liquidity pool created yet")
+
+        to_block = args.to_block if args.to_block is not None else int(await first.call("eth_blockNumber", []), 16)
+        from_block = args.from_block
+        if from_block is None:
+            logger.info("Looking up deployment blocks (use --from-block to skip)")
+            try:
+                from_block = min([await find_deploy_block(first, address, to_block) for address, _ in contracts])
+            except Exception as e:
+                raise SystemExit(f"Could not find the deployment block ({e}); pass --from-block")
+            logger.info(f"Earliest deployment at block {from_block}")
+
+        store = EventStore(args.store)
+        try:
+            indexer = HistoricalIndexer(
+                endpoints,
+                store,
+                Checkpoint(args.checkpoint),
+                contracts,
+                from_block,
+                to_block,
+                chunk=args.chunk,
+                workers=args.workers,
+                processes=args.processes
+            )
+            await indexer.run()
+            logger.info(f"Event store {store.path}: {store.count():,} events up to block {store.last_block()}")
+        finally:
+            store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill the event store from the contracts' deployment block")
+    parser.add_argument("--rpc-urls", default=os.getenv("RPC_URLS") or os.getenv("RPC_URL", "https://rpc.sonic.fantom.network"),
+                        help="comma-separated RPC endpoints (default: RPC_URLS or RPC_URL)")
+    parser.add_argument("--from-block", type=int, help="first block (default: earliest deployment, found via eth_getCode)")
+    parser.add_argument("--to-block", type=int, help="last block (default: current head)")
+    parser.add_argument("--chunk", type=int, default=2000, help="blocks per eth_getLogs request")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent requests per endpoint")
+    parser.add_argument("--rate", type=float, default=10.0, help="requests per second per endpoint")
+    parser.add_argument("--processes", type=int, default=2, help="decode processes (0 decodes in-process)")
+    parser.add_argument("--store", default=EVENT_STORE_FILE)
+    parser.add_argument("--checkpoint", default=INDEXER_CHECKPOINT_FILE)
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        logger.info("Interrupted; run again to resume from the checkpoint")
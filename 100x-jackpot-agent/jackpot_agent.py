@@ -6,17 +6,40 @@ and posts updates to Twitter in real-time.
 """
 
 import asyncio
-import json
 import logging
 import os
 import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
-import tweepy
-from web3 import Web3
+# Cold-start reference point for the startup breakdown, taken before the heavy imports
+STARTED = time.perf_counter()
+
+import aiohttp
+from web3 import AsyncWeb3
 from dotenv import load_dotenv
 
+from abi_artifact import load_abis
+from analytics import RollingWindows
+from bonding_curve_pricing import CurvePricer, CurveState
+from candles import TRADE_EVENTS, CandleBuilder
+from checkpoint import Checkpoint
+from deployments import Deployment
+from event_store import EventStore
+from game_stats import GameStats
+from hint_access import HintAccessIndex, HintServer, load_hints
+from log_ingest import LogIngestor
+from log_stream import LogStream
+from metrics import AgentMetrics, MetricsServer, StartupTimer
+from player_index import PLAYER_EVENTS, PlayerIndex
+from pool_mirror import PoolMirror
+from read_batcher import ReadBatcher
+from rpc_cassette import RecordingTransport
+from rpc_pool import PooledProvider, RpcPool
+from scheduler import PollPacer, Scheduler
+from social_poster import SocialPoster
+from tx_pipeline import TxPipeline
+
 # Load environment variables
 load_dotenv()
 
@@ -32,20 +55,87 @@ JACKPOT_ADDRESS = os.getenv("JACKPOT_ADDRESS", "0x1bCb1B4474b636874E1C35B0CC32AD
 TOKEN_ADDRESS = os.getenv("TOKEN_ADDRESS", "0x0755fb9917419a08c90a0Fd245F119202844ec3D")
 BONDING_CURVE_ADDRESS = os.getenv("BONDING_CURVE_ADDRESS", "0x2ECA93adD34C533008b947B2Ed02e4974122D525")
 
+# Factory of the post-graduation liquidity pools; read from the bonding curve when unset
+LIQUIDITY_POOL_FACTORY_ADDRESS = os.getenv("LIQUIDITY_POOL_FACTORY_ADDRESS")
+
 # Load private key for transactions (if needed)
 AGENT_PRIVATE_KEY = os.getenv("AGENT_PRIVATE_KEY")
 
-# Load contract ABIs from files
-try:
-    with open("JackpotGame.json", "r") as f:
-        JACKPOT_ABI = json.load(f)
+# Gas-price refresh interval for agent transactions, in seconds
+GAS_PRICE_REFRESH = float(os.getenv("GAS_PRICE_REFRESH", "30"))
 
-    with open("Token100x.json", "r") as f:
-        TOKEN_ABI = json.load(f)
+# Maximum number of concurrent RPC connections in the shared HTTP pool
+RPC_MAX_CONCURRENCY = int(os.getenv("RPC_MAX_CONCURRENCY", "8"))
+
+# Hedge latency-critical reads to a second endpoint when several RPC URLs are configured
+RPC_HEDGE = os.getenv("RPC_HEDGE", "true").lower() != "false"
+
+# Endpoints more than this many blocks behind the highest seen are quarantined
+RPC_MAX_BLOCK_LAG = int(os.getenv("RPC_MAX_BLOCK_LAG", "5"))
+
+# Optional Multicall3 deployment used to aggregate view calls into one eth_call
+MULTICALL_ADDRESS = os.getenv("MULTICALL_ADDRESS")
+
+# Durable log cursor and catch-up settings
+CHECKPOINT_FILE = os.getenv("CHECKPOINT_FILE", "agent_checkpoint.json")
+START_BLOCK = int(os.environ["START_BLOCK"]) if os.getenv("START_BLOCK") else None
+LOGS_MAX_CHUNK = int(os.getenv("LOGS_MAX_CHUNK", "2000"))
+
+# Local SQLite history of every JackpotGame and BondingCurve event; set EVENT_STORE_FILE= to disable
+EVENT_STORE_FILE = os.getenv("EVENT_STORE_FILE", "agent_events.db")
+
+# Per-player counters and leaderboards, and OHLCV candles built from trade events; both are
+# snapshotted every STATE_SNAPSHOT_INTERVAL seconds. Set either file to empty to keep it in memory only
+PLAYER_INDEX_FILE = os.getenv("PLAYER_INDEX_FILE", "agent_players.npz")
+CANDLES_FILE = os.getenv("CANDLES_FILE", "agent_candles.npz")
+STATE_SNAPSHOT_INTERVAL = float(os.getenv("STATE_SNAPSHOT_INTERVAL", "300"))
+
+# Optional WebSocket endpoint for push-based log delivery (e.g. ws://127.0.0.1:8545 for Hardhat)
+WS_URL = os.getenv("WS_URL")
+
+# Record every JSON-RPC request and response to this cassette for offline replay (see rpc_cassette.py).
+# Logs are polled while recording, so the cassette holds all of them
+RPC_RECORD_FILE = os.getenv("RPC_RECORD_FILE")
+
+# Poll intervals in seconds: polling while events are sparse, and the safety-net poll while streaming
+POLL_INTERVAL = 15
+STREAM_POLL_INTERVAL = float(os.getenv("STREAM_POLL_INTERVAL", "60"))
+
+# Adaptive polling: about once per block while players are active, backing off by POLL_BACKOFF
+# per poll without events up to POLL_MAX_INTERVAL while the game is idle
+POLL_MIN_INTERVAL = float(os.getenv("POLL_MIN_INTERVAL", "1"))
+POLL_MAX_INTERVAL = float(os.getenv("POLL_MAX_INTERVAL", "120"))
+POLL_BACKOFF = float(os.getenv("POLL_BACKOFF", "2"))
+
+# Periodic jobs: stats refresh and the summary posted after a quiet stretch
+STATS_INTERVAL = float(os.getenv("STATS_INTERVAL", "300"))
+SUMMARY_INTERVAL = float(os.getenv("SUMMARY_INTERVAL", "14400"))
+
+# Random spread applied to every job interval (0.1 = +/-10%), and the run times past which
+# a poll or stats refresh counts as a deadline overrun
+SCHEDULER_JITTER = float(os.getenv("SCHEDULER_JITTER", "0.1"))
+POLL_DEADLINE = float(os.getenv("POLL_DEADLINE", "30"))
+STATS_DEADLINE = float(os.getenv("STATS_DEADLINE", "60"))
+
+# Local Prometheus endpoint; set METRICS_PORT=0 to disable
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108") or "0")
+
+# Hint endpoint replacing api/getHint.js; serves the texts in HINTS_FILE to players who bought them.
+# Disabled unless HINT_SERVER_PORT is set and HINTS_FILE exists
+HINTS_FILE = os.getenv("HINTS_FILE", "hints.json")
+HINT_SERVER_HOST = os.getenv("HINT_SERVER_HOST", "127.0.0.1")
+HINT_SERVER_PORT = int(os.getenv("HINT_SERVER_PORT", "0") or "0")
+
+# Load contract ABIs from the compact agent_abi.json next to this file (see abi_artifact.py)
+try:
+    ABIS = load_abis()
+    JACKPOT_ABI = ABIS["JackpotGame"]
+    TOKEN_ABI = ABIS["Token100x"]
+    BONDING_CURVE_ABI = ABIS["BondingCurve"]
+    LIQUIDITY_POOL_ABI = ABIS["SimpleLiquidityPool"]
+    LIQUIDITY_POOL_FACTORY_ABI = ABIS["LiquidityPoolFactory"]
 
-    with open("BondingCurve.json", "r") as f:
-        BONDING_CURVE_ABI = json.load(f)
-        
     logger.info("Contract ABIs loaded successfully")
 except Exception as e:
     logger.error(f"Error loading contract ABIs: {e}")
@@ -57,176 +147,541 @@ TWITTER_API_SECRET = os.getenv("TWITTER_API_SECRET")
 TWITTER_ACCESS_TOKEN = os.getenv("TWITTER_ACCESS_TOKEN")
 TWITTER_ACCESS_SECRET = os.getenv("TWITTER_ACCESS_SECRET")
 
-# Game statistics for analytics
-class GameStats:
-    def __init__(self):
-        self.total_guesses = 0
-        self.unique_players = 0
-        self.total_winners = 0
-        self.jackpot_amount = 0
-        self.last_update = time.time()
-        self.last_win_time = 0
-        self.last_winner = None
-        self.token_price = 0
-        self.liquidity = 0
-        self.hints_purchased = []
-        self.last_hint_time = 0
-        self.hint_count = 0
-        self.recent_activities = []  # List of recent activities for periodic summaries
-        
-    def add_activity(self, activity_type: str, message: str, timestamp: float = None):
-        """Add an activity to the recent activities log"""
-        if timestamp is None:
-            timestamp = time.time()
-        
-        self.recent_activities.append({
-            "type": activity_type,
-            "message": message,
-            "timestamp": timestamp
-        })
-        
-        # Keep only the last 100 activities
-        if len(self.recent_activities) > 100:
-            self.recent_activities = self.recent_activities[-100:]
+# X API tier (free, basic, pro) used to size the posting rate limit
+TWITTER_TIER = os.getenv("TWITTER_TIER", "free")
+
+def log_rpc_stats(reader: ReadBatcher, pool: RpcPool):
+    """Log read cache effectiveness and per-endpoint RPC health"""
+    cache = reader.cache.stats()
+    logger.info(f"Read cache: {cache['hits']} hits, {cache['misses']} misses " +
+               f"({cache['hit_rate']:.0%} hit rate), {cache['invalidations']} invalidations")
+    
+    for endpoint in pool.stats():
+        latency = f"{endpoint['latency_ewma'] * 1000:.0f}ms" if endpoint['latency_ewma'] is not None else "n/a"
+        logger.info(f"RPC {endpoint['url']}: {latency} EWMA, {endpoint['error_rate']:.0%} errors, " +
+                   f"{endpoint['requests']} requests, healthy={endpoint['healthy']}")
+
+def default_deployment() -> Deployment:
+    """The single game configured through the environment variables above"""
+    twitter_credentials = (TWITTER_API_KEY, TWITTER_API_SECRET, TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_SECRET)
+    return Deployment(
+        "default",
+        JACKPOT_ADDRESS,
+        TOKEN_ADDRESS,
+        BONDING_CURVE_ADDRESS,
+        liquidity_pool_factory_address=LIQUIDITY_POOL_FACTORY_ADDRESS,
+        private_key=AGENT_PRIVATE_KEY,
+        twitter_credentials=twitter_credentials if all(twitter_credentials) else None,
+        twitter_tier=TWITTER_TIER,
+        checkpoint_file=CHECKPOINT_FILE,
+        event_store_file=EVENT_STORE_FILE,
+        player_index_file=PLAYER_INDEX_FILE,
+        candles_file=CANDLES_FILE
+    )
 
 # Class for the 100x Jackpot DeFAI Agent
 class JackpotAgent:
-    def __init__(self, rpc_url: str):
-        # Initialize Web3 connection
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
-        if not self.w3.is_connected():
-            raise ConnectionError(f"Failed to connect to RPC: {rpc_url}")
+    def __init__(
+        self,
+        rpc_urls: Union[str, List[str]],
+        max_concurrency: int = RPC_MAX_CONCURRENCY,
+        deployment: Optional[Deployment] = None,
+        host=None
+    ):
+        # Cold-start breakdown; a host times the startup of all its deployments together
+        self.cold_start = host.cold_start if host is not None else StartupTimer(STARTED)
+        if host is None:
+            self.cold_start.mark("import")
+        
+        # One game deployment; when hosted by a MultiAgent, the RPC pool, reader and log sweep are shared
+        self.deployment = deployment or default_deployment()
+        self.host = host
+        self.label = f" [{self.deployment.name}]" if host is not None else ""
+        
+        # Initialize async Web3 client; the RPC pool and its HTTP session are attached in start()
+        self.rpc_urls = [rpc_urls] if isinstance(rpc_urls, str) else list(rpc_urls)
+        self.max_concurrency = max_concurrency
+        self.session = None
+        self.pool = None
+        self.reader = None
+        self.provider = host.provider if host is not None else PooledProvider()
+        self.w3 = host.w3 if host is not None else AsyncWeb3(self.provider)
         
-        logger.info(f"Connected to blockchain at {rpc_url}")
+        # Prometheus metrics, served by start() when METRICS_PORT is set
+        self.metrics = AgentMetrics()
+        self.metrics_server = None
         
         # Initialize contracts
         self.jackpot_contract = self.w3.eth.contract(
-            address=self.w3.to_checksum_address(JACKPOT_ADDRESS),
+            address=self.w3.to_checksum_address(self.deployment.jackpot_address),
             abi=JACKPOT_ABI
         )
         
         self.token_contract = self.w3.eth.contract(
-            address=self.w3.to_checksum_address(TOKEN_ADDRESS),
+            address=self.w3.to_checksum_address(self.deployment.token_address),
             abi=TOKEN_ABI
         )
         
         self.bonding_curve = self.w3.eth.contract(
-            address=self.w3.to_checksum_address(BONDING_CURVE_ADDRESS),
+            address=self.w3.to_checksum_address(self.deployment.bonding_curve_address),
             abi=BONDING_CURVE_ABI
         )
         
         # Set up account if private key is provided
         self.account = None
-        if AGENT_PRIVATE_KEY:
-            self.account = self.w3.eth.account.from_key(AGENT_PRIVATE_KEY)
+        self.tx_pipeline = None
+        if self.deployment.private_key:
+            self.account = self.w3.eth.account.from_key(self.deployment.private_key)
+            self.tx_pipeline = TxPipeline(
+                self.w3,
+                self.account,
+                self.jackpot_contract,
+                gas_refresh_interval=GAS_PRICE_REFRESH,
+                on_confirm=self.metrics.tx_confirm_seconds.observe
+            )
+            self.metrics.tx_sent.set_function(lambda: self.tx_pipeline.sent)
+            self.metrics.tx_failed.set_function(lambda: self.tx_pipeline.failed)
+            self.metrics.tx_repriced.set_function(lambda: self.tx_pipeline.repriced)
             logger.info(f"Using account: {self.account.address}")
         
         # Initialize game statistics
         self.stats = GameStats()
         
-        # Initialize Twitter client
+        # Sliding 1h/4h/24h activity counters for summaries
+        self.analytics = RollingWindows()
+        self.jackpot_baseline = None  # Last jackpot read, for inflow tracking
+        
+        # Initialize Twitter client; tweepy is only imported when there is an account to post to
         self.twitter = None
-        if all([TWITTER_API_KEY, TWITTER_API_SECRET, TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_SECRET]):
+        if self.deployment.twitter_credentials:
+            import tweepy
+            api_key, api_secret, access_token, access_secret = self.deployment.twitter_credentials
             self.twitter = tweepy.Client(
-                consumer_key=TWITTER_API_KEY,
-                consumer_secret=TWITTER_API_SECRET,
-                access_token=TWITTER_ACCESS_TOKEN,
-                access_token_secret=TWITTER_ACCESS_SECRET
+                consumer_key=api_key,
+                consumer_secret=api_secret,
+                access_token=access_token,
+                access_token_secret=access_secret
             )
-            logger.info("Twitter client initialized (v2 API)")
+            logger.info(f"Twitter client initialized (v2 API){self.label}")
         else:
-            logger.warning("Twitter credentials not found, social posting disabled")
+            logger.warning(f"Twitter credentials not found, social posting disabled{self.label}")
         
-        # Event filters for listening to contract events
-        self.jackpot_won_filter = self.jackpot_contract.events.JackpotWon.create_filter(
-            fromBlock='latest'
-        )
+        # Rate-limited posting queue; routine updates are merged into digests under pressure
+        self.social = SocialPoster(self.twitter, tier=self.deployment.twitter_tier)
+        self.social.register_digest("hint_added", self.format_hint_added_digest)
+        self.social.register_digest("hint_purchased", self.format_latest_digest)
+        self.social.register_digest("new_player", self.format_latest_digest)
+        self.metrics.social_queue_depth.set_function(lambda: len(self.social.queue))
+        self.metrics.social_posted.set_function(lambda: self.social.posted)
+        self.metrics.social_failed.set_function(lambda: self.social.failed)
+        self.metrics.social_dropped.set_function(lambda: self.social.dropped)
+        self.metrics.social_rate_limit_waits.set_function(lambda: self.social.rate_limit_waits)
         
-        self.social_announcement_filter = self.jackpot_contract.events.SocialAnnouncement.create_filter(
-            fromBlock='latest'
-        )
+        # Event handlers, keyed by event name
+        self.event_handlers = {
+            "JackpotWon": self.handle_jackpot_win,
+            "SocialAnnouncement": self.handle_social_announcement,
+            "NewPlayer": self.handle_new_player,
+            "HintRequested": self.handle_hint_request,
+            "HintAdded": self.handle_hint_added,
+            "GuessCommitted": self.handle_guess_committed,
+            "GuessRevealed": self.handle_guess_revealed,
+            "GameUpdate": self.handle_game_update,
+        }
         
-        self.new_player_filter = self.jackpot_contract.events.NewPlayer.create_filter(
-            fromBlock='latest'
+        # Single eth_getLogs sweep covering every handled event, resumable from a checkpoint
+        # (a host polls on the ingestor's behalf; it still keeps this deployment's cursor)
+        self.ingestor = LogIngestor(
+            self.w3,
+            start_block=START_BLOCK,
+            checkpoint=Checkpoint(self.deployment.checkpoint_file),
+            max_chunk=LOGS_MAX_CHUNK
         )
         
-        self.hint_requested_filter = self.jackpot_contract.events.HintRequested.create_filter(
-            fromBlock='latest'
-        )
+        # Push-based delivery when a WebSocket endpoint is configured; polling remains the fallback
+        self.dispatch_lock = asyncio.Lock()
+        self.stream = None
+        self.stream_task = None
+        if WS_URL and host is None and RPC_RECORD_FILE:
+            logger.warning("RPC_RECORD_FILE is set; ignoring WS_URL so that every log is recorded")
+        elif WS_URL and host is None:
+            self.stream = LogStream(WS_URL, self.ingestor, self.process_stream_events, self.check_contract_events)
+        for event_name in self.event_handlers:
+            self.ingestor.subscribe(self.jackpot_contract, event_name)
         
-        self.hint_added_filter = self.jackpot_contract.events.HintAdded.create_filter(
-            fromBlock='latest'
-        )
+        # (player, hintIndex) grants, extended by HintRequested and restored from the event store
+        self.hint_access = HintAccessIndex(self.jackpot_contract)
+        self.hint_server = None
+        self.metrics.hint_lookups.set_function(lambda: self.hint_access.lookups)
+        
+        # Counters and leaderboards per player, restored from the last snapshot
+        self.players = PlayerIndex()
+        player_index_file = self.deployment.player_index_file
+        if player_index_file and os.path.exists(player_index_file):
+            try:
+                self.players = PlayerIndex.load(player_index_file)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable player index {player_index_file}: {e}")
+        
+        # Price and volume candles from curve and pool trades, restored from the last snapshot
+        self.candles = CandleBuilder()
+        candles_file = self.deployment.candles_file
+        if candles_file and os.path.exists(candles_file):
+            try:
+                self.candles = CandleBuilder.load(candles_file)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable candles {candles_file}: {e}")
+        for event_name in ("Buy", "Sell"):
+            self.ingestor.subscribe(self.bonding_curve, event_name)
+        self.state_write = None
+        
+        # Persistent event history; it records every game and bonding curve event, handled or not
+        self.store = None
+        if self.deployment.event_store_file:
+            self.store = EventStore(self.deployment.event_store_file)
+            for contract in (self.jackpot_contract, self.bonding_curve):
+                for item in contract.abi:
+                    if item.get("type") == "event":
+                        self.ingestor.subscribe(contract, item["name"])
+            self.load_history()
+        
+        # In-memory reserves of the liquidity pools, kept current from pool events
+        self.pools = PoolMirror(self.w3, self.ingestor, LIQUIDITY_POOL_ABI, LIQUIDITY_POOL_FACTORY_ABI)
+        if self.deployment.liquidity_pool_factory_address:
+            self.pools.watch_factory(self.deployment.liquidity_pool_factory_address)
+        
+        # Precompile decoders for every event the three contracts can emit
+        for contract in (self.jackpot_contract, self.token_contract, self.bonding_curve):
+            self.ingestor.decoder.register_contract(contract.address, contract.abi)
         
         # Initialize timers for periodic activities
         self.last_stats_update = time.time()
         self.last_social_post = time.time()
         
-        logger.info("Jackpot Agent initialized and ready")
+        # Polling, stats refresh and summaries run as independent jobs; polls follow block time and activity
+        self.pacer = PollPacer(POLL_MIN_INTERVAL, POLL_MAX_INTERVAL, POLL_INTERVAL, POLL_BACKOFF)
+        self.scheduler = Scheduler(SCHEDULER_JITTER, observer=self.metrics.observe_job)
+        self.metrics.poll_interval.set_function(self.poll_interval)
+        self.metrics.block_time.set_function(lambda: self.pacer.block_time)
+        
+        # A purchase the hint endpoint finds on chain before polling does means players are active
+        self.hint_access.on_purchase = self.poll_now
+        
+        if host is None:
+            self.cold_start.mark("init")
+        logger.info(f"Jackpot Agent initialized and ready{self.label}")
     
-    async def run(self):
+    async def start(self, transport=None):
+        """Open the shared keep-alive RPC session and verify the connection.
+        A given transport (such as a cassette replay) is used instead of the RPC endpoints"""
+        if self.host is not None:
+            await self.start_hosted()
+            return
+        
+        if transport is None:
+            # One connection pool for every contract read, log query and transaction
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+            
+            # Route every request to the fastest healthy endpoint
+            transport = RpcPool(
+                self.rpc_urls,
+                self.session,
+                hedge=RPC_HEDGE,
+                max_block_lag=RPC_MAX_BLOCK_LAG,
+                observer=self.metrics.observe_rpc
+            )
+            if RPC_RECORD_FILE:
+                transport = RecordingTransport(transport, RPC_RECORD_FILE, self.cassette_meta())
+                logger.info(f"Recording RPC traffic to {RPC_RECORD_FILE}")
+        self.pool = transport
+        self.provider.pool = self.pool
+        
+        # The health probe doubles as the connection check and the first head
+        await self.pool.check_health()
+        if self.pool.highest_block is None:
+            raise ConnectionError(f"Failed to connect to RPC: {', '.join(self.rpc_urls)}")
+        self.pool.start()
+        
+        # Contract view calls queued in the same tick go out as one batch
+        self.reader = ReadBatcher(self.pool, MULTICALL_ADDRESS)
+        self.reader.set_head(self.pool.highest_block)
+        self.pools.reader = self.reader
+        self.hint_access.reader = self.reader
+        
+        if METRICS_PORT:
+            self.metrics_server = MetricsServer(self.metrics, METRICS_HOST, METRICS_PORT)
+        
+        # Independent initialization round trips run concurrently; the pool mirror is
+        # seeded before the log stream subscribes, so existing pools are included
+        await asyncio.gather(
+            self.start_pool_mirror(),
+            *([self.tx_pipeline.start()] if self.tx_pipeline else []),
+            *([self.metrics_server.start()] if self.metrics_server else []),
+            *([self.start_hint_server()] if HINT_SERVER_PORT else []),
+        )
+        
+        self.social.start()
+        
+        if self.stream:
+            self.stream_task = asyncio.ensure_future(self.stream.run())
+        
+        logger.info(f"Connected to blockchain via {len(self.rpc_urls)} endpoint(s) (max {self.max_concurrency} concurrent requests)")
+    
+    def cassette_meta(self) -> Dict:
+        """What a replay needs to rebuild this agent from a recording"""
+        return {
+            "name": self.deployment.name,
+            "jackpot_address": self.jackpot_contract.address,
+            "token_address": self.token_contract.address,
+            "bonding_curve_address": self.bonding_curve.address,
+            "liquidity_pool_factory_address": self.deployment.liquidity_pool_factory_address,
+            "multicall_address": MULTICALL_ADDRESS,
+            "sends_transactions": self.account is not None,
+            "twitter_tier": self.deployment.twitter_tier,
+        }
+    
+    async def start_hosted(self):
+        """Start on a MultiAgent's RPC pool and reader; the host owns the session and the log sweep"""
+        self.pool = self.host.pool
+        self.reader = self.host.reader
+        self.pools.reader = self.reader
+        self.hint_access.reader = self.reader
+        await asyncio.gather(
+            self.start_pool_mirror(),
+            *([self.tx_pipeline.start()] if self.tx_pipeline else []),
+        )
+        
+        self.social.start()
+        
+        logger.info(f"Deployment {self.deployment.name} started: jackpot {self.jackpot_contract.address}")
+    
+    async def start_pool_mirror(self):
+        """Find the liquidity pool factory and seed every existing pool at the current head"""
+        try:
+            if self.reader.head is None:
+                self.reader.set_head(await self.reader.block_number())
+            if self.pools.factory is None:
+                factory = await self.reader.call(self.bonding_curve.functions.liquidityPoolFactory())
+                if int(factory, 16) == 0:
+                    logger.info("No liquidity pool factory configured; pool mirror idle")
+                    return
+                self.pools.watch_factory(factory)
+            await self.pools.discover()
+            logger.info(f"Pool mirror tracking {len(self.pools.pools)} liquidity pool(s)")
+        except Exception as e:
+            logger.warning(f"Could not seed the liquidity pool mirror: {e}")
+    
+    async def start_hint_server(self):
+        """Serve hints from the access index; the agent runs without it if the hints are missing"""
+        if not os.path.exists(HINTS_FILE):
+            logger.warning(f"{HINTS_FILE} not found, hint endpoint disabled")
+            return
+        self.hint_server = HintServer(self.hint_access, load_hints(HINTS_FILE), HINT_SERVER_HOST, HINT_SERVER_PORT, self.metrics)
+        await self.hint_server.start()
+    
+    async def close(self):
+        """Stop the posting worker and close the shared RPC session"""
+        await self.social.stop()
+        
+        if self.hint_server is not None:
+            await self.hint_server.stop()
+            self.hint_server = None
+        
+        if self.stream_task:
+            self.stream_task.cancel()
+            await asyncio.gather(self.stream_task, return_exceptions=True)
+            self.stream_task = None
+        
+        if self.tx_pipeline:
+            await self.tx_pipeline.stop()
+        
+        if self.pool is not None and self.host is None:
+            await self.pool.stop()
+        
+        if self.metrics_server is not None:
+            await self.metrics_server.stop()
+            self.metrics_server = None
+        
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+        
+        if self.state_write is not None:
+            await asyncio.gather(self.state_write, return_exceptions=True)
+        self.save_state()
+    
+    async def startup(self, transport=None):
+        """Connect, load game statistics and replay anything missed while the agent was down"""
+        await self.start(transport)
+        self.cold_start.mark("start")
+        
+        # The stats refresh and the replay don't depend on each other; their reads share batches
+        await asyncio.gather(self.update_game_stats(), self.catch_up())
+        self.cold_start.mark("stats_and_catch_up")
+        
+        self.metrics.observe_startup(self.cold_start)
+        logger.info(f"Cold start: {self.cold_start.summary()}")
+    
+    async def run(self, transport=None):
         """Main loop for the agent"""
         logger.info("Starting Jackpot Agent")
         
-        # Initialize game statistics from contracts
-        await self.update_game_stats()
+        await self.startup(transport)
         
         # First-time announcement
         jackpot_amount = self.stats.jackpot_amount
         await self.post_social_update(f"🚀 100x Jackpot DeFAI Agent is now active! Current jackpot: {jackpot_amount:.2f} S. Will you solve the secret and win? #100xJackpot #DeFAI")
         
-        # Main event loop
+        # Main event loop: a slow stats refresh or summary no longer delays polling
+        self.scheduler.every("poll", self.poll_interval, self.catch_up, deadline=POLL_DEADLINE)
+        self.scheduler.every("stats", STATS_INTERVAL, self.refresh_game_stats, deadline=STATS_DEADLINE)
+        self.scheduler.every("summary", self.summary_delay, self.periodic_summary, jitter=0)
+        self.scheduler.every("snapshot", STATE_SNAPSHOT_INTERVAL, self.snapshot_state)
         try:
-            while True:
-                # Check for new events
-                await self.check_contract_events()
-                
-                # Perform periodic updates
-                current_time = time.time()
-                
-                # Update game stats every 5 minutes
-                if current_time - self.last_stats_update > 300:
-                    await self.update_game_stats()
-                    self.last_stats_update = current_time
-                
-                # Post periodic updates every 4 hours if there has been activity
-                if current_time - self.last_social_post > 14400 and len(self.stats.recent_activities) > 0:
-                    await self.post_periodic_summary()
-                    self.last_social_post = current_time
-                
-                # Sleep to avoid excessive polling
-                await asyncio.sleep(15)
-                
+            await self.scheduler.run()
         except KeyboardInterrupt:
             logger.info("Agent shutting down by user request")
         except Exception as e:
             logger.error(f"Error in main loop: {e}", exc_info=True)
+        finally:
+            await self.scheduler.stop()
+            await self.close()
+    
+    def poll_interval(self) -> float:
+        """Seconds until the next log poll; while streaming, polls only fill gaps"""
+        if self.stream is not None and self.stream.connected:
+            return STREAM_POLL_INTERVAL
+        return self.pacer.interval()
+    
+    def poll_now(self):
+        """Poll right away and drop any idle backoff"""
+        target = self.host if self.host is not None else self
+        target.pacer.activity()
+        target.scheduler.trigger("poll")
+    
+    async def refresh_game_stats(self):
+        """Scheduled stats refresh"""
+        await self.update_game_stats()
+        self.last_stats_update = time.time()
+    
+    def summary_delay(self) -> float:
+        """Seconds until a periodic summary is due; an overdue one waits for activity"""
+        return max(POLL_INTERVAL, self.last_social_post + SUMMARY_INTERVAL - time.time())
+    
+    async def periodic_summary(self):
+        """Post a summary after SUMMARY_INTERVAL without posts, if there has been activity"""
+        if time.time() - self.last_social_post >= SUMMARY_INTERVAL and len(self.stats.recent_activities) > 0:
+            await self.post_periodic_summary()
+            self.last_social_post = time.time()
+    
+    async def catch_up(self):
+        """Poll repeatedly until the log cursor reaches the chain head"""
+        while True:
+            next_block = self.ingestor.next_block
+            await self.check_contract_events()
+            if self.ingestor.caught_up or self.ingestor.next_block == next_block:
+                # Caught up, or the poll failed and will be retried next cycle
+                return
+            logger.info(f"Catching up: processed up to block {self.ingestor.next_block - 1} of {self.ingestor.head}")
     
     async def check_contract_events(self):
         """Check for new events from the contracts"""
-        try:
-            # Check for jackpot wins
-            for event in self.jackpot_won_filter.get_new_entries():
-                await self.handle_jackpot_win(event)
+        async with self.dispatch_lock:
+            try:
+                events = await self.ingestor.poll()
+            except Exception as e:
+                logger.error(f"Error checking contract events: {e}", exc_info=True)
+                return
             
-            # Check for social announcements
-            for event in self.social_announcement_filter.get_new_entries():
-                await self.handle_social_announcement(event)
+            await self.handle_polled_events(events)
+    
+    async def handle_polled_events(self, events: List):
+        """Handle the events of one poll and mark its block range complete"""
+        # Pin handler and stats reads to the head seen by this poll
+        self.reader.set_head(self.ingestor.head)
+        
+        if self.store is not None:
+            self.store.write(events)
+        
+        self.players.apply_events(events)
+        await self.pools.apply(events, self.ingestor.head)
+        self.apply_trades(events, self.ingestor.head)
+        await self.process_events([event for event in events if not self.ingestor.handled_by_stream(event)])
+        self.ingestor.complete()
+        self.pacer.observe(self.ingestor.head, len(events))
+        self.metrics.observe_blocks(self.ingestor.head, self.ingestor.next_block - 1)
+    
+    async def process_stream_events(self, events: List):
+        """Handle events pushed by the log stream"""
+        async with self.dispatch_lock:
+            # While catching up, the polled chunks reach these in chain order
+            if not self.ingestor.caught_up:
+                self.poll_now()
+                return
             
-            # Check for new players
-            for event in self.new_player_filter.get_new_entries():
-                await self.handle_new_player(event)
+            # A poll that held the lock may have dispatched these already
+            events = [event for event in events if not self.ingestor.covers(event)]
+            if not events:
+                return
             
-            # Check for hint requests
-            for event in self.hint_requested_filter.get_new_entries():
-                await self.handle_hint_request(event)
+            block = max(event.blockNumber for event in events)
+            if self.reader.head is None or block > self.reader.head:
+                self.reader.set_head(block)
             
-            # Check for new hints
-            for event in self.hint_added_filter.get_new_entries():
-                await self.handle_hint_added(event)
+            if self.store is not None:
+                self.store.write(events)
             
-        except Exception as e:
-            logger.error(f"Error checking contract events: {e}", exc_info=True)
+            # The pool mirror, player index and candles take events in chain order, so the poll applies these
+            await self.process_events(events)
+            self.metrics.observe_blocks(self.reader.head, block)
+    
+    async def process_events(self, events: List):
+        """Dispatch decoded events and advance the durable cursor"""
+        if events:
+            self.cold_start.event_seen()
+        
+        # The durable cursor only moves past an event once everything before it is handled
+        handled = [event.event not in self.event_handlers for event in events]
+        watermark = 0
+        
+        def mark_handled(index: int):
+            nonlocal watermark
+            handled[index] = True
+            while watermark < len(events) and handled[watermark]:
+                self.ingestor.advance(events[watermark])
+                watermark += 1
+        
+        # Group by event type; each group keeps (block, logIndex) order while
+        # unrelated event types are handled concurrently
+        groups: Dict[str, List] = {}
+        for index, event in enumerate(events):
+            if not handled[index]:
+                groups.setdefault(event.event, []).append(index)
+        
+        await asyncio.gather(*(self.dispatch_events(events, group, mark_handled) for group in groups.values()))
+    
+    async def dispatch_events(self, events: List, indices: List[int], mark_handled):
+        """Run the handler for each event in order"""
+        for index in indices:
+            event = events[index]
+            self.analytics.record_event(event.event, self.event_time(event))
+            self.metrics.events.inc(event=event.event)
+            started = time.monotonic()
+            try:
+                await self.event_handlers[event.event](event)
+            except Exception as e:
+                self.metrics.handler_errors.inc(event=event.event)
+                logger.error(f"Error handling {event.event} event: {e}", exc_info=True)
+            self.metrics.handler_seconds.observe(time.monotonic() - started, event=event.event)
+            mark_handled(index)
     
     async def handle_jackpot_win(self, event):
         """Handle a jackpot win event"""
@@ -237,16 +692,26 @@ class JackpotAgent:
         amount = self.w3.from_wei(event.args.amount, 'ether')
         guess = event.args.guess
         
+        # The payout changed the jackpot
+        self.reader.invalidate(self.jackpot_contract.functions.jackpotAmount())
+        
         # Update stats
+        self.analytics.add("jackpot_paid", float(amount), self.event_time(event))
+        self.stats.record_player(winner)
         self.stats.last_winner = winner
         self.stats.last_win_time = time.time()
         self.stats.total_winners += 1
         
         # Create winner announcement
         winner_addr = self.truncate_address(winner)
+        attempts = ""
+        if self.store is not None:
+            # revealGuess emits JackpotWon before the winning GuessRevealed, so that one is added
+            guesses = self.store.count("GuessRevealed", winner, through=(event.blockNumber, event.logIndex)) + 1
+            attempts = f" on guess #{guesses}"
         announcement = (
             f"🎊 JACKPOT WON! 🎊\n\n"
-            f"Address {winner_addr} just won {amount:.2f} S by correctly guessing: '{guess}'\n\n"
+            f"Address {winner_addr} just won {amount:.2f} S{attempts} by correctly guessing: '{guess}'\n\n"
             f"The jackpot has been reset. Can you solve the next secret? #100xJackpot #CryptoWin"
         )
         
@@ -278,8 +743,9 @@ class JackpotAgent:
         elif announcement_type == "NEW_HINT":
             post = f"🔍 New hint available in the 100x Jackpot game! {message} Purchase it in-game to get closer to solving the secret! #100xJackpot"
         elif announcement_type == "JACKPOT_FUNDED":
-            # Get current jackpot amount
-            jackpot = self.w3.from_wei(await self.jackpot_contract.functions.jackpotAmount().call(), 'ether')
+            # fundJackpot changed the jackpot; get the current amount
+            self.reader.invalidate(self.jackpot_contract.functions.jackpotAmount())
+            jackpot = self.w3.from_wei(await self.reader.call(self.jackpot_contract.functions.jackpotAmount()), 'ether')
             post = f"💰 The jackpot has been funded! Current jackpot: {jackpot:.2f} S. Will you be the one to solve the secret? #100xJackpot #CryptoJackpot"
         elif announcement_type == "JACKPOT_WON":
             # This is handled by the JackpotWon event, but we'll post the message anyway
@@ -300,6 +766,7 @@ class JackpotAgent:
         
         # Update stats
         self.stats.unique_players += 1
+        self.stats.record_player(player)
         
         # Add to activity log
         self.stats.add_activity("new_player", f"New player joined: {player_addr}")
@@ -307,7 +774,7 @@ class JackpotAgent:
         # Every 10th player gets a special announcement
         if self.stats.unique_players % 10 == 0:
             # Get current jackpot amount
-            jackpot = self.w3.from_wei(await self.jackpot_contract.functions.jackpotAmount().call(), 'ether')
+            jackpot = self.w3.from_wei(await self.reader.call(self.jackpot_contract.functions.jackpotAmount()), 'ether')
             
             post = (
                 f"🎮 Welcome to our {self.stats.unique_players}th player! "
@@ -315,7 +782,7 @@ class JackpotAgent:
                 f"{jackpot:.2f} S "
                 f"#100xJackpot #CryptoGaming"
             )
-            await self.post_social_update(post)
+            await self.post_social_update(post, kind="new_player")
     
     async def handle_hint_request(self, event):
         """Handle a hint request event"""
@@ -324,9 +791,12 @@ class JackpotAgent:
         
         logger.info(f"Hint requested: Player {self.truncate_address(player)} requested hint #{hint_index}")
         
+        # The hint endpoint answers this player from memory from now on
+        self.hint_access.grant(player, hint_index)
+        
         # Update stats
-        self.stats.hints_purchased.append(hint_index)
-        self.stats.last_hint_time = time.time()
+        self.stats.record_hint_purchase(hint_index)
+        self.stats.record_player(player)
         
         # Add to activity log
         self.stats.add_activity(
@@ -335,10 +805,10 @@ class JackpotAgent:
         )
         
         # Every 5th hint purchase gets a social media post
-        hint_count = len(self.stats.hints_purchased)
+        hint_count = self.stats.total_hints_purchased
         if hint_count % 5 == 0:
             # Get current jackpot amount
-            jackpot = self.w3.from_wei(await self.jackpot_contract.functions.jackpotAmount().call(), 'ether')
+            jackpot = self.w3.from_wei(await self.reader.call(self.jackpot_contract.functions.jackpotAmount()), 'ether')
             
             post = (
                 f"🔍 {hint_count} hints have been purchased by players trying to solve the secret! "
@@ -346,7 +816,7 @@ class JackpotAgent:
                 f"{jackpot:.2f} S "
                 f"#100xJackpot #CryptoDetective"
             )
-            await self.post_social_update(post)
+            await self.post_social_update(post, kind="hint_purchased")
     
     async def handle_hint_added(self, event):
         """Handle a new hint being added to the game"""
@@ -356,59 +826,232 @@ class JackpotAgent:
         
         # Update stats
         self.stats.hint_count += 1
+        self.reader.invalidate(self.jackpot_contract.functions.hintCount())
         
         # Add to activity log
         self.stats.add_activity("hint_added", f"New hint #{hint_index} added to the game")
         
         # Post to social media
         # Get current jackpot amount
-        jackpot = self.w3.from_wei(await self.jackpot_contract.functions.jackpotAmount().call(), 'ether')
+        jackpot = self.w3.from_wei(await self.reader.call(self.jackpot_contract.functions.jackpotAmount()), 'ether')
         
         post = (
             f"🔍 New hint added to the 100x Jackpot game! Purchase it in-game to get closer to solving the secret! "
             f"Current jackpot: {jackpot:.2f} S "
             f"#100xJackpot #CryptoGame"
         )
-        await self.post_social_update(post)
+        await self.post_social_update(post, kind="hint_added")
+    
+    async def handle_guess_committed(self, event):
+        """Handle a guess commitment"""
+        player_addr = self.truncate_address(event.args.player)
+        
+        logger.info(f"Guess committed by {player_addr}")
+        
+        self.stats.record_player(event.args.player)
+        
+        # Add to activity log
+        self.stats.add_activity("guess_committed", f"Player {player_addr} committed a guess")
+    
+    async def handle_guess_revealed(self, event):
+        """Handle a revealed guess"""
+        player_addr = self.truncate_address(event.args.player)
+        
+        logger.info(f"Guess revealed by {player_addr} (won: {event.args.won})")
+        
+        # Update stats; winning guesses are announced by the JackpotWon handler
+        self.stats.total_guesses += 1
+        self.stats.record_player(event.args.player)
+        
+        # Add to activity log
+        self.stats.add_activity("guess", f"Player {player_addr} made a guess")
+    
+    async def handle_game_update(self, event):
+        """Handle a GameUpdate event (emitted by this agent via emitGameUpdate)"""
+        logger.info(f"Game update on-chain: {event.args.message}")
+    
+    def load_history(self):
+        """Restore hint and winner stats from the event store
+        
+        Only events up to the ingestion cursor count; anything after it will be
+        handled (and counted) again when ingestion resumes.
+        """
+        if self.ingestor.position is not None:
+            through = self.ingestor.position
+        elif self.ingestor.next_block is not None:
+            through = (self.ingestor.next_block - 1, 2 ** 62)
+        else:
+            through = None  # Starting from the head: everything stored is history
+        
+        self.stats.hints_purchased.update(self.store.hint_purchases(through=through))
+        self.stats.total_hints_purchased = sum(self.stats.hints_purchased.values())
+        self.hint_access.load(self.store.hint_grants(through=through))
+        
+        last_win = self.store.latest("JackpotWon", through=through)
+        if last_win is not None:
+            self.stats.last_winner = last_win.args["winner"]
+        
+        # Bring the player index from its snapshot up to the cursor
+        replayed = sum(
+            self.players.apply(row.event, row.args, row.block_number, row.log_index)
+            for row in self.store.scan(PLAYER_EVENTS, through=through, after=self.players.position)
+        )
+        logger.info(f"Player index: {len(self.players):,} players, {replayed:,} stored events replayed")
+        
+        logger.info(f"Event store {self.store.path}: {self.store.count():,} events up to block " +
+                   f"{self.store.last_block()}, {self.stats.total_hints_purchased} hint purchases restored " +
+                   f"({len(self.hint_access.granted)} players with hint access)")
+    
+    def state_files(self) -> List:
+        """(write function, path, state) for every snapshot file configured"""
+        files = []
+        if self.deployment.player_index_file:
+            files.append((PlayerIndex.write, self.deployment.player_index_file, self.players))
+        if self.deployment.candles_file:
+            files.append((CandleBuilder.write, self.deployment.candles_file, self.candles))
+        return files
+    
+    async def snapshot_state(self):
+        """Write the player index and candles; copies are taken on the loop, the files are written off it"""
+        snapshots = [(write, path, state.snapshot()) for write, path, state in self.state_files()]
+        if not snapshots:
+            return
+        
+        def write_all():
+            for write, path, arrays in snapshots:
+                write(path, arrays)
+        
+        # Shielded so that shutdown can wait for a write in progress before the final save
+        self.state_write = asyncio.ensure_future(asyncio.to_thread(write_all))
+        await asyncio.shield(self.state_write)
+    
+    def save_state(self):
+        """Write the player index and candles on shutdown"""
+        for write, path, state in self.state_files():
+            try:
+                write(path, state.snapshot())
+            except Exception as e:
+                logger.error(f"Error saving {path}: {e}")
+    
+    def event_time(self, event, head: Optional[int] = None) -> float:
+        """When an event's block was produced
+        
+        Logs without blockTimestamp are dated back from now by the observed block time.
+        """
+        if event.blockTimestamp is not None:
+            return event.blockTimestamp
+        pacer = self.host.pacer if self.host is not None else self.pacer
+        block_time = pacer.block_time or POLL_MIN_INTERVAL
+        head = head if head is not None else self.reader.head
+        return time.time() - max(0, (head or event.blockNumber) - event.blockNumber) * block_time
+    
+    def apply_trades(self, events: List, head: Optional[int]):
+        """Add curve and pool trades to the candles"""
+        if not any(event.event in TRADE_EVENTS for event in events):
+            return
+        
+        def timestamp(event) -> float:
+            return self.event_time(event, head)
+        
+        token = self.token_contract.address.lower()
+        pools = {address for address, pool in self.pools.pools.items() if pool.token.lower() == token}
+        self.candles.apply_events(events, timestamp, pools, self.bonding_curve.address)
     
     async def update_game_stats(self):
         """Update game statistics from the contracts"""
         logger.info("Updating game statistics")
+        started = time.monotonic()
         
         try:
+            # Read everything as one batch pinned to a single block
+            game_stats, pool_info, curve_state, hint_count, guess_cost, hint_cost = await asyncio.gather(
+                self.reader.call(self.jackpot_contract.functions.getGameStats()),
+                self.reader.call(self.bonding_curve.functions.getPoolInfo()),
+                CurveState.read(self.reader, self.bonding_curve),
+                self.reader.call(self.jackpot_contract.functions.hintCount()),
+                self.reader.call(self.jackpot_contract.functions.guessCost()),
+                self.reader.call(self.jackpot_contract.functions.hintCost()),
+                return_exceptions=True
+            )
+            
             # Get jackpot game stats
-            game_stats = await self.jackpot_contract.functions.getGameStats().call()
+            if isinstance(game_stats, Exception):
+                raise game_stats
             self.stats.total_guesses = game_stats[0]
             self.stats.unique_players = game_stats[1]
             self.stats.total_winners = game_stats[2]
             self.stats.jackpot_amount = self.w3.from_wei(game_stats[3], 'ether')
             
+            # Increases between refreshes are inflows; wins reset the jackpot and are tracked separately
+            if self.jackpot_baseline is not None and self.stats.jackpot_amount > self.jackpot_baseline:
+                self.analytics.add("jackpot_inflow", float(self.stats.jackpot_amount - self.jackpot_baseline))
+            self.jackpot_baseline = self.stats.jackpot_amount
+            
             # Get token price and liquidity
-            try:
-                pool_info = await self.bonding_curve.functions.getPoolInfo().call()
+            for result in (pool_info, curve_state):
+                if isinstance(result, Exception):
+                    logger.warning(f"Error getting token data: {result}")
+            if not isinstance(pool_info, Exception):
                 self.stats.liquidity = self.w3.from_wei(pool_info[1], 'ether')  # actualS
-                
-                current_price_wei = await self.bonding_curve.functions.getCurrentPrice().call()
-                self.stats.token_price = self.w3.from_wei(current_price_wei, 'ether')
-            except Exception as e:
-                logger.warning(f"Error getting token data: {e}")
+            if not isinstance(curve_state, Exception):
+                # Price and trade quotes come from the curve state, computed locally
+                try:
+                    pricer = CurvePricer(curve_state)
+                    self.stats.token_price = self.w3.from_wei(pricer.current_price(), 'ether')
+                    logger.info(f"Bonding curve quotes: {pricer.summary()}")
+                except ValueError as e:
+                    logger.warning(f"Error pricing bonding curve: {e}")
+            
+            # After graduation the token trades in its liquidity pool, mirrored in memory
+            pool = self.pools.pool_for(self.token_contract.address)
+            if pool is not None and (isinstance(curve_state, Exception) or curve_state.liquidity_pool_created):
+                if pool.price() is not None:
+                    self.stats.token_price = self.w3.from_wei(pool.price(), 'ether')
+                self.stats.liquidity = self.w3.from_wei(pool.s_reserve, 'ether')
+            if pool is not None:
+                logger.info(f"Liquidity pool {pool.address}: {pool.token_reserve / 10 ** 6:,.0f} 100X / " +
+                           f"{self.w3.from_wei(pool.s_reserve, 'ether'):,.4f} S, TVL {self.w3.from_wei(pool.tvl(), 'ether'):,.4f} S")
+            
+            # Compare the mirrored reserves with the chain at the last fully processed block
+            # (skipped while a batch is being dispatched, e.g. when a win handler refreshes stats)
+            if (self.pools.pools and self.ingestor.position is None and self.ingestor.next_block is not None
+                    and not self.dispatch_lock.locked()):
+                async with self.dispatch_lock:
+                    drifted = await self.pools.check_drift(self.ingestor.next_block - 1)
+                self.metrics.pool_drift.inc(drifted)
             
             # Get hint count
-            try:
-                self.stats.hint_count = await self.jackpot_contract.functions.hintCount().call()
-            except Exception as e:
-                logger.warning(f"Error getting hint count: {e}")
+            if isinstance(hint_count, Exception):
+                logger.warning(f"Error getting hint count: {hint_count}")
+            else:
+                self.stats.hint_count = hint_count
             
-            logger.info(f"Stats updated: {self.stats.total_guesses} guesses, " +
+            # Costs charged from now on in the player index's estimated 100X spent
+            if not isinstance(guess_cost, Exception):
+                self.players.guess_cost = guess_cost
+            if not isinstance(hint_cost, Exception):
+                self.players.hint_cost = hint_cost
+            
+            logger.info(f"Stats updated{self.label}: {self.stats.total_guesses} guesses, " +
                        f"{self.stats.unique_players} players, " +
                        f"{self.stats.total_winners} winners, " +
                        f"Jackpot: {self.stats.jackpot_amount:.2f} S")
             
+            top_hints = ", ".join(f"#{index} x{count}" for index, count in self.stats.hints_purchased.most_common(3))
+            logger.info(f"Hint purchases: {self.stats.total_hints_purchased} total ({top_hints or 'none'}), " +
+                       f"~{self.stats.players_seen.estimate()} distinct players seen since startup")
+            
+            # A host logs the shared transport once for all of its deployments
+            if self.host is None:
+                log_rpc_stats(self.reader, self.pool)
+            
             # Update last update time
             self.stats.last_update = time.time()
             
         except Exception as e:
             logger.error(f"Error updating game stats: {e}", exc_info=True)
+        
+        self.metrics.stats_refresh_seconds.observe(time.monotonic() - started)
     
     async def post_periodic_summary(self):
         """Post a periodic summary of game activity"""
@@ -417,23 +1060,39 @@ class JackpotAgent:
         
         logger.info("Generating periodic summary")
         
-        # Sort activities by time (newest first)
-        recent = sorted(
-            self.stats.recent_activities,
-            key=lambda x: x["timestamp"],
-            reverse=True
-        )[:10]  # Get 10 most recent activities
-        
         # Calculate time since last win
         time_since_last_win = "Never" if not self.stats.last_win_time else self.format_time_ago(self.stats.last_win_time)
         
+        # Windowed totals and trends come straight from the rolling counters
+        activity = self.analytics
+        guesses = int(activity.total("guesses", "4h"))
+        players = int(activity.total("new_players", "4h"))
+        hints = int(activity.total("hint_purchases", "4h"))
+        inflow = activity.total("jackpot_inflow", "4h")
+        
+        # All-time most active guesser from the player index
+        top_player = ""
+        leaders = self.players.top("guesses", 1)
+        if leaders:
+            top_player = f"Top guesser: {self.truncate_address(leaders[0][0])} ({leaders[0][1]} guesses)\n"
+        
+        # Last trade price and 24h change and volume from the hourly candles; the polled price until a trade
+        price = f"100X: {self.stats.token_price:.8f} S"
+        day = self.candles.window("1h", 24, time.time())
+        if day is not None and day["buys"] + day["sells"] > 0:
+            price = (f"100X: {day['close']:.8f} S ({day['change']:+.1%} 24h, {day['volume']:,.2f} S vol, " +
+                     f"{day['buys']} buys / {day['sells']} sells)")
+        
         # Create summary post
         summary = (
             f"📊 100x Jackpot Game Update 📊\n\n"
-            f"Current Jackpot: {self.stats.jackpot_amount:.2f} S\n"
-            f"Total Players: {self.stats.unique_players}\n"
-            f"Total Guesses: {self.stats.total_guesses}\n"
-            f"100X Price: {self.stats.token_price:.8f} S\n"
+            f"Current Jackpot: {self.stats.jackpot_amount:.2f} S (+{inflow:.2f} S in 4h)\n"
+            f"Last 4h: +{guesses} guesses ({activity.trend('guesses', '4h')}), "
+            f"+{players} players, {hints} hint buys ({activity.trend('hint_purchases', '4h')})\n"
+            f"Last 24h: {int(activity.total('guesses', '24h'))} guesses, "
+            f"{activity.rate('guesses', '1h'):.0f}/h now\n"
+            f"Players: {self.stats.unique_players} | {price}\n"
+            f"{top_player}"
             f"Last Win: {time_since_last_win}\n\n"
             f"#100xJackpot #DeFAI #CryptoGaming"
         )
@@ -441,43 +1100,41 @@ class JackpotAgent:
         # Post to social media
         await self.post_social_update(summary)
     
-    async def post_social_update(self, message: str):
-        """Post a message to Twitter using v2 API"""
+    async def post_social_update(self, message: str, kind: Optional[str] = None):
+        """Queue a message for Twitter and announce it on-chain
+        
+        Messages with a kind may be merged with other queued messages of the
+        same kind when the posting queue is backed up.
+        """
         # Log the message
-        logger.info(f"Social update: {message}")
+        logger.info(f"Social update{self.label}: {message}")
         
-        # Post to Twitter if available
-        if self.twitter:
-            try:
-                response = self.twitter.create_tweet(text=message)
-                logger.info(f"Tweet posted successfully! Tweet ID: {response.data['id']}")
-            except Exception as e:
-                logger.error(f"Error posting to Twitter: {e}")
+        # Hand off to the posting worker without blocking the event loop
+        self.social.submit(message, kind)
+        self.metrics.social_submitted.inc(kind=kind or "general")
         
         # Call the emitGameUpdate function on the jackpot contract if account is set up
-        if self.account:
-            try:
-                # Build transaction
-                tx = self.jackpot_contract.functions.emitGameUpdate(message[:100]).build_transaction({
-                    'from': self.account.address,
-                    'nonce': self.w3.eth.get_transaction_count(self.account.address),
-                    'gas': 200000,
-                    'gasPrice': self.w3.eth.gas_price
-                })
-                
-                # Sign and send transaction
-                signed_tx = self.w3.eth.account.sign_transaction(tx, self.account.key)
-                tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-                
-                logger.info(f"Called emitGameUpdate. Transaction hash: {tx_hash.hex()}")
-            except Exception as e:
-                logger.error(f"Error calling emitGameUpdate: {e}")
+        if self.tx_pipeline:
+            self.tx_pipeline.submit(message[:100])
         else:
             logger.info("No account configured, skipping on-chain emitGameUpdate call")
             
         # Track the last social post time
         self.last_social_post = time.time()
     
+    def format_hint_added_digest(self, messages: List) -> str:
+        """Merge several 'new hint' posts into one"""
+        return (
+            f"🔍 {len(messages)} new hints added to the 100x Jackpot game! "
+            f"Purchase them in-game to get closer to solving the secret! "
+            f"Current jackpot: {self.stats.jackpot_amount:.2f} S "
+            f"#100xJackpot #CryptoGame"
+        )
+    
+    def format_latest_digest(self, messages: List) -> str:
+        """Keep only the newest of several progress posts, which carries the latest totals"""
+        return messages[-1].text
+    
     def truncate_address(self, address: str) -> str:
         """Format an address for display (e.g., 0x1234...5678)"""
         if not address:
@@ -505,11 +1162,11 @@ class JackpotAgent:
 
 # Run the agent
 if __name__ == "__main__":
-    # Get RPC URL from environment or use default
-    rpc_url = os.getenv("RPC_URL", "https://rpc.sonic.fantom.network")
+    # Get RPC URLs from environment (comma-separated RPC_URLS, or RPC_URL) or use default
+    rpc_urls = os.getenv("RPC_URLS") or os.getenv("RPC_URL", "https://rpc.sonic.fantom.network")
     
     # Create and run the agent
-    agent = JackpotAgent(rpc_url)
+    agent = JackpotAgent([url.strip() for url in rpc_urls.split(",") if url.strip()])
     
     # Run the agent using asyncio
     loop = asyncio.get_event_loop()
@@ -0,0 +1,236 @@
+"""
+Precompiled log decoding for the 100x Jackpot DeFAI Agent
+
+web3's contract events resolve the ABI, rebuild decoders and wrap the result
+in nested AttributeDicts for every log. For catch-up and backfill that
+overhead dominates, so LogDecoder compiles each event once: topic0 maps to
+the event name, a ready-made eth_abi tuple decoder for the data section,
+converters for the indexed topics and a namedtuple class for the arguments.
+Decoding a log is then one dict lookup and one decoder call.
+
+Logs can be raw JSON-RPC dicts (hex strings) or web3-formatted log entries.
+"""
+
+import json
+import logging
+from collections import namedtuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from eth_abi.decoding import ContextFramesBytesIO
+from eth_abi.registry import registry
+from eth_utils import event_abi_to_log_topic, to_checksum_address
+from eth_utils.abi import collapse_if_tuple
+
+logger = logging.getLogger("100xJackpotAgent")
+
+
+@lru_cache(maxsize=4096)
+def checksum(address: str) -> str:
+    """Checksum an address; players repeat, so results are cached"""
+    return to_checksum_address(address)
+
+
+def to_bytes(value) -> bytes:
+    """Hex string or bytes-like to bytes"""
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:] if value.startswith("0x") else value)
+    return bytes(value)
+
+
+def to_int(value) -> int:
+    """Hex string or int to int"""
+    return int(value, 16) if isinstance(value, str) else value
+
+
+def to_hex(value) -> str:
+    """Hex string or bytes-like to 0x-prefixed hex"""
+    if isinstance(value, str):
+        return value
+    return "0x" + bytes(value).hex()
+
+
+def topic_converter(abi_type: str) -> Callable[[bytes], Any]:
+    """Build a converter for one indexed argument's 32-byte topic"""
+    if abi_type == "address":
+        return lambda topic: checksum("0x" + topic[12:].hex())
+    if abi_type.startswith("uint") and "[" not in abi_type:
+        return lambda topic: int.from_bytes(topic, "big")
+    if abi_type.startswith("int") and "[" not in abi_type:
+        return lambda topic: int.from_bytes(topic, "big", signed=True)
+    if abi_type == "bool":
+        return lambda topic: topic[-1] != 0
+    if abi_type.startswith("bytes") and abi_type != "bytes" and "[" not in abi_type:
+        size = int(abi_type[5:])
+        return lambda topic: topic[:size]
+    # Dynamic types (string, bytes, arrays, tuples) are indexed by their hash
+    return lambda topic: topic
+
+
+def decode_text(value: bytes) -> str:
+    """UTF-8 decode that tolerates malformed strings instead of dropping the log"""
+    return value.decode("utf-8", errors="replace")
+
+
+def value_normalizer(abi_type: str) -> Optional[Callable[[Any], Any]]:
+    """Normalize a decoded data value the way web3 does, or None if unchanged"""
+    if abi_type == "string":
+        return decode_text
+    if abi_type == "address":
+        return checksum
+    if abi_type.startswith("address[") and abi_type.count("[") == 1:
+        return lambda values: tuple(checksum(value) for value in values)
+    return None
+
+
+class EventArgs:
+    """Mixin for generated args namedtuples: also readable by ABI name, e.g. args["from"]"""
+    __slots__ = ()
+    _aliases: Dict[str, str] = {}
+    _names: Tuple[str, ...] = ()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return getattr(self, self._aliases[key])
+        return tuple.__getitem__(self, key)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._names
+
+
+def make_args_type(event_name: str, names: List[str]):
+    """namedtuple for an event's arguments; names that are Python keywords get positional aliases"""
+    base = namedtuple(f"{event_name}Args", names, rename=True)
+    return type(base.__name__, (EventArgs, base), {
+        "__slots__": (),
+        "_aliases": dict(zip(names, base._fields)),
+        "_names": tuple(names),
+    })
+
+
+class DecodedLog:
+    __slots__ = (
+        "event", "args", "address", "blockNumber", "logIndex",
+        "transactionHash", "transactionIndex", "blockHash", "blockTimestamp",
+    )
+
+    def __init__(self, event, args, address, block_number, log_index, transaction_hash, transaction_index, block_hash,
+                 block_timestamp=None):
+        self.event = event
+        self.args = args
+        self.address = address
+        self.blockNumber = block_number
+        self.logIndex = log_index
+        self.transactionHash = transaction_hash
+        self.transactionIndex = transaction_index
+        self.blockHash = block_hash
+        # Only set by nodes that include blockTimestamp in logs
+        self.blockTimestamp = block_timestamp
+
+    def __repr__(self) -> str:
+        return f"{self.event}({self.args!r} @ {self.blockNumber}:{self.logIndex})"
+
+
+class CompiledEvent:
+    __slots__ = ("name", "topic_count", "topic_converters", "data_decoder", "data_normalizers", "order", "args_type")
+
+    def __init__(self, event_abi: Dict):
+        self.name = event_abi["name"]
+        inputs = event_abi.get("inputs", [])
+        indexed = [item for item in inputs if item.get("indexed")]
+        data = [item for item in inputs if not item.get("indexed")]
+
+        self.topic_count = len(indexed) + 1
+        self.topic_converters = tuple(topic_converter(collapse_if_tuple(item)) for item in indexed)
+
+        data_types = [collapse_if_tuple(item) for item in data]
+        # Strings are read as bytes and decoded leniently by their normalizer
+        raw_types = ["bytes" if abi_type == "string" else abi_type for abi_type in data_types]
+        self.data_decoder = registry.get_tuple_decoder(*raw_types, strict=False) if raw_types else None
+        self.data_normalizers = tuple(value_normalizer(abi_type) for abi_type in data_types)
+
+        # Argument order in the ABI, as (from topics?, position) pairs
+        positions = {"topic": 0, "data": 0}
+        order = []
+        for item in inputs:
+            source = "topic" if item.get("indexed") else "data"
+            order.append((source == "topic", positions[source]))
+            positions[source] += 1
+        self.order = tuple(order)
+
+        self.args_type = make_args_type(self.name, [item["name"] for item in inputs])
+
+    def decode_args(self, topics: List, data: bytes):
+        """Decode indexed topics and the data section into the args namedtuple"""
+        indexed = [convert(to_bytes(topic)) for convert, topic in zip(self.topic_converters, topics[1:])]
+
+        if self.data_decoder is not None:
+            values = self.data_decoder(ContextFramesBytesIO(data))
+            values = [value if normalize is None else normalize(value)
+                      for value, normalize in zip(values, self.data_normalizers)]
+        else:
+            values = []
+
+        return self.args_type(*(indexed[position] if from_topic else values[position] for from_topic, position in self.order))
+
+
+class LogDecoder:
+    def __init__(self):
+        # topic0 -> compiled event, and the addresses allowed to emit it
+        self.table: Dict[bytes, CompiledEvent] = {}
+        self.emitters: Dict[bytes, set] = {}
+
+    def register_event(self, address: Optional[str], event_abi: Dict) -> bytes:
+        """Compile one event ABI; returns its topic0"""
+        topic = event_abi_to_log_topic(event_abi)
+        if topic not in self.table:
+            self.table[topic] = CompiledEvent(event_abi)
+            self.emitters[topic] = set()
+        if address is not None:
+            self.emitters[topic].add(address.lower())
+        return topic
+
+    def register_contract(self, address: Optional[str], abi: List[Dict]):
+        """Compile every event in a contract ABI"""
+        for item in abi:
+            if item.get("type") == "event" and not item.get("anonymous"):
+                self.register_event(address, item)
+
+    def decode(self, log) -> Optional[DecodedLog]:
+        """Decode a raw or web3-formatted log, or None if it is not a registered event"""
+        topics = log["topics"]
+        if not topics:
+            return None
+
+        topic = to_bytes(topics[0])
+        compiled = self.table.get(topic)
+        if compiled is None or len(topics) != compiled.topic_count:
+            return None
+
+        address = log["address"]
+        emitters = self.emitters[topic]
+        if emitters and address.lower() not in emitters:
+            return None
+
+        args = compiled.decode_args(topics, to_bytes(log["data"]))
+        return DecodedLog(
+            compiled.name,
+            args,
+            checksum(address),
+            to_int(log["blockNumber"]),
+            to_int(log["logIndex"]),
+            to_hex(log["transactionHash"]),
+            to_int(log["transactionIndex"]),
+            to_hex(log["blockHash"]),
+            to_int(log["blockTimestamp"]) if log.get("blockTimestamp") is not None else None,
+        )
+
+    @classmethod
+    def from_artifacts(cls, contracts: Dict[str, Tuple[Optional[str], str]]) -> "LogDecoder":
+        """Build a decoder from {name: (address, ABI JSON path)}; addresses may be None"""
+        decoder = cls()
+        for address, path in contracts.values():
+            with open(path, "r") as f:
+                abi = json.load(f)
+            decoder.register_contract(address, abi["abi"] if isinstance(abi, dict) else abi)
+        return decoder
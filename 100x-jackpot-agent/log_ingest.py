@@ -0,0 +1,288 @@
+"""
+Log ingestion for the 100x Jackpot DeFAI Agent
+
+Replaces the per-event node-side filters with a single eth_getLogs sweep per
+poll. Every subscribed event is covered by one topic0 OR-set, raw logs are
+decoded by a precompiled LogDecoder and returned in chain order, and the read
+cursor is kept locally so nothing depends on filter state held by the RPC node.
+
+The cursor can be persisted through a Checkpoint. After a restart the ingestor
+catches up from the saved position in adaptive-size block ranges and then
+keeps tailing the head with the same poll() call.
+
+Events pushed by a log stream are ahead of the cursor. Handling one never
+moves the cursor: the ingestor remembers its (block, logIndex), and the poll
+that reaches that block still returns the event, for state kept in chain
+order, while handled_by_stream() tells the caller not to dispatch it again.
+Streamed events are not saved in the checkpoint, so after a restart they
+are handled again.
+
+SharedLogIngestor runs that sweep once for several LogIngestors (one per game
+deployment): it queries the union of their addresses and topics, and each
+member decodes its own logs and keeps its own cursor and checkpoint.
+"""
+
+import logging
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from web3 import AsyncWeb3, Web3
+from web3.types import RPCEndpoint
+
+from checkpoint import Checkpoint
+from log_decoder import LogDecoder
+
+logger = logging.getLogger("100xJackpotAgent")
+
+# Substrings providers use when an eth_getLogs range or result set is too large
+RANGE_ERROR_MARKERS = (
+    "range", "too large", "too many", "more than", "limit exceeded",
+    "response size", "query timeout", "-32005",
+)
+
+
+def is_range_error(error: Exception) -> bool:
+    """Whether an eth_getLogs failure means the block range should shrink"""
+    message = str(error).lower()
+    return any(marker in message for marker in RANGE_ERROR_MARKERS)
+
+
+class LogIngestor:
+    def __init__(
+        self,
+        w3: AsyncWeb3,
+        start_block: Optional[int] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        max_chunk: int = 2000,
+        min_chunk: int = 1,
+        sparse_threshold: int = 500,
+        grow_after: int = 3,
+        save_interval: float = 1.0
+    ):
+        self.w3 = w3
+        self.checkpoint = checkpoint
+
+        # Next block to read; None means "start from the current head"
+        self.next_block = start_block
+
+        # Last processed (block, logIndex) inside an unfinished range
+        self.position: Optional[Tuple[int, int]] = None
+
+        # (block, logIndex) of events handled from the stream, at or after next_block
+        self.streamed: Set[Tuple[int, int]] = set()
+
+        # Resume from the durable cursor when one exists
+        saved = checkpoint.load() if checkpoint else None
+        if saved is not None:
+            block, log_index = saved
+            if log_index is None:
+                self.next_block = block + 1
+            else:
+                self.next_block = block
+                self.position = (block, log_index)
+            logger.info(f"Resuming log ingestion from block {self.next_block}")
+
+        # Adaptive eth_getLogs range size
+        self.max_chunk = max_chunk
+        self.min_chunk = min_chunk
+        self.chunk = max_chunk
+        self.sparse_threshold = sparse_threshold
+        self.grow_after = grow_after
+        self.sparse_streak = 0
+
+        # Checkpoint writes are throttled while events are being processed
+        self.save_interval = save_interval
+        self.last_save = 0.0
+        self.saved_cursor = saved
+
+        # Chain head seen by the most recent poll
+        self.head: Optional[int] = None
+
+        # Compiled topic0 -> event table; subscribe() adds to it
+        self.decoder = LogDecoder()
+        self.addresses: List[str] = []
+        self.topics: List[str] = []
+
+    @property
+    def caught_up(self) -> bool:
+        """Whether the cursor has reached the most recently seen head"""
+        return self.head is not None and self.next_block is not None and self.next_block > self.head
+
+    def subscribe(self, contract, event_name: str):
+        """Add a contract event to the sweep"""
+        event = contract.events[event_name]()
+        address = contract.address
+        topic = Web3.to_hex(self.decoder.register_event(address, event.abi))
+
+        if address not in self.addresses:
+            self.addresses.append(address)
+        if topic not in self.topics:
+            self.topics.append(topic)
+
+    async def fetch_range(self, from_block: int, to_block: int) -> List:
+        """Fetch and decode every subscribed log in [from_block, to_block]"""
+        # Raw request: the decoder works on hex fields, so web3's log formatting is skipped
+        response = await self.w3.provider.make_request(RPCEndpoint("eth_getLogs"), [{
+            'fromBlock': hex(from_block),
+            'toBlock': hex(to_block),
+            'address': self.addresses,
+            'topics': [self.topics]
+        }])
+        if "error" in response:
+            raise ValueError(response["error"])
+
+        decoded = [event for event in map(self.decode, response["result"]) if event is not None]
+
+        # Dispatch in chain order regardless of event type
+        decoded.sort(key=lambda event: (event.blockNumber, event.logIndex))
+
+        # Skip anything already handled before the last restart
+        if self.position is not None:
+            decoded = [event for event in decoded if (event.blockNumber, event.logIndex) > self.position]
+        return decoded
+
+    def handled_by_stream(self, event) -> bool:
+        """Whether a polled event was already dispatched from the stream"""
+        return (event.blockNumber, event.logIndex) in self.streamed
+
+    def covers(self, event) -> bool:
+        """Whether the cursor is already past an event, or the stream handled it"""
+        if self.next_block is not None and event.blockNumber < self.next_block:
+            return True
+        position = (event.blockNumber, event.logIndex)
+        return (self.position is not None and position <= self.position) or position in self.streamed
+
+    def accept(self, log):
+        """Decode a pushed raw log unless the cursor already covers it
+
+        A poll in progress can still deliver the same log, so the caller must
+        check covers() again once it holds the dispatch lock.
+        """
+        event = self.decode(log)
+        if event is None or self.covers(event):
+            return None
+        return event
+
+    def decode(self, log):
+        """Decode a raw log through the precompiled topic table"""
+        try:
+            return self.decoder.decode(log)
+        except Exception as e:
+            logger.warning(f"Could not decode log {log.get('transactionHash')}:{log.get('logIndex')}: {e}")
+            return None
+
+    async def poll(self) -> List:
+        """Return new subscribed events in chain order
+
+        While behind the head this returns one adaptive-size chunk per call;
+        once caught up each call covers everything up to the current head.
+        """
+        head = await self.w3.eth.block_number
+        self.head = head
+
+        if self.next_block is None:
+            # Behave like fromBlock='latest' on the first poll
+            self.next_block = head
+
+        if head < self.next_block:
+            return []
+
+        while True:
+            to_block = min(head, self.next_block + self.chunk - 1)
+            try:
+                events = await self.fetch_range(self.next_block, to_block)
+                break
+            except Exception as e:
+                if not is_range_error(e) or self.chunk <= self.min_chunk:
+                    raise
+                self.chunk = max(self.min_chunk, self.chunk // 2)
+                self.sparse_streak = 0
+                logger.info(f"eth_getLogs range too large, shrinking chunk to {self.chunk} blocks")
+
+        # Grow the range again after a few consecutive sparse chunks
+        if len(events) < self.sparse_threshold:
+            self.sparse_streak += 1
+            if self.sparse_streak >= self.grow_after and self.chunk < self.max_chunk:
+                self.chunk = min(self.max_chunk, self.chunk * 2)
+                self.sparse_streak = 0
+        else:
+            self.sparse_streak = 0
+
+        self.next_block = to_block + 1
+        return events
+
+    def receive(self, logs: List, to_block: int, head: int) -> List:
+        """Take raw logs fetched by a SharedLogIngestor through to_block; returns new events in chain order"""
+        self.head = head
+        if self.next_block is None:
+            self.next_block = head
+
+        events = [event for event in map(self.decode, logs) if event is not None and event.blockNumber >= self.next_block]
+        events.sort(key=lambda event: (event.blockNumber, event.logIndex))
+        if self.position is not None:
+            events = [event for event in events if (event.blockNumber, event.logIndex) > self.position]
+
+        self.next_block = max(self.next_block, to_block + 1)
+        return events
+
+    def advance(self, event):
+        """Record that every event up to and including this one has been handled
+
+        An event at or after next_block came from the stream, with older blocks
+        possibly still unread: it is only remembered, and the cursor stays put.
+        """
+        if self.next_block is None or event.blockNumber >= self.next_block:
+            self.streamed.add((event.blockNumber, event.logIndex))
+            return
+        self.position = (event.blockNumber, event.logIndex)
+        if self.checkpoint and time.monotonic() - self.last_save >= self.save_interval:
+            self.save()
+
+    def complete(self):
+        """Record that every block before next_block has been handled"""
+        if self.next_block is None:
+            return
+        self.position = None
+        self.streamed = {position for position in self.streamed if position[0] >= self.next_block}
+        if self.checkpoint:
+            self.save()
+
+    def save(self):
+        """Persist the current cursor if it moved"""
+        cursor = self.position if self.position is not None else (self.next_block - 1, None)
+        if cursor != self.saved_cursor:
+            self.checkpoint.save(*cursor)
+            self.saved_cursor = cursor
+        self.last_save = time.monotonic()
+
+
+class SharedLogIngestor(LogIngestor):
+    """One eth_getLogs sweep feeding several member ingestors"""
+
+    def __init__(self, w3: AsyncWeb3, members: List[LogIngestor], **kwargs):
+        super().__init__(w3, **kwargs)
+        self.members = members
+
+    async def fetch_range(self, from_block: int, to_block: int) -> List:
+        """Fetch raw logs for every member's addresses and topics; members decode them"""
+        self.addresses = list(dict.fromkeys(address for member in self.members for address in member.addresses))
+        self.topics = list(dict.fromkeys(topic for member in self.members for topic in member.topics))
+        response = await self.w3.provider.make_request(RPCEndpoint("eth_getLogs"), [{
+            'fromBlock': hex(from_block),
+            'toBlock': hex(to_block),
+            'address': self.addresses,
+            'topics': [self.topics]
+        }])
+        if "error" in response:
+            raise ValueError(response["error"])
+        return response["result"]
+
+    async def poll(self) -> Dict[LogIngestor, List]:
+        """Poll once for every member; returns each member's new events"""
+        # Resume from the member furthest behind; members starting at the head skip older logs
+        cursors = [member.next_block for member in self.members if member.next_block is not None]
+        self.next_block = min(cursors) if cursors else None
+
+        logs = await super().poll()
+        to_block = self.next_block - 1
+        return {member: member.receive(logs, to_block, self.head) for member in self.members}
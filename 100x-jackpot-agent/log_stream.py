@@ -0,0 +1,98 @@
+"""
+WebSocket log streaming for the 100x Jackpot DeFAI Agent
+
+Subscribes to eth_subscribe("logs") for every address and topic the
+LogIngestor covers, so events are handled as soon as their block is
+announced instead of on the next poll. After every (re)connect the gap since
+the ingestor's cursor is filled with a range query. While the socket is down
+the agent keeps using its normal polling path.
+
+Works against any node with WebSocket support, including a local Hardhat
+node (ws://127.0.0.1:8545).
+"""
+
+import asyncio
+import json
+import logging
+from typing import Awaitable, Callable, List
+
+import websockets
+
+from log_ingest import LogIngestor
+
+logger = logging.getLogger("100xJackpotAgent")
+
+
+class LogStream:
+    def __init__(
+        self,
+        ws_url: str,
+        ingestor: LogIngestor,
+        on_events: Callable[[List], Awaitable[None]],
+        on_connect: Callable[[], Awaitable[None]],
+        min_backoff: float = 1.0,
+        max_backoff: float = 60.0
+    ):
+        self.ws_url = ws_url
+        self.ingestor = ingestor
+        self.on_events = on_events
+        self.on_connect = on_connect
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+
+        self.connected = False
+        self.reconnects = 0
+
+    async def run(self):
+        """Stream logs forever, reconnecting with exponential backoff"""
+        backoff = self.min_backoff
+        while True:
+            try:
+                await self.stream()
+                backoff = self.min_backoff
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self.connected or self.reconnects == 0:
+                    logger.warning(f"Log stream unavailable ({e}), falling back to polling")
+            finally:
+                self.connected = False
+
+            self.reconnects += 1
+            await asyncio.sleep(backoff)
+            backoff = min(self.max_backoff, backoff * 2)
+
+    async def stream(self):
+        """Hold one subscription open until the connection drops"""
+        async with websockets.connect(self.ws_url, max_size=None) as ws:
+            await ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "eth_subscribe",
+                "params": ["logs", {"address": self.ingestor.addresses, "topics": [self.ingestor.topics]}]
+            }))
+            response = json.loads(await ws.recv())
+            if "error" in response:
+                raise ConnectionError(response["error"].get("message", response["error"]))
+            subscription = response["result"]
+
+            self.connected = True
+            logger.info(f"Streaming logs from {self.ws_url}")
+
+            # Fill whatever was missed while disconnected
+            await self.on_connect()
+
+            async for message in ws:
+                notification = json.loads(message)
+                params = notification.get("params", {})
+                if notification.get("method") != "eth_subscription" or params.get("subscription") != subscription:
+                    continue
+
+                log = params["result"]
+                if log.get("removed"):
+                    logger.warning(f"Ignoring log removed by a reorg in block {int(log['blockNumber'], 16)}")
+                    continue
+
+                event = self.ingestor.accept(log)
+                if event is not None:
+                    await self.on_events([event])
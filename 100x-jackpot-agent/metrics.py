@@ -0,0 +1,286 @@
+"""
+Prometheus metrics for the 100x Jackpot DeFAI Agent
+
+A small self-contained implementation of counters, gauges and histograms
+rendered in the Prometheus text exposition format, plus an aiohttp server
+that serves them on /metrics. AgentMetrics defines everything the agent
+reports: ingestion lag, RPC latency and errors per method, events and
+handler time per event type, social posting, emitGameUpdate confirmation
+latency, hint endpoint responses and scheduled job timing.
+"""
+
+import logging
+import math
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from aiohttp import web
+
+logger = logging.getLogger("100xJackpotAgent")
+
+# Default latency buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Transaction confirmation buckets in seconds
+CONFIRM_BUCKETS = (1, 2, 5, 10, 20, 30, 60, 120, 300, 600)
+
+
+def format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for value in values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[Tuple[str, Sequence[str], Sequence[str], float]]:
+        """(suffix, label names, label values, value) for every series"""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, names, values, value in self.samples():
+            lines.append(f"{self.name}{suffix}{format_labels(names, values)} {format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+        self.function: Optional[Callable[[], float]] = None
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self.key(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def set_function(self, function: Callable[[], float]):
+        """Read the (unlabelled) total from an existing counter at scrape time"""
+        self.function = function
+
+    def samples(self):
+        if self.function is not None:
+            return [("_total", (), (), self.function())]
+        return [("_total", self.labelnames, key, value) for key, value in self.values.items()]
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+        self.function: Optional[Callable[[], Optional[float]]] = None
+
+    def set(self, value: float, **labels):
+        self.values[self.key(labels)] = value
+
+    def set_function(self, function: Callable[[], Optional[float]]):
+        """Compute the (unlabelled) value at scrape time; None means no sample"""
+        self.function = function
+
+    def samples(self):
+        if self.function is not None:
+            value = self.function()
+            return [] if value is None else [("", (), (), value)]
+        return [("", self.labelnames, key, value) for key, value in self.values.items()]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # labels -> (per-bucket counts, sum, count)
+        self.series: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, **labels):
+        key = self.key(labels)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = [[0] * len(self.buckets), 0.0, 0]
+        counts = series[0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        series[1] += value
+        series[2] += 1
+
+    def samples(self):
+        samples = []
+        names = self.labelnames + ("le",)
+        for key, (counts, total, count) in self.series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                samples.append(("_bucket", names, key + (format_value(bound),), cumulative))
+            samples.append(("_sum", self.labelnames, key, total))
+            samples.append(("_count", self.labelnames, key, count))
+        return samples
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self.metrics) + "\n"
+
+
+class StartupTimer:
+    """Cold-start phases in seconds, each measured from the end of the previous one"""
+
+    def __init__(self, started: float):
+        self.started = started
+        self.last = started
+        self.phases: Dict[str, float] = {}
+        self.first_event: Optional[float] = None
+
+    def mark(self, phase: str):
+        """Close a phase that ended now"""
+        now = time.perf_counter()
+        self.phases[phase] = now - self.last
+        self.last = now
+
+    def event_seen(self):
+        """Record time to first event on the first call"""
+        if self.first_event is None:
+            self.first_event = time.perf_counter() - self.started
+
+    def summary(self) -> str:
+        phases = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in self.phases.items())
+        first = f"{self.first_event:.2f}s" if self.first_event is not None else "none yet"
+        return f"{phases}; ready after {self.last - self.started:.2f}s, first event after {first}"
+
+
+class AgentMetrics:
+    def __init__(self):
+        self.registry = Registry()
+        register = self.registry.register
+
+        # Ingestion
+        self.head_block = register(Gauge("jackpot_head_block", "Latest chain head seen by the agent"))
+        self.processed_block = register(Gauge("jackpot_processed_block", "Last block whose events were fully handled"))
+        self.ingestion_lag = register(Gauge("jackpot_ingestion_lag_blocks", "Head block minus last processed block"))
+        self.events = register(Counter("jackpot_events_processed", "Events handled, by type", ["event"]))
+        self.handler_seconds = register(Histogram("jackpot_handler_seconds", "Event handler duration", ["event"]))
+        self.handler_errors = register(Counter("jackpot_handler_errors", "Event handlers that raised", ["event"]))
+
+        # RPC
+        self.rpc_seconds = register(Histogram("jackpot_rpc_request_seconds", "RPC request latency including failover", ["method"]))
+        self.rpc_errors = register(Counter("jackpot_rpc_errors", "RPC requests that failed on every endpoint", ["method"]))
+        self.stats_refresh_seconds = register(Histogram("jackpot_stats_refresh_seconds", "update_game_stats duration"))
+        self.pool_drift = register(Counter("jackpot_pool_drift", "Mirrored liquidity pools found out of sync with the chain"))
+        self.startup_seconds = register(Gauge("jackpot_startup_seconds", "Cold-start duration, by phase", ["phase"]))
+
+        # Scheduled jobs and adaptive polling
+        self.job_seconds = register(Histogram("jackpot_job_seconds", "Scheduled job run duration", ["job"]))
+        self.job_overruns = register(Counter("jackpot_job_overruns", "Scheduled runs that exceeded their deadline", ["job"]))
+        self.job_missed = register(Counter("jackpot_job_missed", "Scheduled runs skipped because a job or the event loop fell behind", ["job"]))
+        self.poll_interval = register(Gauge("jackpot_poll_interval_seconds", "Current log poll interval"))
+        self.block_time = register(Gauge("jackpot_block_time_seconds", "Observed average block time"))
+
+        # Social posting
+        self.social_submitted = register(Counter("jackpot_social_submitted", "Social updates submitted, by kind", ["kind"]))
+        self.social_queue_depth = register(Gauge("jackpot_social_queue_depth", "Posts waiting to be sent"))
+        self.social_posted = register(Counter("jackpot_social_posted", "Posts sent successfully"))
+        self.social_failed = register(Counter("jackpot_social_failed", "Posts that failed"))
+        self.social_dropped = register(Counter("jackpot_social_dropped", "Posts dropped because the queue was full"))
+        self.social_rate_limit_waits = register(Counter("jackpot_social_rate_limit_waits", "Times posting waited for the rate limit"))
+
+        # Hint access endpoint
+        self.hint_requests = register(Counter("jackpot_hint_requests", "Hint endpoint responses, by result", ["result"]))
+        self.hint_lookups = register(Counter("jackpot_hint_lookups", "hasAccessToHint reads for players not yet indexed"))
+
+        # emitGameUpdate transactions
+        self.tx_confirm_seconds = register(Histogram(
+            "jackpot_tx_confirm_seconds", "emitGameUpdate submit-to-inclusion latency", buckets=CONFIRM_BUCKETS
+        ))
+        self.tx_sent = register(Counter("jackpot_tx_sent", "emitGameUpdate transactions sent"))
+        self.tx_failed = register(Counter("jackpot_tx_failed", "emitGameUpdate transactions that could not be sent"))
+        self.tx_repriced = register(Counter("jackpot_tx_repriced", "Stuck emitGameUpdate transactions re-priced"))
+
+    def observe_rpc(self, method: str, seconds: float, ok: bool):
+        """RpcPool observer callback"""
+        self.rpc_seconds.observe(seconds, method=method)
+        if not ok:
+            self.rpc_errors.inc(method=method)
+
+    def observe_blocks(self, head: Optional[int], processed: Optional[int]):
+        """Record the head and the last fully processed block"""
+        if head is not None:
+            self.head_block.set(head)
+        if processed is not None:
+            self.processed_block.set(processed)
+        if head is not None and processed is not None:
+            self.ingestion_lag.set(max(0, head - processed))
+
+    def observe_job(self, job: str, seconds: float, overran: bool, missed: int):
+        """Scheduler observer callback"""
+        self.job_seconds.observe(seconds, job=job)
+        if overran:
+            self.job_overruns.inc(job=job)
+        if missed:
+            self.job_missed.inc(missed, job=job)
+
+    def observe_startup(self, timer: StartupTimer):
+        """Publish a finished startup breakdown"""
+        for phase, seconds in timer.phases.items():
+            self.startup_seconds.set(seconds, phase=phase)
+        if timer.first_event is not None:
+            self.startup_seconds.set(timer.first_event, phase="first_event")
+
+    def render(self) -> str:
+        return self.registry.render()
+
+
+class MetricsServer:
+    def __init__(self, metrics: AgentMetrics, host: str = "127.0.0.1", port: int = 9108):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.runner: Optional[web.AppRunner] = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        return web.Response(
+            text=self.metrics.render(),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+        )
+
+    async def start(self):
+        """Serve /metrics in the background"""
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
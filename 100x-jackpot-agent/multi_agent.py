@@ -0,0 +1,271 @@
+"""
+Multi-deployment mode for the 100x Jackpot DeFAI Agent
+
+Runs one JackpotAgent per game deployment inside a single process. Every
+deployment keeps its own stats, posting queue, Twitter account, agent key,
+event store and durable cursor, but they share one RPC pool, one batched
+reader and one eth_getLogs sweep over the combined address filter, so RPC
+cost grows with the number of blocks rather than the number of games.
+
+Large deployment lists can be spread over worker processes. Each worker owns
+the deployments a consistent-hash ring assigns to it, and because cursors
+are per deployment, a deployment that moves to another worker after a
+resize resumes from its own checkpoint there.
+
+Usage: python multi_agent.py --deployments deployments.json [--workers 4] [--shard 0]
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from typing import List, Union
+
+# Cold-start reference point for the startup breakdown, taken before the heavy imports
+STARTED = time.perf_counter()
+
+import aiohttp
+from web3 import AsyncWeb3
+
+from deployments import Deployment, HashRing, load_deployments
+from jackpot_agent import (
+    LOGS_MAX_CHUNK, METRICS_HOST, METRICS_PORT, MULTICALL_ADDRESS, POLL_BACKOFF, POLL_DEADLINE, POLL_INTERVAL,
+    POLL_MAX_INTERVAL, POLL_MIN_INTERVAL, RPC_HEDGE, RPC_MAX_BLOCK_LAG, RPC_MAX_CONCURRENCY, SCHEDULER_JITTER,
+    STATE_SNAPSHOT_INTERVAL, STATS_DEADLINE, STATS_INTERVAL, JackpotAgent, log_rpc_stats,
+)
+from log_ingest import SharedLogIngestor
+from metrics import AgentMetrics, MetricsServer, StartupTimer
+from read_batcher import ReadBatcher
+from rpc_pool import PooledProvider, RpcPool
+from scheduler import PollPacer, Scheduler
+
+logger = logging.getLogger("100xJackpotAgent")
+
+# Deployments file and worker count defaults
+DEPLOYMENTS_FILE = os.getenv("DEPLOYMENTS_FILE", "deployments.json")
+AGENT_WORKERS = int(os.getenv("AGENT_WORKERS", "1"))
+
+# Directory for per-deployment checkpoints and event stores
+AGENT_STATE_DIR = os.getenv("AGENT_STATE_DIR", ".")
+
+
+class MultiAgent:
+    def __init__(
+        self,
+        rpc_urls: Union[str, List[str]],
+        deployments: List[Deployment],
+        max_concurrency: int = RPC_MAX_CONCURRENCY,
+        metrics_port: int = METRICS_PORT
+    ):
+        if not deployments:
+            raise ValueError("MultiAgent needs at least one deployment")
+
+        # Cold-start breakdown shared by every hosted deployment
+        self.cold_start = StartupTimer(STARTED)
+        self.cold_start.mark("import")
+
+        # Shared transport; the RPC pool and its HTTP session are attached in start()
+        self.rpc_urls = [rpc_urls] if isinstance(rpc_urls, str) else list(rpc_urls)
+        self.max_concurrency = max_concurrency
+        self.session = None
+        self.pool = None
+        self.reader = None
+        self.provider = PooledProvider()
+        self.w3 = AsyncWeb3(self.provider)
+
+        # Ingestion and RPC metrics for the whole process
+        self.metrics = AgentMetrics()
+        self.metrics_port = metrics_port
+        self.metrics_server = None
+
+        # One agent per deployment, each with its own cursor inside the shared sweep
+        self.agents = [JackpotAgent(self.rpc_urls, max_concurrency, deployment, host=self) for deployment in deployments]
+        self.ingestor = SharedLogIngestor(self.w3, [agent.ingestor for agent in self.agents], max_chunk=LOGS_MAX_CHUNK)
+
+        # The shared sweep is paced by activity across every deployment
+        self.pacer = PollPacer(POLL_MIN_INTERVAL, POLL_MAX_INTERVAL, POLL_INTERVAL, POLL_BACKOFF)
+        self.scheduler = Scheduler(SCHEDULER_JITTER, observer=self.metrics.observe_job)
+        self.metrics.poll_interval.set_function(self.pacer.interval)
+        self.metrics.block_time.set_function(lambda: self.pacer.block_time)
+        self.cold_start.mark("init")
+
+        logger.info(f"Multi-deployment agent hosting {len(self.agents)} deployment(s): " +
+                   ", ".join(agent.deployment.name for agent in self.agents))
+
+    async def start(self):
+        """Open the shared RPC session, then start every deployment on it"""
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+
+        self.pool = RpcPool(
+            self.rpc_urls,
+            self.session,
+            hedge=RPC_HEDGE,
+            max_block_lag=RPC_MAX_BLOCK_LAG,
+            observer=self.metrics.observe_rpc
+        )
+        self.provider.pool = self.pool
+
+        # The health probe doubles as the connection check and the first head
+        await self.pool.check_health()
+        if self.pool.highest_block is None:
+            raise ConnectionError(f"Failed to connect to RPC: {', '.join(self.rpc_urls)}")
+        self.pool.start()
+
+        # Reads from every deployment queued in the same tick go out as one batch
+        self.reader = ReadBatcher(self.pool, MULTICALL_ADDRESS)
+        self.reader.set_head(self.pool.highest_block)
+
+        if self.metrics_port:
+            self.metrics_server = MetricsServer(self.metrics, METRICS_HOST, self.metrics_port)
+
+        await asyncio.gather(
+            *(agent.start() for agent in self.agents),
+            *([self.metrics_server.start()] if self.metrics_server else []),
+        )
+
+        logger.info(f"Connected to blockchain via {len(self.rpc_urls)} endpoint(s) (max {self.max_concurrency} concurrent requests)")
+
+    async def close(self):
+        """Stop every deployment and close the shared RPC session"""
+        await asyncio.gather(*(agent.close() for agent in self.agents))
+
+        if self.pool is not None:
+            await self.pool.stop()
+
+        if self.metrics_server is not None:
+            await self.metrics_server.stop()
+            self.metrics_server = None
+
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def check_contract_events(self):
+        """Poll once for all deployments and hand each its own events"""
+        try:
+            batches = await self.ingestor.poll()
+        except Exception as e:
+            logger.error(f"Error checking contract events: {e}", exc_info=True)
+            return
+
+        async def dispatch(agent: JackpotAgent):
+            async with agent.dispatch_lock:
+                await agent.handle_polled_events(batches[agent.ingestor])
+
+        await asyncio.gather(*(dispatch(agent) for agent in self.agents))
+        self.metrics.observe_blocks(self.ingestor.head, self.ingestor.next_block - 1)
+        self.pacer.observe(self.ingestor.head, sum(len(events) for events in batches.values()))
+
+    async def catch_up(self):
+        """Poll repeatedly until the shared cursor reaches the chain head"""
+        while True:
+            next_block = self.ingestor.next_block
+            await self.check_contract_events()
+            if self.ingestor.caught_up or self.ingestor.next_block == next_block:
+                return
+            logger.info(f"Catching up: processed up to block {self.ingestor.next_block - 1} of {self.ingestor.head}")
+
+    async def update_game_stats(self):
+        """Refresh every deployment's stats; their reads share batches"""
+        await asyncio.gather(*(agent.update_game_stats() for agent in self.agents))
+        log_rpc_stats(self.reader, self.pool)
+
+    async def refresh_game_stats(self):
+        """Scheduled stats refresh for every deployment"""
+        await asyncio.gather(*(agent.refresh_game_stats() for agent in self.agents))
+        log_rpc_stats(self.reader, self.pool)
+
+    async def run(self):
+        """Main loop: one shared poll per cycle, periodic work per deployment"""
+        logger.info("Starting multi-deployment Jackpot Agent")
+
+        await self.start()
+        self.cold_start.mark("start")
+
+        await asyncio.gather(self.update_game_stats(), self.catch_up())
+        self.cold_start.mark("stats_and_catch_up")
+        self.metrics.observe_startup(self.cold_start)
+        logger.info(f"Cold start: {self.cold_start.summary()}")
+
+        for agent in self.agents:
+            await agent.post_social_update(
+                f"🚀 100x Jackpot DeFAI Agent is now active! Current jackpot: {agent.stats.jackpot_amount:.2f} S. "
+                f"Will you solve the secret and win? #100xJackpot #DeFAI"
+            )
+
+        # One shared poll and one stats refresh for every deployment; summaries follow each deployment's posts
+        self.scheduler.every("poll", self.pacer.interval, self.catch_up, deadline=POLL_DEADLINE)
+        self.scheduler.every("stats", STATS_INTERVAL, self.refresh_game_stats, deadline=STATS_DEADLINE)
+        for agent in self.agents:
+            self.scheduler.every(f"summary:{agent.deployment.name}", agent.summary_delay, agent.periodic_summary, jitter=0)
+            self.scheduler.every(f"snapshot:{agent.deployment.name}", STATE_SNAPSHOT_INTERVAL, agent.snapshot_state)
+
+        try:
+            await self.scheduler.run()
+        except Exception as e:
+            logger.error(f"Error in main loop: {e}", exc_info=True)
+        finally:
+            await self.scheduler.stop()
+            await self.close()
+
+
+def run_shard(rpc_urls: List[str], deployments_file: str, workers: int, shard: int):
+    """Run the deployments the hash ring assigns to one shard"""
+    deployments = HashRing(range(workers)).assign(load_deployments(deployments_file, AGENT_STATE_DIR))[shard]
+    if not deployments:
+        logger.warning(f"Shard {shard}/{workers} has no deployments")
+        return
+
+    # Workers on one host serve metrics on consecutive ports
+    agent = MultiAgent(rpc_urls, deployments, metrics_port=METRICS_PORT + shard if METRICS_PORT else 0)
+    try:
+        asyncio.run(agent.run())
+    except KeyboardInterrupt:
+        logger.info(f"Shard {shard} stopped by user")
+
+
+def main(args):
+    rpc_urls = [url.strip() for url in args.rpc_urls.split(",") if url.strip()]
+
+    if args.shard is not None or args.workers == 1:
+        run_shard(rpc_urls, args.deployments, args.workers, args.shard or 0)
+        return
+
+    for shard, deployments in HashRing(range(args.workers)).assign(load_deployments(args.deployments, AGENT_STATE_DIR)).items():
+        logger.info(f"Shard {shard}: {', '.join(deployment.name for deployment in deployments) or 'no deployments'}")
+
+    # Each worker re-reads the deployments file and keeps only its own share
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=run_shard, args=(rpc_urls, args.deployments, args.workers, shard), name=f"shard-{shard}")
+        for shard in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        logger.info("Stopping workers")
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monitor several 100x Jackpot deployments from one agent")
+    parser.add_argument("--rpc-urls", default=os.getenv("RPC_URLS") or os.getenv("RPC_URL", "https://rpc.sonic.fantom.network"))
+    parser.add_argument("--deployments", default=DEPLOYMENTS_FILE, help="JSON list of deployments")
+    parser.add_argument("--workers", type=int, default=AGENT_WORKERS, help="worker processes to spread deployments over")
+    parser.add_argument("--shard", type=int, help="run only this worker's share (e.g. one shard per host)")
+    args = parser.parse_args()
+    if args.workers < 1 or (args.shard is not None and not 0 <= args.shard < args.workers):
+        parser.error("--shard must be between 0 and --workers - 1")
+    main(args)
@@ -0,0 +1,366 @@
+"""
+Per-player index for the 100x Jackpot DeFAI Agent
+
+PlayerIndex keeps what every player has done: guesses, hints bought, wins,
+100X spent on guesses and hints, S won, and the blocks a player was first
+and last seen in. Each address maps to a dense integer id, and every figure
+is a NumPy column indexed by that id, so a player costs about 70 bytes
+instead of a dict of dicts:
+- 20 for the address;
+- 36 for the columns;
+- 8-16 for an open-addressing id table;
+- 8 per ranked column once it has been queried.
+
+Columns grow by doubling, so up to half of the capacity can be unused.
+
+100X spent is an estimate. setCosts() emits no event, so every guess and
+hint is charged at the guessCost/hintCost the agent last read, not the cost
+in force at its block: the contract defaults until the first read (the
+startup replay from the event store included, unless a snapshot carries
+later costs), and the new costs for every event applied after a change.
+
+top() answers leaderboard queries in O(k log n). Each ranked column gets a
+tournament tree the first time it is queried: an array of ids where every
+node holds the leader of its subtree. An update repairs the path from the
+player's leaf, usually stopping a few levels up. A query walks the tree
+best-first.
+
+The index is updated from NewPlayer, GuessRevealed, HintRequested and
+JackpotWon events, remembers the position of the last event applied so a
+replayed event is not counted twice, and snapshots to a single .npz file.
+Events must arrive in chain order, from polls or the event store: one
+applied out of order hides every older event.
+
+Usage: python player_index.py agent_players.npz [--top 10] [--by guesses]
+"""
+
+import argparse
+import heapq
+import logging
+import os
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+from eth_utils import to_checksum_address
+
+logger = logging.getLogger("100xJackpotAgent")
+
+# Column -> dtype; blocks fit uint32 for centuries of one-second blocks
+COLUMNS = {
+    "guesses": np.uint32,
+    "hints": np.uint32,
+    "wins": np.uint32,
+    "spent": np.uint64,  # 100X base units (6 decimals) paid for guesses and hints, estimated
+    "won": np.float64,  # S won
+    "first_seen": np.uint32,
+    "last_seen": np.uint32,
+}
+
+# Columns top() can rank
+RANKED = ("guesses", "hints", "wins", "spent", "won", "last_seen")
+
+# Events that update the index
+PLAYER_EVENTS = ("NewPlayer", "GuessRevealed", "HintRequested", "JackpotWon")
+
+# JackpotGame.sol defaults, used until the agent reads guessCost/hintCost
+GUESS_COST = 10_000 * 10 ** 6
+HINT_COST = 5_000 * 10 ** 6
+
+SNAPSHOT_VERSION = 1
+
+
+def address_key(address: str) -> bytes:
+    """The 20 raw bytes of a hex address"""
+    return bytes.fromhex(address[2:] if address.startswith(("0x", "0X")) else address)
+
+
+class TopTree:
+    """Tournament tree over one column; tree[node] is the id leading that subtree, -1 if empty"""
+
+    def __init__(self, values: np.ndarray, size: int):
+        self.values = values
+        self.leaves = 1 << max(0, (len(values) - 1).bit_length())
+        self.tree = np.full(2 * self.leaves, -1, dtype=np.int32)
+        self.tree[self.leaves:self.leaves + size] = np.arange(size, dtype=np.int32)
+        self.rebuild()
+
+    def rebuild(self):
+        """Fill every internal node bottom-up, one vectorized pass per level"""
+        values, tree = self.values, self.tree
+        width = self.leaves
+        while width > 1:
+            children = tree[width:2 * width]
+            left, right = children[0::2], children[1::2]
+            left_values = values[np.maximum(left, 0)]
+            right_values = values[np.maximum(right, 0)]
+            # Ties go to the lower id, which is always on the left
+            take_right = (right >= 0) & ((left < 0) | (right_values > left_values))
+            tree[width // 2:width] = np.where(take_right, right, left)
+            width //= 2
+
+    def better(self, a: int, b: int) -> int:
+        if a < 0:
+            return b
+        if b < 0:
+            return a
+        value_a, value_b = self.values[a], self.values[b]
+        if value_b > value_a or (value_b == value_a and b < a):
+            return b
+        return a
+
+    def add(self, player_id: int):
+        """Place a new id at its leaf"""
+        self.tree[self.leaves + player_id] = player_id
+        self.update(player_id)
+
+    def update(self, player_id: int):
+        """Repair the path above a player whose value went up"""
+        tree = self.tree
+        node = (self.leaves + player_id) >> 1
+        while node:
+            leader = self.better(int(tree[2 * node]), int(tree[2 * node + 1]))
+            previous = int(tree[node])
+            if leader == previous and leader != player_id:
+                # This subtree's leader and its value are unchanged, so nothing above changes
+                return
+            tree[node] = leader
+            node >>= 1
+
+    def top(self, count: int) -> List[int]:
+        """Ids of the count largest values, best first"""
+        tree, values = self.tree, self.values
+        found: List[int] = []
+        root = int(tree[1]) if len(tree) > 1 else -1
+        if root < 0:
+            return found
+        heap = [(-values[root].item(), root, 1)]
+        while heap and len(found) < count:
+            _, player_id, node = heapq.heappop(heap)
+            if node >= self.leaves:
+                found.append(player_id)
+                continue
+            for child in (2 * node, 2 * node + 1):
+                child_id = int(tree[child])
+                if child_id >= 0:
+                    heapq.heappush(heap, (-values[child_id].item(), child_id, child))
+        return found
+
+
+class PlayerIndex:
+    def __init__(self, capacity: int = 1024, guess_cost: int = GUESS_COST, hint_cost: int = HINT_COST):
+        # A power of two, so the id table can be probed with a mask
+        capacity = 1 << max(4, (capacity - 1).bit_length())
+        self.size = 0
+        self.addresses = np.zeros(capacity, dtype="S20")
+        self.columns: Dict[str, np.ndarray] = {name: np.zeros(capacity, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+        # Open addressing, linear probing: slot -> player id, -1 when empty; kept at most half full
+        self.slots = np.full(2 * capacity, -1, dtype=np.int32)
+
+        # Tournament trees for the ranked columns queried so far
+        self.trees: Dict[str, TopTree] = {}
+
+        # Costs charged per guess and hint, in 100X base units
+        self.guess_cost = guess_cost
+        self.hint_cost = hint_cost
+
+        # (block, logIndex) of the last event applied
+        self.position: Optional[Tuple[int, int]] = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def capacity(self) -> int:
+        return len(self.addresses)
+
+    def nbytes(self) -> int:
+        """Memory held by the arrays"""
+        arrays = [self.addresses, self.slots, *self.columns.values(), *(tree.tree for tree in self.trees.values())]
+        return sum(array.nbytes for array in arrays)
+
+    def find_slot(self, key: bytes) -> Tuple[int, int]:
+        """(slot, player id) for an address; id -1 and the empty slot it would take when unknown"""
+        slots, addresses = self.slots, self.addresses
+        mask = len(slots) - 1
+        # NumPy drops trailing zero bytes when reading an S20 element back
+        stored = key.rstrip(b"\x00")
+        slot = hash(key) & mask
+        while True:
+            player_id = int(slots[slot])
+            if player_id < 0 or addresses[player_id] == stored:
+                return slot, player_id
+            slot = (slot + 1) & mask
+
+    def id_of(self, address: str) -> Optional[int]:
+        player_id = self.find_slot(address_key(address))[1]
+        return player_id if player_id >= 0 else None
+
+    def add(self, address: str, block: int) -> int:
+        """The id of an address, adding the player as first seen at block if new"""
+        key = address_key(address)
+        slot, player_id = self.find_slot(key)
+        if player_id >= 0:
+            return player_id
+
+        if self.size == self.capacity:
+            self.grow()
+            slot = self.find_slot(key)[0]
+        player_id = self.size
+        self.size += 1
+        self.addresses[player_id] = key
+        self.slots[slot] = player_id
+        self.columns["first_seen"][player_id] = block
+        self.columns["last_seen"][player_id] = block
+        for tree in self.trees.values():
+            tree.add(player_id)
+        return player_id
+
+    def grow(self):
+        """Double every column and rehash"""
+        capacity = 2 * self.capacity
+        addresses = np.zeros(capacity, dtype="S20")
+        addresses[:self.size] = self.addresses[:self.size]
+        self.addresses = addresses
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self.columns[name] = grown
+        self.rehash()
+        for name in self.trees:
+            self.trees[name] = TopTree(self.columns[name], self.size)
+
+    def rehash(self):
+        self.slots = np.full(2 * self.capacity, -1, dtype=np.int32)
+        mask = len(self.slots) - 1
+        slots = self.slots
+        for player_id, stored in enumerate(self.addresses[:self.size].tolist()):
+            slot = hash(stored.ljust(20, b"\x00")) & mask
+            while slots[slot] >= 0:
+                slot = (slot + 1) & mask
+            slots[slot] = player_id
+
+    def bump(self, player_id: int, column: str, amount):
+        """Add to one column and keep its leaderboard current"""
+        self.columns[column][player_id] += amount
+        tree = self.trees.get(column)
+        if tree is not None:
+            tree.update(player_id)
+
+    def apply(self, event_name: str, args: Mapping, block: int, log_index: int) -> bool:
+        """Apply one player event; False if it was already applied or is not a player event"""
+        if event_name not in PLAYER_EVENTS:
+            return False
+        position = (block, log_index)
+        if self.position is not None and position <= self.position:
+            return False
+        self.position = position
+
+        player_id = self.add(args["winner"] if event_name == "JackpotWon" else args["player"], block)
+        if block > self.columns["last_seen"][player_id]:
+            self.bump(player_id, "last_seen", block - int(self.columns["last_seen"][player_id]))
+
+        if event_name == "GuessRevealed":
+            self.bump(player_id, "guesses", 1)
+            self.bump(player_id, "spent", self.guess_cost)
+        elif event_name == "HintRequested":
+            self.bump(player_id, "hints", 1)
+            self.bump(player_id, "spent", self.hint_cost)
+        elif event_name == "JackpotWon":
+            self.bump(player_id, "wins", 1)
+            self.bump(player_id, "won", int(args["amount"]) / 10 ** 18)
+        return True
+
+    def apply_events(self, events: List) -> int:
+        """Apply a batch of decoded events in chain order; the number that changed the index"""
+        return sum(
+            self.apply(event.event, event.args, event.blockNumber, event.logIndex)
+            for event in events
+            if event.event in PLAYER_EVENTS
+        )
+
+    def get(self, address: str) -> Optional[Dict]:
+        """One player's row"""
+        player_id = self.id_of(address)
+        if player_id is None:
+            return None
+        return self.row(player_id)
+
+    def row(self, player_id: int) -> Dict:
+        row = {name: column[player_id].item() for name, column in self.columns.items()}
+        row["address"] = to_checksum_address(self.addresses[player_id].ljust(20, b"\x00"))
+        return row
+
+    def top(self, column: str, count: int = 10) -> List[Tuple[str, float]]:
+        """(address, value) of the count players with the largest value in a column"""
+        if column not in RANKED:
+            raise ValueError(f"Cannot rank players by {column}; choose from {', '.join(RANKED)}")
+        tree = self.trees.get(column)
+        if tree is None:
+            tree = self.trees[column] = TopTree(self.columns[column], self.size)
+        values = self.columns[column]
+        return [
+            (to_checksum_address(self.addresses[player_id].ljust(20, b"\x00")), values[player_id].item())
+            for player_id in tree.top(count)
+            if values[player_id] > 0
+        ]
+
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        """Copies of the live rows, safe to write from another thread"""
+        arrays = {name: column[:self.size].copy() for name, column in self.columns.items()}
+        arrays["addresses"] = self.addresses[:self.size].copy()
+        position = self.position if self.position is not None else (-1, -1)
+        arrays["meta"] = np.array([SNAPSHOT_VERSION, position[0], position[1], self.guess_cost, self.hint_cost], dtype=np.int64)
+        return arrays
+
+    @staticmethod
+    def write(path: str, arrays: Dict[str, np.ndarray]):
+        """Atomically write a snapshot()"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def save(self, path: str):
+        self.write(path, self.snapshot())
+
+    @classmethod
+    def load(cls, path: str) -> "PlayerIndex":
+        """Restore a snapshot; ranking trees are rebuilt on first use"""
+        with np.load(path) as data:
+            version, block, log_index, guess_cost, hint_cost = data["meta"].tolist()
+            if version != SNAPSHOT_VERSION:
+                raise ValueError(f"{path} is player index version {version}, expected {SNAPSHOT_VERSION}")
+            size = len(data["addresses"])
+            index = cls(size + 1, guess_cost, hint_cost)
+            index.size = size
+            index.addresses[:size] = data["addresses"]
+            for name in COLUMNS:
+                index.columns[name][:size] = data[name]
+        index.position = (block, log_index) if block >= 0 else None
+        index.rehash()
+        return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the leaderboard from a player index snapshot")
+    parser.add_argument("snapshot")
+    parser.add_argument("--by", default="guesses", choices=RANKED)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    index = PlayerIndex.load(args.snapshot)
+    print(f"{len(index):,} players through block {index.position[0] if index.position else '-'}, "
+          f"{index.nbytes() / max(1, len(index)):.0f} bytes per player; spent is estimated at "
+          f"{index.guess_cost / 10 ** 6:,.0f} 100X per guess and {index.hint_cost / 10 ** 6:,.0f} per hint")
+    for rank, (address, value) in enumerate(index.top(args.by, args.top), 1):
+        row = index.get(address)
+        print(f"{rank:>3}. {address}  guesses={row['guesses']} hints={row['hints']} wins={row['wins']} " +
+              f"spent~{row['spent'] / 10 ** 6:,.0f} 100X won={row['won']:.2f} S " +
+              f"seen={row['first_seen']}-{row['last_seen']}")
+
+
+if __name__ == "__main__":
+    main()
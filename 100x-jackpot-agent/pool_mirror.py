@@ -0,0 +1,198 @@
+"""
+Liquidity pool mirror for the 100x Jackpot DeFAI Agent
+
+After the bonding curve graduates, trading moves to SimpleLiquidityPool
+contracts created by LiquidityPoolFactory. PoolMirror keeps each pool's
+reserves in memory: every pool is seeded once with a batched, block-pinned
+read of getReserves()/totalLpSupply(), then kept current from the Swap,
+AddLiquidity and RemoveLiquidity events delivered by the log ingestor.
+PoolCreated events on the factory add new pools as they appear.
+
+Price and TVL are served from memory, so neither the stats refresh nor
+summaries need an RPC call per query. check_drift() compares the mirror with
+the chain at a fully processed block and resyncs any pool that disagrees.
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from web3 import AsyncWeb3
+
+logger = logging.getLogger("100xJackpotAgent")
+
+TOKEN_DECIMALS = 10 ** 6
+
+# SimpleLiquidityPool events that move reserves
+POOL_EVENTS = ("Swap", "AddLiquidity", "RemoveLiquidity")
+
+
+class PoolState:
+    __slots__ = ("address", "token", "token_reserve", "s_reserve", "total_lp_supply", "synced_block", "position")
+
+    def __init__(self, address: str, token: str, token_reserve: int, s_reserve: int, total_lp_supply: int, synced_block: int):
+        self.address = address
+        self.token = token
+        self.token_reserve = token_reserve
+        self.s_reserve = s_reserve
+        self.total_lp_supply = total_lp_supply
+
+        # Reserves include every event up to and including this block
+        self.synced_block = synced_block
+
+        # Last applied (block, logIndex)
+        self.position: Tuple[int, int] = (synced_block, 2 ** 62)
+
+    def price(self) -> Optional[int]:
+        """Wei per whole token at the current reserves"""
+        if self.token_reserve == 0 or self.s_reserve == 0:
+            return None
+        return self.s_reserve * TOKEN_DECIMALS // self.token_reserve
+
+    def token_price(self) -> Optional[int]:
+        """getTokenPrice(): sReserve * 1e18 / tokenReserve"""
+        if self.token_reserve == 0 or self.s_reserve == 0:
+            return None
+        return self.s_reserve * 10 ** 18 // self.token_reserve
+
+    def tvl(self) -> int:
+        """Total value locked in wei, with the token side valued at the pool price"""
+        return 2 * self.s_reserve
+
+    def apply(self, event) -> bool:
+        """Update reserves from a pool event; events already covered are ignored"""
+        position = (event.blockNumber, event.logIndex)
+        if position <= self.position:
+            return False
+
+        args = event.args
+        if event.event == "Swap":
+            if args.isBuy:
+                self.s_reserve += args.sAmount
+                self.token_reserve -= args.tokenAmount
+            else:
+                self.token_reserve += args.tokenAmount
+                self.s_reserve -= args.sAmount
+        elif event.event == "AddLiquidity":
+            self.token_reserve += args.tokenAmount
+            self.s_reserve += args.sAmount
+            self.total_lp_supply += args.lpAmount
+        elif event.event == "RemoveLiquidity":
+            self.token_reserve -= args.tokenAmount
+            self.s_reserve -= args.sAmount
+            self.total_lp_supply -= args.lpAmount
+        else:
+            return False
+
+        self.position = position
+        return True
+
+
+class PoolMirror:
+    def __init__(self, w3: AsyncWeb3, ingestor, pool_abi: List[Dict], factory_abi: List[Dict]):
+        self.w3 = w3
+        self.ingestor = ingestor
+        self.pool_abi = pool_abi
+        self.factory_abi = factory_abi
+
+        # Set once the agent's ReadBatcher exists
+        self.reader = None
+
+        self.factory = None
+        self.pools: Dict[str, PoolState] = {}
+        self.drift_corrections = 0
+
+    def watch_factory(self, address: str):
+        """Follow PoolCreated on a LiquidityPoolFactory"""
+        self.factory = self.w3.eth.contract(address=AsyncWeb3.to_checksum_address(address), abi=self.factory_abi)
+        self.ingestor.subscribe(self.factory, "PoolCreated")
+
+    def pool_contract(self, address: str):
+        return self.w3.eth.contract(address=address, abi=self.pool_abi)
+
+    def pool_for(self, token: str) -> Optional[PoolState]:
+        """The mirrored pool trading a token, if any"""
+        token = token.lower()
+        return next((pool for pool in self.pools.values() if pool.token.lower() == token), None)
+
+    async def discover(self, block: Optional[int] = None):
+        """Track every pool the factory has created so far"""
+        if self.factory is None:
+            return
+        block = block if block is not None else self.reader.head
+        count = await self.reader.call(self.factory.functions.getPoolCount(), block=block)
+        addresses = await self.reader.read(*(self.factory.functions.allPools(index) for index in range(count)), block=block)
+        await self.track(addresses, block)
+
+    async def track(self, addresses: List[str], block: int):
+        """Seed new pools from one batched read pinned at block and subscribe to their events"""
+        addresses = [AsyncWeb3.to_checksum_address(address) for address in addresses]
+        addresses = [address for address in dict.fromkeys(addresses) if address not in self.pools]
+        if not addresses:
+            return
+
+        for address in addresses:
+            contract = self.pool_contract(address)
+            for event_name in POOL_EVENTS:
+                self.ingestor.subscribe(contract, event_name)
+
+        fns = []
+        for address in addresses:
+            contract = self.pool_contract(address)
+            fns.extend((contract.functions.token(), contract.functions.getReserves(), contract.functions.totalLpSupply()))
+        results = await self.reader.read(*fns, block=block)
+
+        for index, address in enumerate(addresses):
+            token, (token_reserve, s_reserve), total_lp_supply = results[index * 3:index * 3 + 3]
+            pool = PoolState(address, token, token_reserve, s_reserve, total_lp_supply, block)
+            self.pools[address] = pool
+            logger.info(f"Mirroring liquidity pool {address} from block {block}: " +
+                       f"{token_reserve / TOKEN_DECIMALS:,.0f} 100X / {self.w3.from_wei(s_reserve, 'ether'):,.4f} S")
+
+    async def apply(self, events: List, block: Optional[int] = None) -> int:
+        """Apply pool events in chain order and start tracking newly created pools
+
+        New pools are seeded at block (the head covered by this batch), so their
+        events from this batch are already reflected in the seeded reserves.
+        """
+        applied = 0
+        created = []
+        for event in events:
+            pool = self.pools.get(event.address)
+            if pool is not None:
+                applied += pool.apply(event)
+            elif event.event == "PoolCreated" and self.factory is not None and event.address == self.factory.address:
+                created.append(event.args.pool)
+                logger.info(f"Liquidity pool created for {event.args.token}: {event.args.pool}")
+
+        if created:
+            await self.track(created, block if block is not None else max(event.blockNumber for event in events))
+        return applied
+
+    async def check_drift(self, block: int) -> int:
+        """Compare mirrored reserves with the chain at a fully processed block; resync pools that drifted"""
+        # Pools seeded after block are checked next time
+        pools = [pool for pool in self.pools.values() if pool.position[0] <= block]
+        if not pools:
+            return 0
+
+        fns = []
+        for pool in pools:
+            contract = self.pool_contract(pool.address)
+            fns.extend((contract.functions.getReserves(), contract.functions.totalLpSupply()))
+        results = await self.reader.read(*fns, block=block)
+
+        drifted = 0
+        for index, pool in enumerate(pools):
+            (token_reserve, s_reserve), total_lp_supply = results[index * 2:index * 2 + 2]
+            if (pool.token_reserve, pool.s_reserve, pool.total_lp_supply) == (token_reserve, s_reserve, total_lp_supply):
+                continue
+            drifted += 1
+            logger.warning(f"Pool {pool.address} drifted at block {block}: mirrored " +
+                           f"{pool.token_reserve}/{pool.s_reserve}/{pool.total_lp_supply}, " +
+                           f"chain {token_reserve}/{s_reserve}/{total_lp_supply}; resyncing")
+            pool.token_reserve, pool.s_reserve, pool.total_lp_supply = token_reserve, s_reserve, total_lp_supply
+            pool.synced_block = block
+            pool.position = (block, 2 ** 62)
+
+        self.drift_corrections += drifted
+        return drifted
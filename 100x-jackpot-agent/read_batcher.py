@@ -0,0 +1,209 @@
+"""
+Read aggregation for the 100x Jackpot DeFAI Agent
+
+Collects the contract view calls queued during one event-loop tick and sends
+them together, either as a single JSON-RPC batch of eth_call requests or, when
+a Multicall3 contract is configured, as one aggregate3 eth_call. Every call in
+a flush is pinned to the same block number so a snapshot never mixes heights.
+Results are memoized in a block-keyed ReadCache, so repeated reads of the same
+view in one block cost a single request.
+"""
+
+import asyncio
+import itertools
+import logging
+from typing import Any, Dict, List, Optional
+
+from eth_abi import decode, encode
+from eth_utils import function_signature_to_4byte_selector, to_checksum_address
+from eth_utils.abi import collapse_if_tuple
+from web3 import Web3
+
+from read_cache import ReadCache
+
+logger = logging.getLogger("100xJackpotAgent")
+
+# Multicall3 aggregate3((address,bool,bytes)[]) -> (bool,bytes)[]
+AGGREGATE3_SELECTOR = function_signature_to_4byte_selector("aggregate3((address,bool,bytes)[])")
+
+
+class ReadError(Exception):
+    """A batched view call failed or reverted"""
+
+
+class PendingRead:
+    __slots__ = ("address", "data", "output_types", "block", "future")
+
+    def __init__(self, address: str, data: str, output_types: List[str], block: Optional[int], future):
+        self.address = address
+        self.data = data
+        self.output_types = output_types
+        self.block = block
+        self.future = future
+
+
+class ReadBatcher:
+    def __init__(
+        self,
+        transport,
+        multicall_address: Optional[str] = None,
+        cache: Optional[ReadCache] = None
+    ):
+        # Anything with an async post(payload, hedge) method, e.g. an RpcPool
+        self.transport = transport
+        self.multicall_address = to_checksum_address(multicall_address) if multicall_address else None
+
+        # Latest block known to the agent; reads without an explicit block are pinned here
+        self.head: Optional[int] = None
+        self.cache = cache if cache is not None else ReadCache()
+
+        self.pending: List[PendingRead] = []
+        self.flush_scheduled = False
+        self.flush_task = None
+        self.ids = itertools.count(1)
+
+    def set_head(self, block: int):
+        """Pin subsequent reads to a new head and evict older cached results"""
+        self.head = block
+        self.cache.set_head(block)
+
+    def invalidate(self, fn):
+        """Drop cached results of a contract function after an event changed it"""
+        self.cache.invalidate(fn.address, fn.fn_name)
+
+    async def call(self, fn, block: Optional[int] = None) -> Any:
+        """Queue a contract view call and wait for its batched result"""
+        if block is None:
+            block = self.head
+
+        key = self.cache.make_key(fn, block) if block is not None else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return await asyncio.shield(cached)
+
+        loop = asyncio.get_running_loop()
+        output_types = [collapse_if_tuple(output) for output in fn.abi.get("outputs", [])]
+        read = PendingRead(fn.address, fn._encode_transaction_data(), output_types, block, loop.create_future())
+        self.pending.append(read)
+        if key is not None:
+            self.cache.put(key, read.future)
+
+        # Flush on the next loop iteration so every call queued in this tick shares it
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            loop.call_soon(self.start_flush)
+
+        return await asyncio.shield(read.future)
+
+    def start_flush(self):
+        """Run flush() as a task, keeping a reference until it completes"""
+        self.flush_task = asyncio.ensure_future(self.flush())
+
+    async def read(self, *fns, block: Optional[int] = None) -> List:
+        """Read several view functions as one consistent snapshot"""
+        return await asyncio.gather(*(self.call(fn, block) for fn in fns))
+
+    async def flush(self):
+        """Send every queued call, grouped by pinned block"""
+        pending, self.pending = self.pending, []
+        self.flush_scheduled = False
+        if not pending:
+            return
+
+        try:
+            default_block = self.head
+            if any(read.block is None for read in pending) and default_block is None:
+                default_block = await self.block_number()
+
+            by_block: Dict[int, List[PendingRead]] = {}
+            for read in pending:
+                by_block.setdefault(read.block if read.block is not None else default_block, []).append(read)
+
+            for block, reads in by_block.items():
+                if self.multicall_address and len(reads) > 1:
+                    await self.send_multicall(reads, block)
+                else:
+                    await self.send_batch(reads, block)
+        except Exception as e:
+            for read in pending:
+                if not read.future.done():
+                    read.future.set_exception(e)
+
+    async def post(self, payload):
+        """Send a JSON-RPC payload through the transport"""
+        return await self.transport.post(payload, hedge=True)
+
+    async def block_number(self) -> int:
+        """Fetch the current head block"""
+        response = await self.post({"jsonrpc": "2.0", "id": next(self.ids), "method": "eth_blockNumber", "params": []})
+        if "error" in response:
+            raise ReadError(response["error"].get("message", response["error"]))
+        return int(response["result"], 16)
+
+    async def send_batch(self, reads: List[PendingRead], block: int):
+        """Send reads as one JSON-RPC batch of eth_call requests"""
+        requests = {}
+        payload = []
+        for read in reads:
+            request_id = next(self.ids)
+            requests[request_id] = read
+            payload.append({
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": "eth_call",
+                "params": [{"to": read.address, "data": read.data}, hex(block)]
+            })
+
+        responses = await self.post(payload)
+        if isinstance(responses, dict):
+            # Some providers answer a rejected batch with a single error object
+            raise ReadError(responses.get("error", {}).get("message", "Batch request rejected"))
+
+        for response in responses:
+            read = requests.pop(response.get("id"), None)
+            if read is None or read.future.done():
+                continue
+            if "error" in response:
+                read.future.set_exception(ReadError(response["error"].get("message", response["error"])))
+            else:
+                self.resolve(read, Web3.to_bytes(hexstr=response["result"]))
+
+        for read in requests.values():
+            if not read.future.done():
+                read.future.set_exception(ReadError("Missing response in batch"))
+
+    async def send_multicall(self, reads: List[PendingRead], block: int):
+        """Send reads as a single Multicall3 aggregate3 eth_call"""
+        calls = [(read.address, True, Web3.to_bytes(hexstr=read.data)) for read in reads]
+        data = AGGREGATE3_SELECTOR + encode(["(address,bool,bytes)[]"], [calls])
+
+        response = await self.post({
+            "jsonrpc": "2.0",
+            "id": next(self.ids),
+            "method": "eth_call",
+            "params": [{"to": self.multicall_address, "data": Web3.to_hex(data)}, hex(block)]
+        })
+        if "error" in response:
+            raise ReadError(response["error"].get("message", response["error"]))
+
+        (results,) = decode(["(bool,bytes)[]"], Web3.to_bytes(hexstr=response["result"]))
+        for read, (success, return_data) in zip(reads, results):
+            if success:
+                self.resolve(read, return_data)
+            else:
+                read.future.set_exception(ReadError(f"Call to {read.address} reverted"))
+
+    def resolve(self, read: PendingRead, return_data: bytes):
+        """Decode raw return data the way ContractFunction.call() would"""
+        try:
+            values = decode(read.output_types, return_data)
+        except Exception as e:
+            read.future.set_exception(ReadError(f"Could not decode result from {read.address}: {e}"))
+            return
+
+        values = [
+            to_checksum_address(value) if output_type == "address" else value
+            for output_type, value in zip(read.output_types, values)
+        ]
+        read.future.set_result(values[0] if len(values) == 1 else values)
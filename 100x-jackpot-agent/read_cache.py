@@ -0,0 +1,89 @@
+"""
+Block-keyed cache for contract view calls
+
+Memoizes ContractFunction results keyed by (contract, function, args, block).
+Entries from older blocks are evicted when the head moves, and handlers can
+invalidate a function explicitly when an event shows its value has changed.
+Concurrent reads of the same key share one in-flight request.
+"""
+
+import asyncio
+from typing import Dict, Hashable, Optional, Tuple
+
+CacheKey = Tuple[str, str, Hashable, int]
+
+
+class ReadCache:
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.entries: Dict[CacheKey, asyncio.Future] = {}
+        self.head: Optional[int] = None
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(fn, block: int) -> Optional[CacheKey]:
+        """Build a cache key, or None if the call arguments are not hashable"""
+        key = (fn.address.lower(), fn.fn_name, fn.args, block)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get(self, key: CacheKey) -> Optional[asyncio.Future]:
+        """Return the cached (possibly still pending) result future"""
+        future = self.entries.get(key)
+        if future is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return future
+
+    def put(self, key: CacheKey, future: asyncio.Future):
+        """Cache a result future; failed reads are dropped once they complete"""
+        if len(self.entries) >= self.max_entries:
+            # Drop the oldest entry (dicts keep insertion order)
+            self.entries.pop(next(iter(self.entries)))
+            self.evictions += 1
+        self.entries[key] = future
+        future.add_done_callback(lambda f: self.discard_failed(key, f))
+
+    def discard_failed(self, key: CacheKey, future: asyncio.Future):
+        """Remove an entry whose read raised"""
+        if (future.cancelled() or future.exception() is not None) and self.entries.get(key) is future:
+            del self.entries[key]
+
+    def set_head(self, block: int):
+        """Evict entries pinned to blocks older than the new head"""
+        if self.head is not None and block <= self.head:
+            return
+        self.head = block
+        stale = [key for key in self.entries if key[3] < block]
+        for key in stale:
+            del self.entries[key]
+        self.evictions += len(stale)
+
+    def invalidate(self, address: str, fn_name: str):
+        """Drop every cached result of one contract function"""
+        address = address.lower()
+        stale = [key for key in self.entries if key[0] == address and key[1] == fn_name]
+        for key in stale:
+            del self.entries[key]
+        self.invalidations += len(stale)
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters for logging"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries": len(self.entries),
+        }
@@ -0,0 +1,577 @@
+"""
+RPC record/replay for the 100x Jackpot DeFAI Agent
+
+RecordingTransport sits between the agent and its RpcPool and appends every
+JSON-RPC request it forwards, with its response, its time offset and its
+round-trip time, to a gzipped JSON-lines cassette. Set RPC_RECORD_FILE to
+record while the agent runs normally.
+
+Replaying feeds a cassette back to a JackpotAgent without any network:
+
+- ReplayTransport answers from the recording as the chain looked at the
+  current virtual time: eth_blockNumber returns the head recorded by then,
+  eth_getLogs filters every recorded log, and eth_call returns the result
+  recorded for the same call at the same block (or the closest earlier one).
+  Transactions are accepted locally and never leave the process.
+- VirtualClock replaces time.time() and time.monotonic(), and VirtualTimeLoop
+  runs asyncio timers on it, at 1x, Nx or maximum speed. At maximum speed the
+  loop skips ahead to the next timer whenever nothing is runnable, so the
+  adaptive polls, the stats refresh and the 4h summary all happen on
+  schedule while a busy day replays in seconds, and two replays of the same
+  cassette make the same requests in the same order.
+
+Each replay writes a report with throughput, handled events, social posts
+and emitGameUpdate messages, which can be compared with a report from
+another agent version.
+
+Usage:
+    RPC_RECORD_FILE=busy-day.rpc.gz python jackpot_agent.py
+    python rpc_cassette.py busy-day.rpc.gz [--speed max|1|60] [--output replay.json] [--compare before.json]
+"""
+
+import argparse
+import asyncio
+import bisect
+import difflib
+import gzip
+import json
+import logging
+import os
+import selectors
+import statistics
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from eth_utils import keccak
+
+logger = logging.getLogger("100xJackpotAgent")
+
+CASSETTE_VERSION = 1
+
+# The real clocks, kept for the recorder and the virtual clock while time is patched
+REAL_TIME = time.time
+REAL_MONOTONIC = time.monotonic
+
+# Methods whose answer depends only on the recording time
+TIMED_METHODS = ("eth_chainId", "net_version", "web3_clientVersion", "eth_gasPrice")
+
+
+class CassetteWriter:
+    def __init__(self, path: str, meta: Dict):
+        self.path = path
+        self.file = gzip.open(path, "wt", encoding="utf-8")
+        self.started = REAL_MONOTONIC()
+        self.entries = 0
+        self.file.write(json.dumps(dict(meta, version=CASSETTE_VERSION, started=REAL_TIME())) + "\n")
+
+    def write(self, request: Dict, response: Optional[Dict], duration: float):
+        """One request: [offset, method, params, result, error, round trip]"""
+        response = response or {"error": {"code": -32603, "message": "No response in batch"}}
+        entry = [
+            round(REAL_MONOTONIC() - self.started, 3),
+            request.get("method"),
+            request.get("params", []),
+            response.get("result"),
+            response.get("error"),
+            round(duration, 4),
+        ]
+        self.file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self.entries += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+            logger.info(f"Recorded {self.entries:,} RPC requests to {self.path}")
+
+
+class RecordingTransport:
+    """RpcPool wrapper that records every request it forwards"""
+
+    def __init__(self, transport, path: str, meta: Dict):
+        self.transport = transport
+        self.writer = CassetteWriter(path, meta)
+
+    def __getattr__(self, name: str) -> Any:
+        # Health checks, highest_block and stats come from the wrapped pool
+        return getattr(self.transport, name)
+
+    async def request(self, body: bytes, hedge: bool = False, method: str = "unknown") -> bytes:
+        started = REAL_MONOTONIC()
+        raw = await self.transport.request(body, hedge=hedge, method=method)
+        self.record(json.loads(body), json.loads(raw), started)
+        return raw
+
+    async def post(self, payload: Any, hedge: bool = False) -> Any:
+        started = REAL_MONOTONIC()
+        response = await self.transport.post(payload, hedge=hedge)
+        self.record(payload, response, started)
+        return response
+
+    def record(self, payload: Any, response: Any, started: float):
+        duration = REAL_MONOTONIC() - started
+        if not isinstance(payload, list):
+            self.writer.write(payload, response, duration)
+            return
+
+        # A rejected batch comes back as one error object
+        by_id = {item.get("id"): item for item in response} if isinstance(response, list) else {}
+        for request in payload:
+            self.writer.write(request, by_id.get(request.get("id"), response if isinstance(response, dict) else None), duration)
+
+    async def stop(self):
+        await self.transport.stop()
+        self.writer.close()
+
+
+def read_entries(path: str) -> Tuple[Dict, List[List]]:
+    """Header and entries of a cassette; a recording cut off mid-write keeps what was flushed"""
+    entries = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        try:
+            for line in f:
+                entries.append(json.loads(line))
+        except (EOFError, json.JSONDecodeError):
+            logger.warning(f"{path} ends early (recording interrupted); replaying {len(entries):,} requests")
+    if header.get("version") != CASSETTE_VERSION:
+        raise ValueError(f"{path} is cassette version {header.get('version')}, expected {CASSETTE_VERSION}")
+    return header, entries
+
+
+def quantity(value: Any) -> int:
+    """A JSON-RPC quantity; some nodes send plain integers"""
+    return value if isinstance(value, int) else int(value, 16)
+
+
+def block_param(value: Any, head: int) -> int:
+    """A block tag or hex number as a block number"""
+    if value in (None, "latest", "pending", "safe", "finalized"):
+        return head
+    if value == "earliest":
+        return 0
+    return quantity(value)
+
+
+class Cassette:
+    def __init__(self, path: str):
+        self.path = path
+        self.meta, entries = read_entries(path)
+        self.duration = entries[-1][0] if entries else 0.0
+
+        # (offset, head) from every eth_blockNumber answer
+        self.heads: List[Tuple[float, int]] = []
+        # (block, logIndex) -> log, and the block ranges eth_getLogs covered
+        self.logs: Dict[Tuple[int, int], Dict] = {}
+        self.ranges: List[Tuple[int, int]] = []
+        # (to, data) -> [(block, result, error)] sorted by block
+        self.calls: Dict[Tuple[str, str], List[Tuple[int, Any, Any]]] = {}
+        # method -> [(offset, result)]
+        self.values: Dict[str, List[Tuple[float, Any]]] = {}
+        self.nonces: List[Tuple[float, int]] = []
+        durations: Dict[str, List[float]] = {}
+
+        for offset, method, params, result, error, duration in entries:
+            durations.setdefault(method, []).append(duration)
+            if method == "eth_blockNumber" and result is not None:
+                self.heads.append((offset, quantity(result)))
+
+        for offset, method, params, result, error, duration in entries:
+            if method == "eth_getLogs" and result is not None:
+                head = self.head_at(offset)
+                self.ranges.append((block_param(params[0].get("fromBlock"), head), block_param(params[0].get("toBlock"), head)))
+                for log in result:
+                    self.logs[(quantity(log["blockNumber"]), quantity(log["logIndex"]))] = log
+            elif method == "eth_call":
+                call = params[0]
+                key = (call["to"].lower(), call.get("data") or call.get("input"))
+                block = block_param(params[1] if len(params) > 1 else None, self.head_at(offset))
+                self.calls.setdefault(key, []).append((block, result, error))
+            elif method == "eth_getTransactionCount" and result is not None:
+                self.nonces.append((offset, quantity(result)))
+            elif method in TIMED_METHODS and result is not None:
+                self.values.setdefault(method, []).append((offset, result))
+
+        for recorded in self.calls.values():
+            recorded.sort(key=lambda item: item[0])
+        self.call_blocks = {key: [block for block, _, _ in recorded] for key, recorded in self.calls.items()}
+        self.log_keys = sorted(self.logs)
+        self.ranges = merge_ranges(self.ranges)
+        self.latency = {method: statistics.median(values) for method, values in durations.items()}
+        self.start_block = self.ranges[0][0] if self.ranges else (self.heads[0][1] if self.heads else 0)
+
+    def head_at(self, offset: float) -> int:
+        """Chain head as last seen at or before an offset"""
+        index = bisect.bisect_right(self.heads, (offset, float("inf")))
+        if index == 0:
+            return self.heads[0][1] if self.heads else 0
+        return self.heads[index - 1][1]
+
+    @staticmethod
+    def value_at(values: List[Tuple[float, Any]], offset: float) -> Any:
+        """The last recorded answer at or before an offset, else the first one"""
+        index = bisect.bisect_right([recorded for recorded, _ in values], offset)
+        return values[max(0, index - 1)][1]
+
+    def covered(self, from_block: int, to_block: int) -> bool:
+        return any(start <= from_block and to_block <= end for start, end in self.ranges)
+
+
+def merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class ReplayTransport:
+    """RpcPool stand-in answering from a cassette at the current virtual time"""
+
+    def __init__(self, cassette: Cassette, clock: "VirtualClock", latency: bool = True):
+        self.cassette = cassette
+        self.clock = clock
+        self.latency = latency
+        self.highest_block: Optional[int] = None
+
+        self.requests: Counter = Counter()
+        # Answers that needed an approximation: an earlier block's call result, an uncovered log range
+        self.approximate: Counter = Counter()
+        self.misses: Counter = Counter()
+
+        self.nonce = cassette.nonces[0][1] if cassette.nonces else 0
+        self.sent: List[str] = []
+
+    def head(self) -> int:
+        return self.cassette.head_at(self.clock.elapsed())
+
+    async def check_health(self):
+        self.highest_block = self.head()
+
+    def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return []
+
+    async def post(self, payload: Any, hedge: bool = False) -> Any:
+        requests = payload if isinstance(payload, list) else [payload]
+        responses = [self.answer(request) for request in requests]
+
+        # Recorded round-trip time, spent on the virtual clock
+        if self.latency:
+            await asyncio.sleep(max(self.cassette.latency.get(request.get("method"), 0.0) for request in requests))
+        return responses if isinstance(payload, list) else responses[0]
+
+    async def request(self, body: bytes, hedge: bool = False, method: str = "unknown") -> bytes:
+        return json.dumps(await self.post(json.loads(body), hedge)).encode()
+
+    def answer(self, request: Dict) -> Dict:
+        method = request.get("method")
+        params = request.get("params", [])
+        self.requests[method] += 1
+        try:
+            result = self.resolve(method, params)
+        except LookupError as e:
+            self.misses[method] += 1
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32000, "message": str(e)}}
+        if isinstance(result, dict) and set(result) == {"error"}:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": result["error"]}
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+    def resolve(self, method: str, params: List) -> Any:
+        cassette = self.cassette
+        head = self.head()
+
+        if method == "eth_blockNumber":
+            return hex(head)
+
+        if method == "eth_getLogs":
+            criteria = params[0]
+            from_block = block_param(criteria.get("fromBlock"), head)
+            to_block = min(block_param(criteria.get("toBlock"), head), head)
+            if not cassette.covered(from_block, to_block):
+                self.approximate[method] += 1
+            addresses = criteria.get("address")
+            addresses = {address.lower() for address in ([addresses] if isinstance(addresses, str) else addresses or [])}
+            topics = (criteria.get("topics") or [None])[0]
+            topics = {topics} if isinstance(topics, str) else set(topics or [])
+
+            start = bisect.bisect_left(cassette.log_keys, (from_block, -1))
+            end = bisect.bisect_right(cassette.log_keys, (to_block, float("inf")))
+            logs = []
+            for key in cassette.log_keys[start:end]:
+                log = cassette.logs[key]
+                if addresses and log["address"].lower() not in addresses:
+                    continue
+                if topics and (not log["topics"] or log["topics"][0] not in topics):
+                    continue
+                logs.append(log)
+            return logs
+
+        if method == "eth_call":
+            call = params[0]
+            key = (call["to"].lower(), call.get("data") or call.get("input"))
+            recorded = cassette.calls.get(key)
+            if not recorded:
+                raise LookupError(f"eth_call to {call['to']} not in the recording")
+            block = block_param(params[1] if len(params) > 1 else None, head)
+            index = bisect.bisect_right(cassette.call_blocks[key], block)
+            if index == 0 or recorded[index - 1][0] != block:
+                self.approximate[method] += 1
+            _, result, error = recorded[max(0, index - 1)]
+            return {"error": error} if error is not None else result
+
+        if method in TIMED_METHODS:
+            values = cassette.values.get(method)
+            if not values:
+                raise LookupError(f"{method} not in the recording")
+            return Cassette.value_at(values, self.clock.elapsed())
+
+        # Transactions stay local: every one is accepted and counts as mined
+        if method == "eth_getTransactionCount":
+            return hex(self.nonce)
+        if method == "eth_sendRawTransaction":
+            self.nonce += 1
+            self.sent.append(params[0])
+            return "0x" + keccak(hexstr=params[0]).hex()
+
+        raise LookupError(f"{method} is not supported in replay")
+
+
+class VirtualClock:
+    """time.time()/time.monotonic() replacement running at a multiple of real time.
+    At maximum speed it only moves when advanced, so a replay doesn't depend on how fast the host is"""
+
+    def __init__(self, start: float, speed: Optional[float] = None):
+        self.start = start
+        self.speed = speed  # None: as fast as possible
+        self.real_start = REAL_MONOTONIC()
+        self.skipped = 0.0
+
+    def elapsed(self) -> float:
+        if self.speed is None:
+            return self.skipped
+        return (REAL_MONOTONIC() - self.real_start) * self.speed + self.skipped
+
+    def time(self) -> float:
+        return self.start + self.elapsed()
+
+    def monotonic(self) -> float:
+        return self.elapsed()
+
+    def advance(self, seconds: float):
+        self.skipped += seconds
+
+    @contextmanager
+    def installed(self):
+        """Patch time.time and time.monotonic for everything running inside"""
+        time.time, time.monotonic = self.time, self.monotonic
+        try:
+            yield self
+        finally:
+            time.time, time.monotonic = REAL_TIME, REAL_MONOTONIC
+
+
+class VirtualSelector(selectors.DefaultSelector):
+    """Waits for timers in virtual time: scaled at Nx, skipped entirely at maximum speed"""
+
+    def __init__(self, clock: VirtualClock):
+        super().__init__()
+        self.clock = clock
+        self.threads = 0
+
+    def select(self, timeout: Optional[float] = None):
+        if timeout is None or timeout <= 0:
+            return super().select(timeout)
+        if self.clock.speed is not None:
+            return super().select(timeout / self.clock.speed)
+        if self.threads:
+            # Work in a thread can't be skipped; its completion wakes the loop
+            return super().select(timeout)
+        self.clock.advance(timeout)
+        return super().select(0)
+
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    def __init__(self, clock: VirtualClock):
+        self.clock = clock
+        self.virtual_selector = VirtualSelector(clock)
+        super().__init__(self.virtual_selector)
+
+    def time(self) -> float:
+        return self.clock.monotonic()
+
+    def run_in_executor(self, executor, func, *args):
+        future = super().run_in_executor(executor, func, *args)
+        self.virtual_selector.threads += 1
+
+        def done(_):
+            self.virtual_selector.threads -= 1
+
+        future.add_done_callback(done)
+        return future
+
+
+class ReplayTwitter:
+    """tweepy.Client stand-in recording posts with their virtual time"""
+
+    def __init__(self, clock: VirtualClock):
+        self.clock = clock
+        self.posts: List[Tuple[float, str]] = []
+
+    def create_tweet(self, text: str, **kwargs):
+        self.posts.append((round(self.clock.elapsed(), 3), text))
+        return type("Response", (), {"data": {"id": str(len(self.posts))}})()
+
+
+async def replay(cassette: Cassette, clock: VirtualClock, latency: bool = True) -> Dict:
+    """Run a JackpotAgent over a cassette until the recording is exhausted"""
+    # Imported here: the agent reads its configuration from the environment at import time
+    import jackpot_agent
+    from deployments import Deployment
+
+    meta = cassette.meta
+    state_dir = tempfile.mkdtemp(prefix="jackpot-replay-")
+    deployment = Deployment(
+        meta.get("name", "replay"),
+        meta["jackpot_address"],
+        meta["token_address"],
+        meta["bonding_curve_address"],
+        liquidity_pool_factory_address=meta.get("liquidity_pool_factory_address"),
+        # A throwaway key keeps the emitGameUpdate path running; nothing is broadcast
+        private_key="0x" + "42" * 32 if meta.get("sends_transactions") else None,
+        twitter_tier=meta.get("twitter_tier", "free"),
+        checkpoint_file=os.path.join(state_dir, "checkpoint.json"),
+        event_store_file=os.path.join(state_dir, "events.db"),
+        player_index_file=os.path.join(state_dir, "players.npz"),
+        candles_file=os.path.join(state_dir, "candles.npz"),
+    )
+    agent = jackpot_agent.JackpotAgent(["replay://"], deployment=deployment)
+    transport = ReplayTransport(cassette, clock, latency)
+
+    twitter = ReplayTwitter(clock)
+    agent.twitter = twitter
+    agent.social.twitter = twitter
+
+    game_updates: List[Tuple[float, str]] = []
+    if agent.tx_pipeline:
+        submit = agent.tx_pipeline.submit
+
+        def record_update(message: str):
+            game_updates.append((round(clock.elapsed(), 3), message))
+            submit(message)
+
+        agent.tx_pipeline.submit = record_update
+
+    final_head = cassette.head_at(cassette.duration)
+    started = time.perf_counter()
+    task = asyncio.ensure_future(agent.run(transport))
+    while not task.done():
+        await asyncio.sleep(jackpot_agent.POLL_INTERVAL)
+        next_block = agent.ingestor.next_block
+        if clock.elapsed() >= cassette.duration and next_block is not None and next_block > final_head:
+            task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    real_seconds = time.perf_counter() - started
+
+    events = {key[0]: int(value) for key, value in agent.metrics.events.values.items()}
+    return {
+        "cassette": cassette.path,
+        "speed": clock.speed or "max",
+        "blocks": [cassette.start_block, final_head],
+        "virtual_seconds": round(clock.elapsed(), 3),
+        "real_seconds": round(real_seconds, 3),
+        "speedup": round(clock.elapsed() / real_seconds, 1),
+        "events": events,
+        "events_per_real_second": round(sum(events.values()) / real_seconds, 1),
+        "posts": twitter.posts,
+        "game_updates": game_updates,
+        "rpc": {
+            "requests": dict(transport.requests),
+            "approximate": dict(transport.approximate),
+            "misses": dict(transport.misses),
+        },
+    }
+
+
+def compare(before: Dict, after: Dict):
+    """Print throughput and output differences between two replay reports"""
+    print(f"\nCompared with {before['cassette']} at speed {before['speed']}:")
+    for key in ("real_seconds", "events_per_real_second"):
+        change = (after[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+        print(f"  {key:<24} {before[key]:>12,.1f} -> {after[key]:>12,.1f}  ({change:+.1f}%)")
+    for name in sorted(set(before["events"]) | set(after["events"])):
+        old, new = before["events"].get(name, 0), after["events"].get(name, 0)
+        if old != new:
+            print(f"  events {name}: {old} -> {new}")
+    for key in ("posts", "game_updates"):
+        old = [text for _, text in before[key]]
+        new = [text for _, text in after[key]]
+        if old == new:
+            print(f"  {key}: identical ({len(new)})")
+        else:
+            print(f"  {key}: {len(old)} -> {len(new)}")
+            for line in list(difflib.unified_diff(old, new, "before", "after", lineterm="", n=0))[:40]:
+                print(f"    {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded RPC cassette through the agent")
+    parser.add_argument("cassette")
+    parser.add_argument("--speed", default="max", help="'max' or a multiple of real time, e.g. 1 or 60")
+    parser.add_argument("--no-latency", action="store_true", help="answer instantly instead of after the recorded round trip")
+    parser.add_argument("--output", default="replay_report.json")
+    parser.add_argument("--compare", help="earlier replay report to compare against")
+    parser.add_argument("--verbose", action="store_true", help="keep the agent's INFO logging")
+    args = parser.parse_args()
+
+    cassette = Cassette(args.cassette)
+    speed = None if args.speed == "max" else float(args.speed)
+
+    # Offline, polling only, resuming from where the recording started
+    os.environ.update({
+        "START_BLOCK": str(cassette.start_block),
+        "WS_URL": "",
+        "RPC_RECORD_FILE": "",
+        "METRICS_PORT": "0",
+        "HINT_SERVER_PORT": "0",
+        "MULTICALL_ADDRESS": cassette.meta.get("multicall_address") or "",
+    })
+    if not args.verbose:
+        logging.getLogger("100xJackpotAgent").setLevel(logging.WARNING)
+
+    print(f"Replaying {args.cassette}: {cassette.duration / 3600:.2f}h, blocks {cassette.start_block}-" +
+          f"{cassette.head_at(cassette.duration)}, {len(cassette.logs):,} logs, speed {args.speed}")
+    clock = VirtualClock(cassette.meta["started"], speed)
+    loop = VirtualTimeLoop(clock)
+    asyncio.set_event_loop(loop)
+    try:
+        with clock.installed():
+            report = loop.run_until_complete(replay(cassette, clock, latency=not args.no_latency))
+    finally:
+        loop.close()
+
+    print(f"  {report['virtual_seconds']:,.0f}s of chain time in {report['real_seconds']:,.2f}s " +
+          f"({report['speedup']:,.0f}x), {sum(report['events'].values()):,} events, " +
+          f"{len(report['posts'])} posts, {len(report['game_updates'])} game updates")
+    print(f"  RPC: {report['rpc']}")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
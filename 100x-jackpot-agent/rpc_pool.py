@@ -0,0 +1,283 @@
+"""
+Multi-endpoint RPC pool for the 100x Jackpot DeFAI Agent
+
+Spreads JSON-RPC traffic over several endpoints. Each endpoint keeps an EWMA
+of its latency and error rate; requests go to the fastest healthy endpoint,
+fail over to the next one on transport errors, and latency-critical reads can
+be hedged to a second endpoint once the first has taken longer than its p95.
+A background health check quarantines endpoints that fall behind the highest
+block seen across the pool.
+
+PooledProvider plugs the pool into AsyncWeb3 so contract calls, log queries
+and transaction sends all share the same routing.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import aiohttp
+from web3._utils.encoding import Web3JsonEncoder
+from web3._utils.method_formatters import to_integer_if_hex
+from web3.providers.async_base import AsyncJSONBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+logger = logging.getLogger("100xJackpotAgent")
+
+# Read methods worth hedging when the primary endpoint is slow
+HEDGED_METHODS = frozenset({"eth_call", "eth_getLogs", "eth_blockNumber", "eth_getBlockByNumber"})
+
+
+class Endpoint:
+    def __init__(self, url: str, alpha: float = 0.2):
+        self.url = url
+        self.alpha = alpha
+
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.samples: Deque[float] = deque(maxlen=200)
+
+        self.latest_block: Optional[int] = None
+        self.quarantined = False
+
+        # Counters
+        self.requests = 0
+        self.errors = 0
+        self.hedges_won = 0
+
+    def record(self, latency: Optional[float], ok: bool):
+        """Update the latency and error-rate EWMAs with one request outcome"""
+        self.requests += 1
+        if not ok:
+            self.errors += 1
+        self.error_rate += self.alpha * ((0.0 if ok else 1.0) - self.error_rate)
+
+        if latency is not None:
+            self.samples.append(latency)
+            self.latency = latency if self.latency is None else self.latency + self.alpha * (latency - self.latency)
+
+    def p95(self) -> Optional[float]:
+        """95th-percentile latency over recent requests"""
+        if len(self.samples) < 10:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+    @property
+    def healthy(self) -> bool:
+        return not self.quarantined and self.error_rate < 0.5
+
+    def score(self) -> float:
+        """Lower is better; unknown endpoints are tried early to get a sample"""
+        latency = self.latency if self.latency is not None else 0.0
+        return latency * (1 + 4 * self.error_rate)
+
+
+class RpcPool:
+    def __init__(
+        self,
+        urls: List[str],
+        session: aiohttp.ClientSession,
+        hedge: bool = True,
+        hedge_min_delay: float = 0.05,
+        max_block_lag: int = 5,
+        health_interval: float = 15.0,
+        observer: Optional[Callable[[str, float, bool], None]] = None
+    ):
+        if not urls:
+            raise ValueError("RpcPool needs at least one endpoint")
+
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.session = session
+        self.hedge = hedge and len(urls) > 1
+        self.hedge_min_delay = hedge_min_delay
+        self.max_block_lag = max_block_lag
+        self.health_interval = health_interval
+        self.health_task: Optional[asyncio.Task] = None
+
+        # Called with (method, seconds, ok) once per request, after failover and hedging
+        self.observer = observer
+
+        self.highest_block: Optional[int] = None
+        self.hedges_sent = 0
+        self.failovers = 0
+
+    def ranked(self) -> List[Endpoint]:
+        """Endpoints ordered by preference, healthy ones first"""
+        return sorted(self.endpoints, key=lambda endpoint: (not endpoint.healthy, endpoint.score()))
+
+    async def send(self, endpoint: Endpoint, body: bytes) -> bytes:
+        """POST one request body to an endpoint, recording its latency"""
+        started = time.monotonic()
+        try:
+            async with self.session.post(
+                endpoint.url,
+                data=body,
+                headers={"Content-Type": "application/json"}
+            ) as response:
+                response.raise_for_status()
+                raw = await response.read()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            endpoint.record(None, ok=False)
+            raise
+        endpoint.record(time.monotonic() - started, ok=True)
+        return raw
+
+    async def request(self, body: bytes, hedge: bool = False, method: str = "unknown") -> bytes:
+        """Send a request body to the best endpoint, with failover and optional hedging"""
+        if self.observer is None:
+            return await self.route(body, hedge)
+
+        started = time.monotonic()
+        try:
+            raw = await self.route(body, hedge)
+        except Exception:
+            self.observer(method, time.monotonic() - started, False)
+            raise
+        self.observer(method, time.monotonic() - started, True)
+        return raw
+
+    async def route(self, body: bytes, hedge: bool) -> bytes:
+        """Try endpoints in ranked order until one answers"""
+        candidates = self.ranked()
+        last_error: Optional[Exception] = None
+
+        for index, endpoint in enumerate(candidates):
+            backup = candidates[index + 1] if index + 1 < len(candidates) else None
+            try:
+                if hedge and self.hedge and backup is not None and backup.healthy:
+                    return await self.hedged(endpoint, backup, body)
+                return await self.send(endpoint, body)
+            except Exception as e:
+                last_error = e
+                self.failovers += 1
+                logger.warning(f"RPC endpoint {endpoint.url} failed ({e}), trying next")
+
+        raise last_error
+
+    async def hedged(self, primary: Endpoint, backup: Endpoint, body: bytes) -> bytes:
+        """Send to primary; if it is slower than its p95, also send to backup and take the first answer"""
+        delay = max(self.hedge_min_delay, primary.p95() or primary.latency or self.hedge_min_delay)
+        first = asyncio.ensure_future(self.send(primary, body))
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+
+        self.hedges_sent += 1
+        second = asyncio.ensure_future(self.send(backup, body))
+        racers = {first: primary, second: backup}
+        try:
+            while racers:
+                done, _ = await asyncio.wait(racers, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    endpoint = racers.pop(task)
+                    if task.exception() is None:
+                        if endpoint is backup:
+                            backup.hedges_won += 1
+                        return task.result()
+            # Both failed; surface the primary's error
+            return first.result()
+        finally:
+            for task in racers:
+                task.cancel()
+
+    async def post(self, payload: Any, hedge: bool = False) -> Any:
+        """Send a JSON-RPC payload (single or batch) and return the decoded response"""
+        body = json.dumps(payload, cls=Web3JsonEncoder).encode()
+        first = payload[0] if isinstance(payload, list) and payload else payload
+        method = first.get("method", "unknown") if isinstance(first, dict) else "unknown"
+        return json.loads(await self.request(body, hedge=hedge, method=method))
+
+    def start(self):
+        """Start periodic health checks"""
+        if self.health_task is None:
+            self.health_task = asyncio.ensure_future(self.health_loop())
+
+    async def stop(self):
+        """Stop health checks"""
+        if self.health_task is not None:
+            self.health_task.cancel()
+            await asyncio.gather(self.health_task, return_exceptions=True)
+            self.health_task = None
+
+    async def health_loop(self):
+        """Periodically probe every endpoint"""
+        while True:
+            await self.check_health()
+            await asyncio.sleep(self.health_interval)
+
+    async def check_health(self):
+        """Probe block heights and quarantine endpoints that fall behind"""
+        body = json.dumps({"jsonrpc": "2.0", "id": 0, "method": "eth_blockNumber", "params": []}).encode()
+
+        async def probe(endpoint: Endpoint):
+            try:
+                response = json.loads(await self.send(endpoint, body))
+                endpoint.latest_block = to_integer_if_hex(response["result"])
+            except Exception as e:
+                logger.debug(f"Health check failed for {endpoint.url}: {e}")
+                endpoint.latest_block = None
+
+        await asyncio.gather(*(probe(endpoint) for endpoint in self.endpoints))
+
+        heights = [endpoint.latest_block for endpoint in self.endpoints if endpoint.latest_block is not None]
+        if heights:
+            self.highest_block = max(heights + [self.highest_block or 0])
+
+        for endpoint in self.endpoints:
+            lagging = (
+                endpoint.latest_block is None
+                or (self.highest_block is not None and self.highest_block - endpoint.latest_block > self.max_block_lag)
+            )
+            if lagging != endpoint.quarantined:
+                state = "quarantined" if lagging else "restored"
+                logger.warning(f"RPC endpoint {endpoint.url} {state} (block {endpoint.latest_block}, highest {self.highest_block})")
+            endpoint.quarantined = lagging
+
+        # Never quarantine everything; fall back to the least-bad endpoints
+        if all(endpoint.quarantined for endpoint in self.endpoints):
+            logger.warning("Every RPC endpoint failed its health check; routing to all of them anyway")
+            for endpoint in self.endpoints:
+                endpoint.quarantined = False
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-endpoint routing statistics"""
+        return [
+            {
+                "url": endpoint.url,
+                "healthy": endpoint.healthy,
+                "quarantined": endpoint.quarantined,
+                "latency_ewma": endpoint.latency,
+                "latency_p95": endpoint.p95(),
+                "error_rate": endpoint.error_rate,
+                "requests": endpoint.requests,
+                "errors": endpoint.errors,
+                "hedges_won": endpoint.hedges_won,
+                "latest_block": endpoint.latest_block,
+            }
+            for endpoint in self.endpoints
+        ]
+
+
+class PooledProvider(AsyncJSONBaseProvider):
+    """AsyncWeb3 provider that routes every request through an RpcPool"""
+
+    def __init__(self, pool: Optional[RpcPool] = None, hedged_methods=HEDGED_METHODS):
+        super().__init__()
+        self.pool = pool
+        self.hedged_methods = hedged_methods
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        if self.pool is None:
+            raise ConnectionError("RPC pool not started")
+        raw = await self.pool.request(
+            self.encode_rpc_request(method, params),
+            hedge=method in self.hedged_methods,
+            method=method
+        )
+        return self.decode_rpc_response(raw)
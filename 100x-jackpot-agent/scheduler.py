@@ -0,0 +1,252 @@
+"""
+Task scheduling for the 100x Jackpot DeFAI Agent
+
+The Scheduler runs each periodic job in its own task, so a slow stats
+refresh or summary no longer holds back event polling. A job's interval is
+either fixed or a function evaluated before every wait, and any job can be
+triggered to run immediately. Each run is timed against the job's deadline,
+and runs a job had to skip because the previous one overran, or the event
+loop was blocked, are counted as missed.
+
+PollPacer supplies the adaptive interval for log polling: it follows the
+observed block time and the recent density of events, backs off
+exponentially while the game is idle and returns to full speed as soon as
+a poll finds events.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger("100xJackpotAgent")
+
+# Seconds between runs, or a function returning them before each wait
+Interval = Union[float, Callable[[], float]]
+
+
+class Job:
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Awaitable],
+        interval: Optional[Interval] = None,
+        jitter: float = 0.0,
+        deadline: Optional[float] = None,
+        run_missed: bool = False
+    ):
+        self.name = name
+        self.func = func
+        self.interval = interval  # None: runs only when triggered
+        self.jitter = jitter
+        self.deadline = deadline
+
+        # Run missed slots back to back instead of skipping them
+        self.run_missed = run_missed
+
+        self.wake = asyncio.Event()
+        self.task: Optional[asyncio.Future] = None
+        self.last_start: Optional[float] = None
+        self.next_run: Optional[float] = None
+
+        self.runs = 0
+        self.failures = 0
+        self.missed = 0
+        self.overruns = 0
+        self.last_duration: Optional[float] = None
+
+    def delay(self) -> Optional[float]:
+        """Seconds from the last start to the next run, with jitter"""
+        if self.interval is None:
+            return None
+        delay = self.interval() if callable(self.interval) else self.interval
+        if self.jitter:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        return max(0.0, delay)
+
+
+class Scheduler:
+    def __init__(self, jitter: float = 0.0, observer: Optional[Callable[[str, float, bool, int], None]] = None):
+        self.jobs: Dict[str, Job] = {}
+        self.jitter = jitter
+
+        # Called with (job, seconds, deadline exceeded, runs missed) after every run
+        self.observer = observer
+
+    def every(
+        self,
+        name: str,
+        interval: Interval,
+        func: Callable[[], Awaitable],
+        jitter: Optional[float] = None,
+        deadline: Optional[float] = None,
+        run_missed: bool = False
+    ) -> Job:
+        """Run func every interval seconds, measured from the start of the previous run"""
+        job = Job(name, func, interval, self.jitter if jitter is None else jitter, deadline, run_missed)
+        self.jobs[name] = job
+        return job
+
+    def on_trigger(self, name: str, func: Callable[[], Awaitable], deadline: Optional[float] = None) -> Job:
+        """Run func only when triggered"""
+        job = Job(name, func, deadline=deadline)
+        self.jobs[name] = job
+        return job
+
+    def trigger(self, name: str):
+        """Run a job as soon as possible; triggers while it is waiting or running coalesce into one run"""
+        job = self.jobs.get(name)
+        if job is not None:
+            job.wake.set()
+
+    def start(self):
+        """Start a task per job"""
+        for job in self.jobs.values():
+            if job.task is None:
+                job.task = asyncio.ensure_future(self.run_job(job))
+
+    async def run(self):
+        """Run every job until cancelled"""
+        self.start()
+        await asyncio.gather(*(job.task for job in self.jobs.values()))
+
+    async def stop(self):
+        tasks = [job.task for job in self.jobs.values() if job.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self.jobs.values():
+            job.task = None
+
+    async def run_job(self, job: Job):
+        loop = asyncio.get_running_loop()
+        backlog = 0
+        while True:
+            delay = job.delay()
+            catching_up = backlog > 0
+            if catching_up:
+                # Missed slots of a run_missed job run back to back
+                backlog -= 1
+            else:
+                if delay is not None:
+                    start = job.last_start if job.last_start is not None else loop.time()
+                    job.next_run = start + delay
+                    timeout = max(0.0, job.next_run - loop.time())
+                else:
+                    job.next_run = None
+                    timeout = None
+                try:
+                    await asyncio.wait_for(job.wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            job.wake.clear()
+
+            started = loop.time()
+            missed = 0
+            if not catching_up and delay and job.next_run is not None and started - job.next_run >= delay:
+                # Whole intervals that passed without a run
+                missed = int((started - job.next_run) // delay)
+                job.missed += missed
+                if job.run_missed:
+                    backlog += missed
+                logger.warning(f"Job {job.name} missed {missed} run(s); it started {started - job.next_run:.1f}s late")
+            job.last_start = started
+
+            try:
+                await job.func()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.failures += 1
+                logger.error(f"Job {job.name} failed: {e}", exc_info=True)
+
+            job.runs += 1
+            job.last_duration = loop.time() - started
+            overran = job.deadline is not None and job.last_duration > job.deadline
+            if overran:
+                job.overruns += 1
+                logger.warning(f"Job {job.name} took {job.last_duration:.1f}s, over its {job.deadline:g}s deadline")
+            if self.observer:
+                self.observer(job.name, job.last_duration, overran, missed)
+
+    def stats(self) -> List[Dict]:
+        loop_time = asyncio.get_running_loop().time()
+        return [
+            {
+                "job": job.name,
+                "runs": job.runs,
+                "failures": job.failures,
+                "missed": job.missed,
+                "overruns": job.overruns,
+                "last_duration": job.last_duration,
+                "next_in": max(0.0, job.next_run - loop_time) if job.next_run is not None else None,
+            }
+            for job in self.jobs.values()
+        ]
+
+
+class PollPacer:
+    """Log poll interval from block time, event density and idle backoff"""
+
+    def __init__(
+        self,
+        min_interval: float = 1.0,
+        max_interval: float = 120.0,
+        sparse_interval: float = 15.0,
+        backoff: float = 2.0,
+        alpha: float = 0.2
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        # Cadence while events are rare but not absent
+        self.sparse_interval = sparse_interval
+        self.backoff = backoff
+        self.alpha = alpha
+
+        # EWMAs of seconds per block and events per block
+        self.block_time: Optional[float] = None
+        self.density = 0.0
+
+        self.last_head: Optional[int] = None
+        self.last_head_at: Optional[float] = None
+        self.idle_polls = 0
+
+    def observe(self, head: Optional[int], events: int):
+        """Record the head and the number of events one poll returned"""
+        now = time.monotonic()
+        if head is not None and self.last_head is not None and head > self.last_head:
+            blocks = head - self.last_head
+            sample = (now - self.last_head_at) / blocks
+            if self.block_time is None:
+                self.block_time, self.density = sample, events / blocks
+            else:
+                self.block_time += self.alpha * (sample - self.block_time)
+                self.density += self.alpha * (events / blocks - self.density)
+        if head is not None and head != self.last_head:
+            self.last_head = head
+            self.last_head_at = now
+
+        if events:
+            self.idle_polls = 0
+        else:
+            self.idle_polls += 1
+
+    def activity(self):
+        """Something outside polling saw players active; drop any idle backoff"""
+        self.idle_polls = 0
+
+    def interval(self) -> float:
+        """Seconds until the next poll"""
+        block_time = self.block_time if self.block_time is not None else self.min_interval
+
+        # Events usually come in bursts: right after a poll that found some, follow the chain block by block
+        if self.idle_polls == 0:
+            return min(self.max_interval, max(self.min_interval, block_time))
+
+        # Then poll about as often as events have been arriving, every block when busy and the
+        # sparse cadence when rare, and back off further with each poll that finds nothing
+        expected_gap = block_time / self.density if self.density > 0 else self.sparse_interval
+        active = max(block_time, min(expected_gap, self.sparse_interval))
+        interval = active * self.backoff ** min(self.idle_polls - 1, 32)
+        return min(self.max_interval, max(self.min_interval, interval))
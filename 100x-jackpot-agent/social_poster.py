@@ -0,0 +1,214 @@
+"""
+Outbound social posting for the 100x Jackpot DeFAI Agent
+
+Messages are submitted to a bounded queue and drained by a background worker,
+so a slow or rate-limited Twitter request never blocks event ingestion. The
+worker runs tweepy calls in a thread, paces them with a token bucket sized to
+the API tier, waits for the reset time on 429 responses, and merges queued
+messages of the same kind into one digest when it falls behind.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Optional
+
+# tweepy is imported when a post is sent, so agents without Twitter never load it
+if TYPE_CHECKING:
+    import tweepy
+
+logger = logging.getLogger("100xJackpotAgent")
+
+# Posts allowed per window for each X API tier: (posts, window seconds)
+TWITTER_TIERS = {
+    "free": (17, 86400),
+    "basic": (100, 86400),
+    "pro": (100, 900),
+}
+
+# Maximum tweet length
+TWEET_MAX_LENGTH = 280
+
+# Fallback wait when a 429 response has no reset header
+DEFAULT_RATE_LIMIT_WAIT = 900
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def refill(self):
+        """Add the tokens accrued since the last update"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    def available(self) -> float:
+        """Tokens currently available"""
+        self.refill()
+        return self.tokens
+
+    async def acquire(self) -> float:
+        """Wait for a token; returns the number of seconds spent waiting"""
+        waited = 0.0
+        while self.available() < 1:
+            delay = (1 - self.tokens) / self.refill_per_second
+            await asyncio.sleep(delay)
+            waited += delay
+        self.tokens -= 1
+        return waited
+
+    def drain(self):
+        """Drop all tokens, e.g. after the API reported a rate limit"""
+        self.refill()
+        self.tokens = 0
+
+
+class SocialMessage:
+    __slots__ = ("text", "kind", "created")
+
+    def __init__(self, text: str, kind: Optional[str] = None):
+        self.text = text
+        self.kind = kind
+        self.created = time.time()
+
+
+class SocialPoster:
+    def __init__(
+        self,
+        twitter: Optional["tweepy.Client"],
+        tier: str = "free",
+        max_queue: int = 100,
+        coalesce_threshold: int = 3
+    ):
+        self.twitter = twitter
+        posts, window = TWITTER_TIERS.get(tier, TWITTER_TIERS["free"])
+        self.bucket = TokenBucket(posts, posts / window)
+        self.max_queue = max_queue
+        self.coalesce_threshold = coalesce_threshold
+
+        self.queue: Deque[SocialMessage] = deque()
+        self.ready = asyncio.Event()
+        self.worker: Optional[asyncio.Task] = None
+
+        # kind -> function merging several queued messages into one post
+        self.digests: Dict[str, Callable[[List[SocialMessage]], str]] = {}
+
+        # Counters
+        self.posted = 0
+        self.failed = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.rate_limit_waits = 0
+
+    def register_digest(self, kind: str, formatter: Callable[[List[SocialMessage]], str]):
+        """Allow messages of this kind to be merged under pressure"""
+        self.digests[kind] = formatter
+
+    def start(self):
+        """Start the background posting worker"""
+        if self.worker is None:
+            self.worker = asyncio.ensure_future(self.run())
+
+    async def stop(self):
+        """Stop the worker; anything still queued is dropped"""
+        if self.worker is not None:
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+            self.worker = None
+        if self.queue:
+            logger.warning(f"Dropping {len(self.queue)} unsent social posts on shutdown")
+
+    def submit(self, text: str, kind: Optional[str] = None) -> bool:
+        """Queue a message without blocking; returns False if it was dropped"""
+        if self.twitter is None:
+            return False
+
+        if len(self.queue) >= self.max_queue:
+            self.dropped += 1
+            logger.warning(f"Social queue full ({self.max_queue}), dropping post: {text[:50]}")
+            return False
+
+        self.queue.append(SocialMessage(text, kind))
+        self.ready.set()
+        return True
+
+    def next_message(self) -> SocialMessage:
+        """Pop the next message, merging same-kind messages if the queue is backed up"""
+        message = self.queue.popleft()
+        formatter = self.digests.get(message.kind)
+        under_pressure = len(self.queue) + 1 >= self.coalesce_threshold or self.bucket.available() < 1
+
+        if formatter is None or not under_pressure:
+            return message
+
+        same_kind = [queued for queued in self.queue if queued.kind == message.kind]
+        if not same_kind:
+            return message
+
+        for queued in same_kind:
+            self.queue.remove(queued)
+
+        batch = [message] + same_kind
+        self.coalesced += len(same_kind)
+        logger.info(f"Coalesced {len(batch)} '{message.kind}' posts into one digest")
+        return SocialMessage(formatter(batch), message.kind)
+
+    async def run(self):
+        """Drain the queue, honouring the rate limit"""
+        while True:
+            if not self.queue:
+                self.ready.clear()
+                await self.ready.wait()
+                continue
+
+            waited = await self.bucket.acquire()
+            if waited > 0:
+                self.rate_limit_waits += 1
+
+            message = self.next_message()
+            await self.send(message)
+
+    async def send(self, message: SocialMessage):
+        """Post one message in a worker thread"""
+        import tweepy
+
+        text = message.text
+        if len(text) > TWEET_MAX_LENGTH:
+            text = text[:TWEET_MAX_LENGTH - 1] + "…"
+
+        try:
+            response = await asyncio.to_thread(self.twitter.create_tweet, text=text)
+            self.posted += 1
+            logger.info(f"Tweet posted successfully! Tweet ID: {response.data['id']}")
+        except tweepy.TooManyRequests as e:
+            # Put the message back and wait until the window resets
+            self.queue.appendleft(message)
+            self.bucket.drain()
+            self.rate_limit_waits += 1
+            wait = self.reset_wait(e)
+            logger.warning(f"Twitter rate limit hit, retrying in {wait:.0f}s")
+            await asyncio.sleep(wait)
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Error posting to Twitter: {e}")
+
+    @staticmethod
+    def reset_wait(error: "tweepy.TooManyRequests") -> float:
+        """Seconds until the rate-limit window in a 429 response resets"""
+        headers = getattr(error.response, "headers", None) or {}
+        for header in ("x-rate-limit-reset", "x-user-limit-24hour-reset", "x-app-limit-24hour-reset"):
+            reset = headers.get(header)
+            if reset:
+                try:
+                    return max(1.0, float(reset) - time.time())
+                except ValueError:
+                    continue
+        return DEFAULT_RATE_LIMIT_WAIT
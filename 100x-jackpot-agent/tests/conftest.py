@@ -0,0 +1,34 @@
+"""
+Shared setup for the agent's tests
+
+The agent modules sit flat next to this directory and the in-process fakes
+live with the benchmarks; both go on sys.path. Importing bench_agent keeps
+the agent's import-time configuration offline and in a temporary directory.
+"""
+
+import os
+import sys
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+AGENT_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, AGENT_DIR)
+sys.path.insert(0, os.path.join(AGENT_DIR, "benchmarks"))
+
+
+async def stream_ahead_of_poll(agent, chain, logs, raw):
+    """Catch up, add logs, and push raw from the stream while the polled endpoint lags a block behind it
+
+    The polls that follow reach the streamed block last, as with a lagging
+    endpoint or a stream that runs ahead of catch-up.
+    """
+    await agent.catch_up()
+    chain.add_logs(logs)
+    head = chain.head
+    event = agent.ingestor.accept(raw)
+    assert event is not None
+    await agent.process_stream_events([event])
+
+    chain.head = int(raw["blockNumber"], 16) - 1
+    await agent.catch_up()
+    chain.head = head
+    await agent.catch_up()
@@ -0,0 +1,64 @@
+"""
+Tests for the rolling-window analytics
+"""
+
+import asyncio
+import random
+import time
+
+import bench_agent
+from analytics import RollingWindows
+from synthetic import encode_log, load_abi
+
+NOW = 1_700_000_000
+
+
+def test_backdated_values_land_in_their_windows():
+    windows = RollingWindows()
+    windows.add("guesses", 1, NOW)
+    windows.add("guesses", 1, NOW - 90 * 60)
+    windows.add("guesses", 1, NOW - 5 * 3600)
+    windows.add("guesses", 1, NOW - 3 * 86400)
+
+    assert windows.total("guesses", "1h", NOW) == 1
+    assert windows.previous_total("guesses", "1h", NOW) == 1
+    assert windows.total("guesses", "4h", NOW) == 2
+    assert windows.previous_total("guesses", "4h", NOW) == 1
+    assert windows.total("guesses", "24h", NOW) == 3
+    assert windows.previous_total("guesses", "24h", NOW) == 0
+
+
+def test_arrival_order_does_not_change_totals():
+    rng = random.Random(1)
+    times = sorted(NOW - rng.randrange(3 * 86400) for _ in range(2000))
+    in_order, shuffled = RollingWindows(), RollingWindows()
+    for moment in times:
+        in_order.add("guesses", 1, moment)
+    rng.shuffle(times)
+    for moment in times:
+        shuffled.add("guesses", 1, moment)
+
+    for window in ("1h", "4h", "24h"):
+        assert shuffled.total("guesses", window, NOW) == in_order.total("guesses", window, NOW)
+        assert shuffled.previous_total("guesses", window, NOW) == in_order.previous_total("guesses", window, NOW)
+
+
+def test_catch_up_counts_old_events_at_their_block_time():
+    agent, chain, _ = bench_agent.build(0)
+    reveal = next(item for item in load_abi("JackpotGame.json") if item.get("name") == "GuessRevealed")
+    now = int(time.time())
+
+    # A day-old backlog of 100 guesses, then 5 from the last minutes
+    logs = []
+    for n in range(105):
+        block = n + 1
+        log = encode_log(agent.jackpot_contract.address, reveal,
+                         {"player": "0x" + "44" * 20, "guess": f"g{n}", "won": False}, block, 0)
+        log["blockTimestamp"] = hex(now - 86400 - 3600 + n * 30 if n < 100 else now - 300 + n)
+        logs.append(log)
+    chain.add_logs(logs)
+    asyncio.run(agent.catch_up())
+
+    assert agent.analytics.total("guesses", "4h") == 5
+    assert agent.analytics.total("guesses", "24h") == 5
+    assert agent.analytics.previous_total("guesses", "24h") == 100
@@ -0,0 +1,170 @@
+"""
+Tests for the local bonding curve pricing
+
+The floor math is checked against the contract's formulas transcribed on
+Python integers, on both the int64 path and the object fallback. The
+differential test deploys BondingCurve from its Hardhat artifact,
+walks the curve through buys, sells and price changes, and checks every
+CurvePricer quote against the contract's own view functions, and the S
+actually paid and received against the Buy and Sell events. It runs on an
+in-process eth-tester chain, or on a node given by HARDHAT_URL:
+
+    npx hardhat node
+    HARDHAT_URL=http://127.0.0.1:8545 python -m pytest tests/test_bonding_curve_pricing.py
+"""
+
+import json
+import os
+import random
+
+import numpy as np
+import pytest
+import rlp
+from eth_utils import keccak, to_checksum_address
+from web3 import Web3
+from web3.logs import DISCARD
+
+from bonding_curve_pricing import MAX_TOKEN_AMOUNT_PER_TX, STATE_FUNCTIONS, TOTAL_SUPPLY, CurvePricer, CurveState
+from conftest import AGENT_DIR
+
+HARDHAT_URL = os.getenv("HARDHAT_URL")
+
+
+def artifact(name: str):
+    with open(os.path.join(AGENT_DIR, f"{name}.json"), "r") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def chain():
+    """(w3, token, curve) with a fresh, still paused BondingCurve owned by the first account"""
+    if HARDHAT_URL:
+        w3 = Web3(Web3.HTTPProvider(HARDHAT_URL))
+    else:
+        pytest.importorskip("eth_tester")
+        w3 = Web3(Web3.EthereumTesterProvider())
+    owner = w3.eth.accounts[0]
+    w3.eth.default_account = owner
+
+    def deploy(name, *args):
+        data = artifact(name)
+        tx = w3.eth.contract(abi=data["abi"], bytecode=data["bytecode"]).constructor(*args).transact()
+        address = w3.eth.wait_for_transaction_receipt(tx).contractAddress
+        return w3.eth.contract(address=address, abi=data["abi"])
+
+    token = deploy("Token100x")
+
+    # The curve's constructor pulls its supply from the deployer, so approve its address up front
+    nonce = w3.eth.get_transaction_count(owner)
+    future = to_checksum_address(keccak(rlp.encode([bytes.fromhex(owner[2:]), nonce + 1]))[12:])
+    w3.eth.wait_for_transaction_receipt(token.functions.approve(future, 200_000_000 * 10 ** 6).transact())
+    curve = deploy("BondingCurve", token.address)
+    assert curve.address == future
+    return w3, token, curve
+
+
+def pricer_for(curve) -> CurvePricer:
+    return CurvePricer(CurveState(*(curve.functions[name]().call() for name in STATE_FUNCTIONS)))
+
+
+def check_quotes(curve, pricer: CurvePricer, rng: random.Random):
+    """Every local quote equals the contract's at the current state"""
+    net = pricer.net_supply
+    amounts = [0, 1, 2, 3, 999_999, 1_000_000, MAX_TOKEN_AMOUNT_PER_TX, net, net + 1, max(0, net - 1),
+               TOTAL_SUPPLY - net, TOTAL_SUPPLY, 2 * TOTAL_SUPPLY, 2 ** 63, 2 ** 64 + 1]
+    amounts += [rng.randrange(1, 10 ** rng.randint(1, 9)) for _ in range(10)]
+
+    buy = pricer.buy_cost(amounts)
+    sell = pricer.sell_value(amounts)
+    buy_usd = pricer.to_usd_cents(buy)
+    sell_usd = pricer.to_usd_cents(sell)
+    assert pricer.current_price() == curve.functions.getCurrentPrice().call()
+    for index, amount in enumerate(amounts):
+        assert int(buy[index]) == curve.functions.calculateBuyPrice(amount).call(), amount
+        assert int(sell[index]) == curve.functions.calculateSellPrice(amount).call(), amount
+        assert int(buy_usd[index]) == curve.functions.getUsdBuyPrice(amount).call(), amount
+        assert int(sell_usd[index]) == curve.functions.getUsdSellPrice(amount).call(), amount
+
+
+def reference_price(state: CurveState, supply: int) -> int:
+    """The contract's price formula on Python integers"""
+    return state.initial_price + (state.final_price - state.initial_price) * supply // TOTAL_SUPPLY
+
+
+def reference_quotes(state: CurveState, amount: int):
+    """(calculateBuyPrice, calculateSellPrice) for one amount, transcribed from BondingCurve.sol"""
+    net = (state.total_bought - state.total_sold_back) // 10 ** 6
+    buy = (reference_price(state, net) + reference_price(state, min(net + amount, TOTAL_SUPPLY))) * amount // 2
+    sell = (reference_price(state, net - amount if net > amount else 0) + reference_price(state, net)) * amount // 2
+    return buy, sell
+
+
+def test_floor_math_matches_the_contract_formulas():
+    rng = random.Random(2)
+    dtypes = set()
+    for _ in range(300):
+        initial = rng.choice([0, 1, rng.randrange(10 ** 18), rng.randrange(2 ** 63, 2 ** 80)])
+        final = initial + rng.choice([0, 1, TOTAL_SUPPLY - 1, rng.randrange(10 ** 18), rng.randrange(2 ** 70)])
+        bought = rng.randrange(TOTAL_SUPPLY + 1) * 10 ** 6 + rng.randrange(10 ** 6)
+        state = CurveState(bought, rng.randrange(bought + 1), initial, final, rng.randrange(1, 10 ** 4), rng.randrange(1001))
+        pricer = CurvePricer(state)
+        dtypes.add(pricer.dtype)
+
+        net = pricer.net_supply
+        amounts = [0, 1, net, net + 1, TOTAL_SUPPLY - net, rng.randrange(10 ** 9), 2 ** 62 - 1, 2 ** 62, 2 ** 100]
+        buy, sell = pricer.buy_cost(amounts), pricer.sell_value(amounts)
+        for index, amount in enumerate(amounts):
+            assert (int(buy[index]), int(sell[index])) == reference_quotes(state, amount), (amount, initial, final)
+        assert pricer.current_price() == (final if net >= TOTAL_SUPPLY else reference_price(state, net))
+
+        fee = int(sell[5]) * state.sell_fee // 10000
+        proceeds = pricer.sell_proceeds([amounts[5]])
+        assert int(proceeds["received"][0]) == int(sell[5]) - fee
+        assert int(proceeds["jackpot_share"][0]) + int(proceeds["pool_share"][0]) == fee
+        assert int(pricer.to_usd_cents(buy)[5]) == int(buy[5]) * 100 // state.s_usd_price
+    # Both the int64 path and the Python integer fallback were exercised
+    assert dtypes == {np.int64, object}
+
+
+def test_pricer_rejects_what_the_contract_reverts_on():
+    pricer = CurvePricer(CurveState(0, 0, 10, 20, 50, 500))
+    with pytest.raises(ValueError):
+        pricer.buy_cost([1, -1])
+    with pytest.raises(ValueError):
+        CurvePricer(CurveState(0, 0, 20, 10, 50, 500))
+
+
+def test_quotes_match_a_local_deployment(chain):
+    w3, token, curve = chain
+    rng = random.Random(1)
+
+    def transact(fn, **kwargs):
+        return w3.eth.wait_for_transaction_receipt(fn.transact(kwargs or None))
+
+    # Prices whose spread does not divide the supply exercise the remainder term
+    transact(curve.functions.setFinalPrice(240_000_000_000_777))
+    transact(curve.functions.setInitialPrice(160_000_000_000_013))
+    transact(curve.functions.unpause())
+    transact(curve.functions.setSUsdPrice(37))
+    transact(curve.functions.setSellFee(733))
+    check_quotes(curve, pricer_for(curve), rng)
+
+    buyers = w3.eth.accounts[1:6]
+    for step, amount in enumerate([1, 3, 9_999_999, 1_234_567, MAX_TOKEN_AMOUNT_PER_TX, 7_654_321, 42]):
+        buyer = buyers[step % len(buyers)]
+        pricer = pricer_for(curve)
+        cost = int(pricer.buy_cost([amount])[0])
+        receipt = transact(curve.functions.buy(amount), **{"from": buyer, "value": cost})
+        assert curve.events.Buy().process_receipt(receipt, errors=DISCARD)[0].args.sPaid == cost
+        if step % 2 == 0:
+            check_quotes(curve, pricer_for(curve), rng)
+
+    seller = buyers[2]  # bought 9,999,999
+    for amount in (1, 777_777, 5):
+        transact(token.functions.approve(curve.address, amount * 10 ** 6), **{"from": seller})
+        pricer = pricer_for(curve)
+        proceeds = pricer.sell_proceeds([amount])
+        assert pricer.sell_allowed([amount])[0]
+        receipt = transact(curve.functions.sell(amount), **{"from": seller})
+        assert curve.events.Sell().process_receipt(receipt, errors=DISCARD)[0].args.sReceived == int(proceeds["received"][0])
+    check_quotes(curve, pricer_for(curve), rng)
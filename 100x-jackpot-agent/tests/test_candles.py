@@ -0,0 +1,75 @@
+"""
+Tests for the candle builder
+"""
+
+import asyncio
+
+import numpy as np
+
+import bench_agent
+from candles import CandleSeries
+from conftest import stream_ahead_of_poll
+from synthetic import encode_log, load_abi
+
+
+def curve_buys(address: str, first_block: int, blocks: int, per_block: int):
+    """Raw curve Buy logs of 1,000 tokens each, the n-th paying n + 1 S"""
+    abi = next(item for item in load_abi("BondingCurve.json") if item.get("name") == "Buy")
+    buyer = "0x" + "22" * 20
+    return [
+        encode_log(address, abi, {"buyer": buyer, "tokenAmount": 1000, "sPaid": (n + 1) * 10 ** 18},
+                   first_block + n // per_block, n % per_block)
+        for n in range(blocks * per_block)
+    ]
+
+
+def test_roll_carries_the_close_over_gaps():
+    series = CandleSeries(60, 5)
+    series.roll(3)
+    assert (series.current, series.filled) == (3, 1)
+    assert np.isnan(series.last()["close"]).all()
+
+    series.add(3 * 60 + 10, 2.0, 1.0, 2.0, True)
+    series.add(3 * 60 + 50, 3.0, 1.0, 3.0, False)
+    series.roll(2)
+    assert series.current == 3
+
+    # Two empty minutes open at the previous close
+    series.add(6 * 60, 4.0, 2.0, 8.0, True)
+    candles = series.last()
+    assert candles["start"].tolist() == [180, 240, 300, 360]
+    assert candles["open"].tolist() == [2.0, 3.0, 3.0, 4.0]
+    assert candles["close"].tolist() == [3.0, 3.0, 3.0, 4.0]
+    assert candles["volume"].tolist() == [5.0, 0.0, 0.0, 8.0]
+    assert candles["net_flow"].tolist() == [-1.0, 0.0, 0.0, 8.0]
+    assert series.last(2)["start"].tolist() == [300, 360]
+
+
+def test_roll_wraps_the_ring():
+    series = CandleSeries(60, 5)
+    for minute in range(8):
+        series.add(minute * 60, float(minute + 1), 1.0, 1.0, True)
+    candles = series.last()
+    assert series.filled == 5
+    assert candles["start"].tolist() == [180, 240, 300, 360, 420]
+    assert candles["close"].tolist() == [4.0, 5.0, 6.0, 7.0, 8.0]
+    assert candles["buys"].tolist() == [1] * 5
+
+    # A gap longer than the ring keeps only its last candles, still at the old close
+    series.roll(1000)
+    candles = series.last(now=1000 * 60 + 30)
+    assert candles["start"].tolist() == [interval * 60 for interval in range(996, 1001)]
+    assert candles["close"].tolist() == [8.0] * 5
+    assert candles["buys"].tolist() == [0] * 5
+
+
+def test_streamed_trade_does_not_hide_older_polled_ones():
+    agent, chain, _ = bench_agent.build(50)
+    logs = curve_buys(agent.bonding_curve.address, chain.head + 1, 10, 3)
+    asyncio.run(stream_ahead_of_poll(agent, chain, logs, logs[-1]))
+
+    daily = agent.candles.records("1d")
+    assert agent.candles.trades == len(logs)
+    assert int(daily["buys"].sum()) == len(logs)
+    assert daily["volume"].sum() == sum(range(1, len(logs) + 1))
+    assert agent.candles.last_price == len(logs) / 1000
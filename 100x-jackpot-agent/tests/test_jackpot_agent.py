@@ -0,0 +1,51 @@
+"""
+Tests for the agent's event handlers
+"""
+
+import asyncio
+from typing import List
+
+import bench_agent
+from synthetic import encode_log, load_abi
+
+WINNER = "0x" + "33" * 20
+
+
+def reveal_and_win(address: str, losing_guesses: int) -> List:
+    """Raw logs of a player's losing reveals, then the winning revealGuess in JackpotGame.sol's emit order"""
+    events = {item["name"]: item for item in load_abi("JackpotGame.json") if item.get("type") == "event"}
+    logs = [encode_log(address, events["NewPlayer"], {"player": WINNER}, 1, 0)]
+    for n in range(losing_guesses):
+        logs.append(encode_log(address, events["GuessRevealed"], {"player": WINNER, "guess": f"no-{n}", "won": False},
+                               2 + n, 0))
+
+    # One transaction: JackpotWon, the JACKPOT_WON announcement, then the winning GuessRevealed
+    block = 2 + losing_guesses
+    logs.append(encode_log(address, events["JackpotWon"], {"winner": WINNER, "amount": 5 * 10 ** 18, "guess": "yes"},
+                           block, 0))
+    logs.append(encode_log(address, events["SocialAnnouncement"],
+                           {"announcementType": "JACKPOT_WON", "message": "We have a winner!"}, block, 1))
+    logs.append(encode_log(address, events["GuessRevealed"], {"player": WINNER, "guess": "yes", "won": True}, block, 2))
+    return logs
+
+
+def win_announcement(losing_guesses: int) -> str:
+    agent, chain, _ = bench_agent.build(0)
+    chain.add_logs(reveal_and_win(agent.jackpot_contract.address, losing_guesses))
+
+    posts = []
+
+    async def post_social_update(message, kind=None):
+        posts.append(message)
+
+    agent.post_social_update = post_social_update
+    asyncio.run(agent.catch_up())
+    return next(post for post in posts if post.startswith("🎊 JACKPOT WON!"))
+
+
+def test_win_announcement_counts_the_winning_guess():
+    assert " on guess #4 " in win_announcement(3)
+
+
+def test_first_try_win_is_guess_one():
+    assert " on guess #1 " in win_announcement(0)
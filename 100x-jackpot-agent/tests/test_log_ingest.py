@@ -0,0 +1,190 @@
+"""
+Tests for the LogIngestor cursor and for streamed logs during catch-up
+"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import List
+
+from web3 import AsyncWeb3
+
+import bench_agent
+from checkpoint import Checkpoint
+from fakes import FakeChain
+from log_ingest import LogIngestor
+from rpc_pool import PooledProvider
+from synthetic import JackpotLogGenerator, load_abi
+
+JACKPOT_ADDRESS = "0x0000000000000000000000000000000000001001"
+
+
+def chain_with(count: int, logs_per_block: int = 10) -> FakeChain:
+    chain = FakeChain()
+    chain.add_logs(JackpotLogGenerator(JACKPOT_ADDRESS, logs_per_block=logs_per_block).generate(count))
+    return chain
+
+
+def ingestor_on(chain: FakeChain, **kwargs) -> LogIngestor:
+    """An ingestor subscribed to every JackpotGame event, reading from block 1"""
+    w3 = AsyncWeb3(PooledProvider(chain))
+    contract = w3.eth.contract(address=JACKPOT_ADDRESS, abi=load_abi("JackpotGame.json"))
+    ingestor = LogIngestor(w3, start_block=1, **kwargs)
+    for item in contract.abi:
+        if item.get("type") == "event":
+            ingestor.subscribe(contract, item["name"])
+    return ingestor
+
+
+def at(block: int, log_index: int):
+    return SimpleNamespace(blockNumber=block, logIndex=log_index)
+
+
+def key(event):
+    return event.blockNumber, event.logIndex
+
+
+def chain_keys(chain: FakeChain) -> List:
+    return [(block, int(log["logIndex"], 16)) for block in sorted(chain.logs) for log in chain.logs[block]]
+
+
+async def drain(ingestor: LogIngestor, handled: List):
+    """Poll until caught up, handling every event in order like the agent does"""
+    while True:
+        events = await ingestor.poll()
+        for event in events:
+            if not ingestor.handled_by_stream(event):
+                handled.append(key(event))
+                ingestor.advance(event)
+        ingestor.complete()
+        if ingestor.caught_up:
+            return
+
+
+def test_advance_complete_and_covers(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint.json"))
+    ingestor = LogIngestor(None, start_block=10, checkpoint=checkpoint)
+    assert not ingestor.covers(at(10, 0))
+
+    # A poll has read blocks 10-19 and the agent is part way through them
+    ingestor.next_block = 20
+    ingestor.advance(at(12, 3))
+    assert ingestor.position == (12, 3)
+    assert checkpoint.load() == (12, 3)
+    assert ingestor.covers(at(11, 9)) and ingestor.covers(at(12, 3))
+    assert not ingestor.covers(at(20, 0))
+
+    # The stream handles a newer event: remembered, the cursor stays put
+    ingestor.advance(at(25, 1))
+    assert ingestor.position == (12, 3)
+    assert ingestor.covers(at(25, 1)) and ingestor.handled_by_stream(at(25, 1))
+    assert not ingestor.covers(at(25, 0)) and not ingestor.handled_by_stream(at(25, 0))
+
+    ingestor.complete()
+    assert ingestor.position is None
+    assert checkpoint.load() == (19, None)
+    assert ingestor.streamed == {(25, 1)}
+
+    # Once a poll reads past it, the streamed event is forgotten
+    ingestor.next_block = 30
+    ingestor.complete()
+    assert ingestor.streamed == set()
+    assert ingestor.covers(at(29, 99))
+    assert checkpoint.load() == (29, None)
+
+    resumed = LogIngestor(None, checkpoint=checkpoint)
+    assert (resumed.next_block, resumed.position) == (30, None)
+
+
+def test_poll_reads_chunks_in_chain_order():
+    chain = chain_with(300)
+    ingestor = ingestor_on(chain, max_chunk=4)
+    handled = []
+    asyncio.run(drain(ingestor, handled))
+
+    assert handled == chain_keys(chain)
+    assert ingestor.next_block == chain.head + 1
+    assert ingestor.position is None
+    assert chain.requests["eth_getLogs"] > 1
+
+
+def test_restart_resumes_after_the_saved_position(tmp_path):
+    chain = chain_with(100)
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint.json"))
+
+    async def interrupted() -> List:
+        ingestor = ingestor_on(chain, checkpoint=checkpoint, max_chunk=3)
+        events = await ingestor.poll()
+        for event in events[:7]:
+            ingestor.advance(event)
+        ingestor.save()
+        return [key(event) for event in events[:7]]
+
+    handled = asyncio.run(interrupted())
+    assert checkpoint.load() == handled[-1]
+
+    resumed = ingestor_on(chain, checkpoint=checkpoint, max_chunk=3)
+    block, log_index = handled[-1]
+    assert resumed.covers(at(block, log_index))
+    assert not resumed.covers(at(block, log_index + 1))
+    asyncio.run(drain(resumed, handled))
+    assert handled == chain_keys(chain)
+    assert checkpoint.load() == (chain.head, None)
+
+
+def test_streamed_event_never_moves_the_cursor():
+    chain = chain_with(50)
+    ingestor = ingestor_on(chain)
+    handled = []
+    asyncio.run(drain(ingestor, handled))
+    head = chain.head
+
+    # Three more blocks arrive; the stream sees the last one before the polled endpoint does
+    chain.add_logs(JackpotLogGenerator(JACKPOT_ADDRESS, start_block=head + 1, seed=2).generate(30))
+    new_head = chain.head
+    streamed = ingestor.accept(chain.logs[new_head][-1])
+    assert streamed is not None
+    ingestor.advance(streamed)
+    handled.append(key(streamed))
+    assert ingestor.position is None
+    assert ingestor.covers(streamed)
+    assert ingestor.accept(chain.logs[new_head][-1]) is None
+
+    # A lagging endpoint reports an older head: nothing in its range is skipped
+    chain.head = head + 1
+    asyncio.run(drain(ingestor, handled))
+    assert ingestor.streamed == {key(streamed)}
+
+    chain.head = new_head
+    asyncio.run(drain(ingestor, handled))
+    assert sorted(handled) == chain_keys(chain)
+    assert len(handled) == len(set(handled))
+    assert ingestor.streamed == set()
+
+
+def test_stream_during_chunked_catch_up_dispatches_every_event_once():
+    agent, chain, _ = bench_agent.build(500)
+    agent.ingestor.chunk = agent.ingestor.max_chunk = 10
+
+    handled = []
+    for name, handler in list(agent.event_handlers.items()):
+        async def record(event, handler=handler):
+            handled.append(key(event))
+            await handler(event)
+        agent.event_handlers[name] = record
+
+    async def run():
+        await agent.check_contract_events()
+        assert not agent.ingestor.caught_up
+
+        # A log from the newest block is pushed while older chunks are still unread
+        raw = chain.logs[chain.head][-1]
+        event = agent.ingestor.accept(raw)
+        assert event is not None
+        await agent.process_stream_events([event])
+        await agent.catch_up()
+
+    asyncio.run(run())
+    decoded = [agent.ingestor.decode(log) for block in sorted(chain.logs) for log in chain.logs[block]]
+    expected = [key(event) for event in decoded if event.event in agent.event_handlers]
+    assert len(handled) == len(set(handled))
+    assert sorted(handled) == expected
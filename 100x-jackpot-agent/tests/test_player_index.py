@@ -0,0 +1,94 @@
+"""
+Tests for the player index
+"""
+
+import asyncio
+import random
+
+import numpy as np
+
+import bench_agent
+from conftest import stream_ahead_of_poll
+from player_index import PLAYER_EVENTS, PlayerIndex, TopTree
+from synthetic import JackpotLogGenerator
+
+
+def ranked(values: np.ndarray, size: int, count: int):
+    """Reference leaderboard: largest values first, ties to the lower id"""
+    return sorted(range(size), key=lambda player_id: (-int(values[player_id]), player_id))[:count]
+
+
+def test_top_tree_matches_a_full_sort():
+    rng = random.Random(1)
+    values = np.zeros(100, dtype=np.uint32)
+    size = 37
+    values[:size] = [rng.randrange(5) for _ in range(size)]
+    tree = TopTree(values, size)
+    assert tree.top(size + 5) == ranked(values, size, size)
+
+    for step in range(2000):
+        if step % 40 == 0 and size < len(values):
+            tree.add(size)
+            size += 1
+        player_id = rng.randrange(size)
+        values[player_id] += rng.randrange(1, 3)
+        tree.update(player_id)
+        count = rng.randrange(1, 12)
+        assert tree.top(count) == ranked(values, size, count)
+    assert TopTree(values, 0).top(3) == []
+
+
+def test_id_table_survives_growth():
+    rng = random.Random(2)
+    # Leading and trailing zero bytes included; NumPy strips the trailing ones on read
+    addresses = ["0x" + "00" * 19 + "01", "0x" + "ab" * 19 + "00", "0x" + "00" * 20]
+    addresses += ["0x" + rng.randbytes(20).hex() for _ in range(3000)]
+    index = PlayerIndex(capacity=16)
+    for block, address in enumerate(addresses):
+        assert index.add(address, block) == block
+    assert len(index) == len(addresses)
+    assert index.capacity >= len(addresses)
+    assert index.add(addresses[1].upper().replace("0X", "0x"), 10 ** 6) == 1
+    for player_id, address in enumerate(addresses):
+        assert index.id_of(address) == player_id
+        assert index.row(player_id)["address"].lower() == address
+        assert index.row(player_id)["first_seen"] == player_id
+    assert index.id_of("0x" + "ab" * 19 + "01") is None
+
+
+def test_snapshot_round_trip(tmp_path):
+    agent, _, _ = bench_agent.build(0)
+    generator = JackpotLogGenerator(agent.jackpot_contract.address, players=50)
+    events = [agent.ingestor.decode(log) for log in generator.generate(500)]
+    index = PlayerIndex(guess_cost=7, hint_cost=3)
+    applied = [event for event in events if event.event in PLAYER_EVENTS]
+    assert index.apply_events(events) == len(applied)
+    assert index.apply_events(events) == 0
+    leaders = index.top("guesses", 5)
+
+    path = str(tmp_path / "players.npz")
+    index.save(path)
+    loaded = PlayerIndex.load(path)
+    assert len(loaded) == len(index)
+    assert loaded.position == index.position == (applied[-1].blockNumber, applied[-1].logIndex)
+    assert (loaded.guess_cost, loaded.hint_cost) == (7, 3)
+    assert loaded.top("guesses", 5) == leaders
+    for player_id in range(len(index)):
+        row = index.row(player_id)
+        assert loaded.get(row["address"]) == row
+
+
+def test_streamed_events_do_not_hide_older_polled_ones():
+    agent, chain, _ = bench_agent.build(200)
+    generator = JackpotLogGenerator(agent.jackpot_contract.address, start_block=chain.head + 1, seed=2)
+    logs = generator.generate(100)
+    raw = next(log for log in reversed(logs) if agent.ingestor.decode(log).event in PLAYER_EVENTS)
+    asyncio.run(stream_ahead_of_poll(agent, chain, logs, raw))
+
+    # The same events applied once each, in chain order
+    expected = PlayerIndex()
+    expected.apply_events([agent.ingestor.decode(log) for block in sorted(chain.logs) for log in chain.logs[block]])
+    assert len(agent.players) == len(expected)
+    for player_id in range(len(expected)):
+        row = expected.row(player_id)
+        assert agent.players.get(row["address"]) == row
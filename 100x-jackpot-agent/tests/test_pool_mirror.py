@@ -0,0 +1,40 @@
+"""
+Tests for the liquidity pool mirror
+"""
+
+import asyncio
+
+import bench_agent
+from conftest import stream_ahead_of_poll
+from synthetic import encode_log, load_abi
+
+POOL_ADDRESS = "0x00000000000000000000000000000000000b0001"
+
+
+def test_streamed_swap_does_not_hide_older_polled_ones():
+    agent, chain, _ = bench_agent.build(50)
+    pool_abi = load_abi("SimpleLiquidityPool.json")
+    token = agent.token_contract.address
+    chain.register_contract(POOL_ADDRESS, pool_abi, {
+        "token": token,
+        "getReserves": (10 ** 15, 10 ** 21),
+        "totalLpSupply": 10 ** 18,
+    })
+    agent.pools.reader = agent.reader
+
+    swap = next(item for item in pool_abi if item.get("name") == "Swap")
+    first = chain.head + 1
+    logs = [
+        encode_log(POOL_ADDRESS, swap, {"user": token, "isBuy": True, "tokenAmount": 10 ** 6, "sAmount": 10 ** 18},
+                   first + n // 2, n % 2)
+        for n in range(20)
+    ]
+
+    async def run():
+        await agent.pools.track([POOL_ADDRESS], first - 1)
+        await stream_ahead_of_poll(agent, chain, logs, logs[-1])
+
+    asyncio.run(run())
+    pool = agent.pools.pool_for(token)
+    assert (pool.token_reserve, pool.s_reserve) == (10 ** 15 - 20 * 10 ** 6, 10 ** 21 + 20 * 10 ** 18)
+    assert pool.position == (first + 9, 1)
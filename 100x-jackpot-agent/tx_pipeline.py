@@ -0,0 +1,216 @@
+"""
+Transaction pipeline for the agent account
+
+Sends emitGameUpdate transactions without per-transaction nonce and gas-price
+lookups. Nonces are tracked locally and resynced from the chain after errors,
+the gas price is refreshed periodically, signing and sending never wait for
+earlier transactions to confirm, and a tracker re-prices transactions that
+stay pending for too long.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+
+from web3 import AsyncWeb3
+
+logger = logging.getLogger("100xJackpotAgent")
+
+
+class NonceManager:
+    def __init__(self, w3: AsyncWeb3, address: str):
+        self.w3 = w3
+        self.address = address
+        self.next_nonce: Optional[int] = None
+        self.lock = asyncio.Lock()
+
+    async def sync(self):
+        """Reload the next nonce from the chain, counting pending transactions"""
+        self.next_nonce = await self.w3.eth.get_transaction_count(self.address, 'pending')
+        logger.info(f"Nonce synced from chain: {self.next_nonce}")
+
+    async def allocate(self) -> int:
+        """Hand out the next nonce"""
+        async with self.lock:
+            if self.next_nonce is None:
+                await self.sync()
+            nonce = self.next_nonce
+            self.next_nonce += 1
+            return nonce
+
+    def reset(self):
+        """Force a resync before the next allocation"""
+        self.next_nonce = None
+
+
+class GasPriceOracle:
+    def __init__(self, w3: AsyncWeb3, refresh_interval: float = 30.0):
+        self.w3 = w3
+        self.refresh_interval = refresh_interval
+        self.price: Optional[int] = None
+        self.updated = 0.0
+        self.lock = asyncio.Lock()
+
+    async def get(self) -> int:
+        """Return the cached gas price, refreshing it when stale"""
+        async with self.lock:
+            if self.price is None or time.monotonic() - self.updated > self.refresh_interval:
+                self.price = await self.w3.eth.gas_price
+                self.updated = time.monotonic()
+            return self.price
+
+
+class PendingTx:
+    __slots__ = ("message", "nonce", "gas_price", "hashes", "submitted", "sent", "bumps")
+
+    def __init__(self, message: str, nonce: int, gas_price: int, submitted: float):
+        self.message = message
+        self.nonce = nonce
+        self.gas_price = gas_price
+        self.hashes: List[str] = []
+        self.submitted = submitted
+        self.sent = submitted
+        self.bumps = 0
+
+
+class TxPipeline:
+    def __init__(
+        self,
+        w3: AsyncWeb3,
+        account,
+        contract,
+        gas_limit: int = 200000,
+        gas_refresh_interval: float = 30.0,
+        receipt_interval: float = 5.0,
+        stuck_after: float = 60.0,
+        bump_percent: int = 15,
+        max_bumps: int = 5,
+        max_retries: int = 3,
+        on_confirm: Optional[Callable[[float], None]] = None
+    ):
+        self.w3 = w3
+        self.account = account
+        self.contract = contract
+        self.gas_limit = gas_limit
+        self.nonces = NonceManager(w3, account.address)
+        self.gas = GasPriceOracle(w3, gas_refresh_interval)
+        self.chain_id: Optional[int] = None
+
+        self.receipt_interval = receipt_interval
+        self.stuck_after = stuck_after
+        self.bump_percent = bump_percent
+        self.max_bumps = max_bumps
+        self.max_retries = max_retries
+
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.pending: Dict[int, PendingTx] = {}
+        self.tasks: List[asyncio.Task] = []
+
+        # Counters and recent confirmation latencies (seconds from submit to inclusion)
+        self.sent = 0
+        self.confirmed = 0
+        self.failed = 0
+        self.repriced = 0
+        self.confirm_latencies: Deque[float] = deque(maxlen=256)
+        self.on_confirm = on_confirm
+
+    async def start(self):
+        """Load chain id and nonce, then start the sender and receipt tracker"""
+        self.chain_id, _ = await asyncio.gather(self.w3.eth.chain_id, self.nonces.sync())
+        self.tasks = [
+            asyncio.ensure_future(self.send_loop()),
+            asyncio.ensure_future(self.track_loop()),
+        ]
+
+    async def stop(self):
+        """Stop background tasks; pending transactions stay in the mempool"""
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    def submit(self, message: str):
+        """Queue an emitGameUpdate call"""
+        self.queue.put_nowait((message, 0))
+
+    async def send_loop(self):
+        """Sign and send queued messages without waiting for confirmations"""
+        while True:
+            message, attempt = await self.queue.get()
+            nonce, gas_price = await asyncio.gather(self.nonces.allocate(), self.gas.get())
+            tx = PendingTx(message, nonce, gas_price, time.monotonic())
+            try:
+                await self.send(tx)
+                self.pending[nonce] = tx
+                self.sent += 1
+            except Exception as e:
+                # Our view of the nonce may be wrong; resync before the next send
+                self.nonces.reset()
+                if attempt + 1 < self.max_retries:
+                    logger.warning(f"Error sending emitGameUpdate (nonce {nonce}), retrying: {e}")
+                    self.queue.put_nowait((message, attempt + 1))
+                else:
+                    self.failed += 1
+                    logger.error(f"Error calling emitGameUpdate: {e}")
+
+    async def send(self, tx: PendingTx):
+        """Build, sign and broadcast a transaction for tx's nonce and gas price"""
+        built = await self.contract.functions.emitGameUpdate(tx.message).build_transaction({
+            'from': self.account.address,
+            'nonce': tx.nonce,
+            'gas': self.gas_limit,
+            'gasPrice': tx.gas_price,
+            'chainId': self.chain_id
+        })
+        signed_tx = self.w3.eth.account.sign_transaction(built, self.account.key)
+        tx_hash = await self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        tx.hashes.append(tx_hash.hex())
+        tx.sent = time.monotonic()
+        logger.info(f"Called emitGameUpdate. Transaction hash: {tx_hash.hex()}")
+
+    async def track_loop(self):
+        """Watch pending transactions; one nonce query covers all of them"""
+        while True:
+            await asyncio.sleep(self.receipt_interval)
+            if not self.pending:
+                continue
+            try:
+                await self.check_pending()
+            except Exception as e:
+                logger.warning(f"Error tracking pending transactions: {e}")
+
+    async def check_pending(self):
+        """Retire mined nonces and re-price transactions that look stuck"""
+        mined_nonce = await self.w3.eth.get_transaction_count(self.account.address, 'latest')
+        now = time.monotonic()
+
+        for nonce in sorted(self.pending):
+            tx = self.pending[nonce]
+            if nonce < mined_nonce:
+                # One of this nonce's transactions was included
+                del self.pending[nonce]
+                self.confirmed += 1
+                self.confirm_latencies.append(now - tx.submitted)
+                if self.on_confirm:
+                    self.on_confirm(now - tx.submitted)
+                continue
+
+            if now - tx.sent < self.stuck_after:
+                continue
+
+            if tx.bumps >= self.max_bumps:
+                logger.warning(f"emitGameUpdate nonce {nonce} still pending after {tx.bumps} re-prices")
+                continue
+
+            # Replace with the same nonce at a higher gas price
+            market_price = await self.gas.get()
+            tx.gas_price = max(market_price, tx.gas_price * (100 + self.bump_percent) // 100)
+            tx.bumps += 1
+            try:
+                await self.send(tx)
+                self.repriced += 1
+                logger.info(f"Re-priced stuck emitGameUpdate nonce {nonce} to {tx.gas_price} wei")
+            except Exception as e:
+                logger.warning(f"Error re-pricing nonce {nonce}: {e}")